@@ -1,10 +1,67 @@
 #!/usr/bin/env python3
 """Script that opens the game."""
+import argparse
+import os
 import sys
+from pathlib import Path
+
 import pygame
-import src
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Opens the game.")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run the game loop without a display as fast as possible",
+    )
+    parser.add_argument(
+        "--fixed-timestep",
+        action="store_true",
+        help="update the game in fixed steps and interpolate rendering",
+    )
+    parser.add_argument(
+        "--tick-rate", type=int, help="number of fixed steps per second"
+    )
+    parser.add_argument(
+        "--ticks", type=int, help="number of ticks to stop the game after"
+    )
+    replay = parser.add_mutually_exclusive_group()
+    replay.add_argument(
+        "--record", type=Path, help="record the input of the session to a file"
+    )
+    replay.add_argument(
+        "--replay", type=Path, help="play back the input of a recorded file"
+    )
+    parser.add_argument(
+        "--seed", type=int, help="random seed to record the session with"
+    )
+    parser.add_argument(
+        "--instrumentation",
+        action="store_true",
+        help="log hot path details as structured json records",
+    )
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    src.main.gameloop()
+    args = parse_args()
+    if args.headless:
+        # Must be set before pygame is initialised when importing src.
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+    import src
+
+    if args.instrumentation:
+        src.core.instrumentation.configure(enable=True)
+    if args.fixed_timestep:
+        src.core.system_data.fixed_timestep = True
+    if args.tick_rate is not None:
+        src.core.system_data.tick_rate = args.tick_rate
+    if args.record is not None:
+        src.components.events.replay.start_recording(args.record, args.seed)
+    elif args.replay is not None:
+        src.components.events.replay.start_playback(args.replay)
+    src.main.gameloop(max_ticks=args.ticks)
     pygame.quit()
     sys.exit()
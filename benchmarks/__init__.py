@@ -0,0 +1,6 @@
+"""Benchmarks for the game's simulation and rendering hot paths.
+
+Run from the root of the repository with ``python -m benchmarks``. Every
+scene is run headless using SDL's dummy video driver, so results measure the
+game's own code rather than the display.
+"""
@@ -0,0 +1,154 @@
+"""Runs the benchmark scenes and saves the results as json.
+
+Usage: ``python -m benchmarks [scene ...] [--ticks N] [--output FILE]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SIZE_ARGUMENTS = {
+    "bullets": 2000,
+    "enemies": 100,
+    "items": 1000,
+    "patterns": 10,
+    "scripts": 300,
+    "particles": 5000,
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmarks the game's simulation and rendering.",
+    )
+    parser.add_argument(
+        "scenes",
+        nargs="*",
+        help="names of the scenes to run, defaults to every scene",
+    )
+    parser.add_argument(
+        "--ticks", type=int, default=600, help="number of ticks to time"
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=60,
+        help="number of ticks to run before timing",
+    )
+    for name, default in SIZE_ARGUMENTS.items():
+        parser.add_argument(
+            f"--{name}",
+            type=int,
+            default=default,
+            help=f"number of {name} in the {name} scene",
+        )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="json file to save results to, defaults to a timestamped file",
+    )
+    return parser.parse_args()
+
+
+def get_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    args = parse_args()
+    # Must be set before pygame is initialised when importing src.
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    import pygame
+
+    import src
+    from benchmarks.scenes import SCENES
+    from benchmarks.timing import Timer
+    from src.core.load import image_cache_stats, variant_cache_stats
+
+    # Logging in hot paths would otherwise dominate the timings.
+    logging.disable(logging.INFO)
+    system_data = src.core.system_data
+    system_data.dt = 1000 / system_data.tick_rate / 100
+
+    names = args.scenes or list(SCENES)
+    if unknown := set(names) - SCENES.keys():
+        sys.exit(f"Unknown scenes: {', '.join(sorted(unknown))}.")
+
+    results = {}
+    for name in names:
+        scene = SCENES[name](getattr(args, name, 0))
+        scene.setup()
+        for _ in range(args.warmup):
+            scene.refill()
+            scene.tick(Timer())
+        timer = Timer()
+        image_cache_stats.reset()
+        variant_cache_stats.reset()
+        for _ in range(args.ticks):
+            scene.refill()
+            with timer.measure("tick"):
+                scene.tick(timer)
+            timer.end_tick()
+        scene.teardown()
+
+        elapsed = sum(timer.ticks["tick"]) / 1000
+        results[name] = {
+            "size": scene.size,
+            "ticks": args.ticks,
+            "ticks_per_second": args.ticks / elapsed if elapsed else None,
+            "phases": timer.summary(),
+            # Misses while ticking mean images are loaded mid-game.
+            "image_cache": vars(image_cache_stats).copy(),
+            "variant_cache": vars(variant_cache_stats).copy(),
+        }
+        print(
+            f"{name}: {results[name]['ticks_per_second']:.1f} ticks/sec, "
+            f"{results[name]['phases']['tick']['mean']:.3f} ms/tick"
+        )
+
+    output = args.output or Path(
+        f"benchmark-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    with output.open("w") as file:
+        json.dump(
+            {
+                "metadata": {
+                    "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                    "commit": get_commit(),
+                    "version": system_data.version,
+                    "python": platform.python_version(),
+                    "pygame": pygame.version.ver,
+                    "sdl": ".".join(map(str, pygame.get_sdl_version())),
+                    "platform": platform.platform(),
+                    "tick_rate": system_data.tick_rate,
+                    "warmup": args.warmup,
+                },
+                "scenes": results,
+            },
+            file,
+            indent=4,
+        )
+    print(f"Saved results to {output}.")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
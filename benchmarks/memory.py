@@ -0,0 +1,216 @@
+"""Measures how much memory each kind of high-count entity takes up.
+
+Usage: ``python -m benchmarks.memory [kind ...] [--count N] [--output FILE]``
+
+For each kind, `--count` entities are created and kept alive in a group, as
+they would be in the game, and the memory allocated while creating them is
+measured with `tracemalloc`. The surfaces entities share, such as cached
+sprites and atlas pages, are loaded before measuring, so the results are the
+cost of each extra entity. The bullet field is included for comparison with
+the bullet entities.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+KINDS = ("bullets", "items", "particles", "bulletfield")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.memory",
+        description="Benchmarks the memory used by each entity.",
+    )
+    parser.add_argument(
+        "kinds",
+        nargs="*",
+        help="kinds of entity to measure, defaults to every kind",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=10_000,
+        help="number of live entities to measure",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="json file to save results to, defaults to a timestamped file",
+    )
+    return parser.parse_args()
+
+
+def get_factories() -> dict[str, Callable[[int], Any]]:
+    """Gets a function for each kind creating that many live entities.
+
+    Imported here since the game can only be imported once the video driver
+    has been set.
+    """
+    import pygame
+
+    from src.components.entities.bulletfield import BulletField
+    from src.components.entities.entity import EntityGroup
+    from src.components.entities.item import FallingItem
+    from src.components.entities.particle import Particle
+    from src.components.entities.projectile import (
+        Projectile,
+        get_bullet_surface,
+    )
+    from src.core.load import load_image
+    from src.core.renderqueue import Layer
+
+    sprite = load_image("level", "opaque")
+    # Projectiles only use the type and abs_rect of their owner.
+    owner = SimpleNamespace(type="enemy", abs_rect=pygame.Rect(0, 0, 32, 32))
+
+    def create_bullets(count: int) -> EntityGroup:
+        group = EntityGroup()
+        group.add(
+            *(
+                Projectile(
+                    owner, get_bullet_surface((4, 4)), spawn_location="center"
+                )
+                for _ in range(count)
+            )
+        )
+        return group
+
+    def create_items(count: int) -> EntityGroup:
+        group = EntityGroup()
+        group.add(
+            *(
+                FallingItem(1, (i % 500, 20), sprite=sprite, sprite_scale=2)
+                for i in range(count)
+            )
+        )
+        return group
+
+    def create_particles(count: int) -> EntityGroup:
+        group = EntityGroup()
+        group.add(
+            *(
+                Particle((i % 500, 20), (3, -3), 1000, sprite=sprite)
+                for i in range(count)
+            )
+        )
+        return group
+
+    def create_bulletfield(count: int) -> BulletField:
+        bullets = BulletField("enemy", Layer.ENEMY_BULLETS)
+        bullets.spawn([(i % 500, 20) for i in range(count)], (0, 30))
+        return bullets
+
+    return {
+        "bullets": create_bullets,
+        "items": create_items,
+        "particles": create_particles,
+        "bulletfield": create_bulletfield,
+    }
+
+
+def measure(create: Callable[[int], Any], count: int) -> dict[str, Any]:
+    """Measures the memory allocated by creating live entities.
+
+    :param create: Creates the entities, returning what keeps them alive.
+    :param count: The number of entities to create.
+    """
+    # Fills the caches shared by every entity of the kind.
+    create(1)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entities = create(count)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    unslotted = get_unslotted_attributes(entities)
+    del entities
+    gc.collect()
+    return {
+        "count": count,
+        "bytes": after - before,
+        "bytes_per_entity": (after - before) / count,
+        "peak_bytes": peak - before,
+        "unslotted_attributes": unslotted,
+    }
+
+
+def get_unslotted_attributes(entities: Any) -> list[str]:
+    """Gets the attributes of an entity stored in a __dict__ not a slot.
+
+    pygame's Sprite doesn't declare slots, so entities always have a
+    __dict__, which should stay empty.
+
+    :param entities: What keeps the entities alive. Bullet fields don't
+    have any entities, so have no attributes.
+    """
+    from src.components.entities.bulletfield import BulletField
+
+    if isinstance(entities, BulletField) or not entities:
+        return []
+    return sorted(vars(next(iter(entities))))
+
+
+def main() -> None:
+    args = parse_args()
+    kinds = args.kinds or list(KINDS)
+    if unknown := set(kinds) - set(KINDS):
+        sys.exit(f"Unknown kinds: {', '.join(sorted(unknown))}.")
+    # Must be set before pygame is initialised when importing src.
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    import src
+
+    factories = get_factories()
+    results = {}
+    for kind in kinds:
+        results[kind] = measure(factories[kind], args.count)
+        print(
+            f"{kind}: {results[kind]['bytes_per_entity']:.0f} bytes per "
+            f"entity at {args.count} entities"
+        )
+        if unslotted := results[kind]["unslotted_attributes"]:
+            print(f"  stored in __dict__: {', '.join(unslotted)}")
+
+    output = args.output or Path(
+        f"memory-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    with output.open("w") as file:
+        json.dump(
+            {
+                "metadata": {
+                    "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                    "python": sys.version.split()[0],
+                    "count": args.count,
+                },
+                "kinds": results,
+            },
+            file,
+            indent=4,
+        )
+    print(f"Saved results to {output}.")
+    # Attributes missing from the slots are silently stored in a __dict__.
+    if unslotted_kinds := [
+        kind
+        for kind, result in results.items()
+        if result["unslotted_attributes"]
+    ]:
+        sys.exit(
+            f"Attributes stored in __dict__: {', '.join(unslotted_kinds)}."
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""Synthetic scenes that stress different parts of the game.
+
+Each scene puts the game into a repeatable state, then is ticked by the
+benchmark runner. Anything that keeps the scene at a constant load, such as
+replacing bullets that left the screen, is done in `refill()`, which isn't
+timed.
+"""
+
+from __future__ import annotations
+
+import random
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, override
+
+import pygame
+
+from src.components import entities, events
+from src.components.entities.behavior import Fire, Wait, move_along
+from src.components.entities.ecs import World
+from src.components.entities.enemy import Enemy
+from src.components.entities.patterns import Emitter, Pattern
+from src.components.entities.stage import Stage, StageRunner
+from src.components.managers import overlaymanager, statemanager
+from src.components.ui import widgethandler
+from src.core import renderqueue
+from src.core.data import settings, system_data
+from src.core.load import get_variant, load_image
+from src.states import optionmenus
+
+if TYPE_CHECKING:
+    from benchmarks.timing import Timer
+    from src.components.entities.behavior import Script
+    from src.components.entities.bulletfield import BulletField
+    from src.states.game import Game
+    from src.states.options import Options
+
+
+class Scene(ABC):
+    """Base class for benchmark scenes."""
+
+    name: str
+
+    def __init__(self, size: int):
+        """Creates the scene without entering it.
+
+        :param size: How many objects the scene should contain, interpreted by
+        each scene.
+        """
+        self.size = size
+
+    @abstractmethod
+    def setup(self) -> None:
+        """Puts the game into the state being benchmarked."""
+
+    @abstractmethod
+    def teardown(self) -> None:
+        """Returns the game to the state it was in before setup."""
+
+    def refill(self) -> None:
+        """Keeps the load of the scene constant between ticks.
+
+        Does nothing by default, for scenes whose load doesn't change.
+        """
+        return
+
+    @abstractmethod
+    def tick(self, timer: Timer) -> None:
+        """Updates and renders the scene once, timing each phase."""
+
+
+class GameScene(Scene, ABC):
+    """Base class for scenes taking place in the game state."""
+
+    game: Game
+
+    @override
+    def setup(self) -> None:
+        random.seed(0)
+        statemanager.append("game")
+        self.game = statemanager.current_state()
+        # Scenes spawn their own enemies, so the game's stage isn't run.
+        self.game.stage = StageRunner(self.game, Stage(()))
+        # The player can't be allowed to die, since it ends the game state.
+        self.game.player.health = 10**9
+
+    @override
+    def teardown(self) -> None:
+        statemanager.pop()
+
+    def fill_bullets(self, bullets: BulletField, y: int, speed: int) -> None:
+        """Spawns bullets in a row until the field has `size` bullets.
+
+        :param bullets: The bullet field to fill.
+        :param y: The y position to spawn the bullets at.
+        :param speed: The vertical velocity of the bullets.
+        """
+        positions = [
+            (random.randrange(system_data.abs_window_rect.width), y)
+            for _ in range(self.size - len(bullets))
+        ]
+        if positions:
+            bullets.spawn(positions, (0, speed))
+
+    @override
+    def tick(self, timer: Timer) -> None:
+        with (
+            timer.wrap(entities, "update_collisions"),
+            timer.wrap(widgethandler, "update"),
+            timer.measure("Game.update"),
+        ):
+            self.game.update()
+        with (
+            timer.wrap(widgethandler, "blit"),
+            timer.wrap(renderqueue, "flush"),
+            timer.measure("Game.render"),
+        ):
+            self.game.render()
+            renderqueue.flush()
+        # Advances game time like the game loop, which scripts are timed by.
+        system_data.game_time += system_data.dt * 100
+
+
+class BulletScene(GameScene):
+    """Player bullets flying up and enemy bullets flying down."""
+
+    name = "bullets"
+
+    @override
+    def refill(self) -> None:
+        rect = system_data.abs_window_rect
+        self.fill_bullets(self.game.player_bullets, rect.bottom - 2, -100)
+        self.fill_bullets(self.game.enemy_bullets, rect.top + 2, 100)
+
+
+class EnemyScene(GameScene):
+    """Enemies being shot by a constant stream of player bullets."""
+
+    name = "enemies"
+
+    @override
+    def setup(self) -> None:
+        self.sprite = load_image("oscarF", "opaque")
+        super().setup()
+
+    @override
+    def refill(self) -> None:
+        rect = system_data.abs_window_rect
+        while len(self.game.enemies) < self.size:
+            self.game.enemies.add(
+                Enemy(
+                    self.game,
+                    (
+                        random.randrange(rect.width),
+                        random.randrange(rect.height // 2),
+                    ),
+                    "center",
+                    sprite=self.sprite,
+                    sprite_scale=2,
+                )
+            )
+        self.fill_bullets(self.game.player_bullets, rect.bottom - 2, -100)
+        # Items dropped by killed enemies would otherwise pile up.
+        self.game.enemy_drops.empty()
+
+
+class ItemScene(GameScene):
+    """Items falling from the top of the screen."""
+
+    name = "items"
+
+    @override
+    def setup(self) -> None:
+        self.sprite = get_variant(load_image("level", "opaque"), scale=2)
+        super().setup()
+
+    @override
+    def refill(self) -> None:
+        missing = self.size - len(self.game.enemy_drops)
+        if missing <= 0:
+            return
+        rect = system_data.abs_window_rect
+        self.game.enemy_drops.spawn_many(
+            missing,
+            transform=[
+                (
+                    random.randrange(rect.width),
+                    random.randrange(rect.height // 4) + 20,
+                )
+                for _ in range(missing)
+            ],
+            velocity=(0, 1),
+            acceleration=(0, 7),
+            max_speed=30,
+            hitbox=self.sprite.get_size(),
+            sprite=self.sprite,
+        )
+
+
+class PatternScene(GameScene):
+    """Emitters each firing a rotating ring of 100 bullets every tick."""
+
+    name = "patterns"
+
+    @override
+    def setup(self) -> None:
+        super().setup()
+        rect = system_data.abs_window_rect
+        pattern = Pattern(count=100, speed=50, rotation=7)
+        self.emitters = [
+            (
+                Emitter(pattern, self.game.enemy_bullets),
+                (rect.width * (i + 1) // (self.size + 1), rect.height // 3),
+            )
+            for i in range(self.size)
+        ]
+
+    @override
+    def refill(self) -> None:
+        # Only the volleys fired this tick are kept, so the load is constant.
+        self.game.enemy_bullets.empty()
+
+    @override
+    def tick(self, timer: Timer) -> None:
+        with timer.measure("Emitter.fire"):
+            for emitter, origin in self.emitters:
+                emitter.fire(origin)
+        super().tick(timer)
+
+
+class ScriptScene(GameScene):
+    """Enemies patrolling and firing, driven by behavior scripts."""
+
+    name = "scripts"
+
+    @override
+    def setup(self) -> None:
+        self.sprite = load_image("oscarF", "opaque")
+        self.pattern = Pattern(count=8, speed=30)
+        super().setup()
+
+    @override
+    def refill(self) -> None:
+        rect = system_data.abs_window_rect
+        while len(self.game.enemies) < self.size:
+            points = [
+                (
+                    random.randrange(rect.width),
+                    random.randrange(rect.height // 2),
+                )
+                for _ in range(4)
+            ]
+            enemy = Enemy(self.game, points[0], "center", sprite=self.sprite)
+            self.game.enemies.add(enemy)
+            self.game.scheduler.start(enemy, self.patrol(points))
+        # Only the volleys fired this tick are kept, so the load is constant.
+        self.game.enemy_bullets.empty()
+
+    def patrol(self, points: list[tuple[int, int]]) -> Script:
+        """Moves around a loop of points, firing at each one."""
+        while True:
+            yield from move_along(points[1:] + points[:1], speed=20)
+            yield Fire(self.pattern)
+            yield Wait(250)
+
+    @override
+    def tick(self, timer: Timer) -> None:
+        with timer.wrap(self.game.scheduler, "update", "Scheduler.update"):
+            super().tick(timer)
+
+
+class ParticleScene(GameScene):
+    """Short-lived entities in an entity component system world."""
+
+    name = "particles"
+
+    @override
+    def setup(self) -> None:
+        self.sprite = load_image("level", "opaque")
+        self.world = World("particle", renderqueue.Layer.PARTICLES)
+        super().setup()
+
+    @override
+    def refill(self) -> None:
+        missing = self.size - len(self.world)
+        if missing <= 0:
+            return
+        rect = system_data.abs_window_rect
+        positions = [
+            (random.randrange(rect.width), random.randrange(rect.height))
+            for _ in range(missing)
+        ]
+        velocities = [
+            (random.uniform(-20, 20), random.uniform(-20, 20))
+            for _ in range(missing)
+        ]
+        self.world.spawn_many(
+            missing,
+            transform=positions,
+            velocity=velocities,
+            sprite=self.sprite,
+            lifetime=[random.uniform(500, 2000) for _ in range(missing)],
+        )
+
+    @override
+    def tick(self, timer: Timer) -> None:
+        with timer.measure("World.update"):
+            self.world.update()
+        # Queued before the game renders, and drawn when the queue is
+        # flushed after it.
+        with timer.measure("World.blit"):
+            self.world.blit()
+        super().tick(timer)
+
+
+class OptionsScene(Scene):
+    """The options state with every options overlay open at once.
+
+    The mouse is moved around the options panel every tick, so widgets are
+    constantly hovered.
+    """
+
+    name = "options"
+    overlays = (
+        optionmenus.GraphicsOptions,
+        optionmenus.KeybindsOptions,
+        optionmenus.AudioOptions,
+    )
+
+    options: Options
+
+    @override
+    def setup(self) -> None:
+        # The graphics options start on the current resolution, which has to
+        # be a display mode. The dummy video driver only has one.
+        self.resolution = settings.resolution
+        if settings.resolution not in (modes := pygame.display.list_modes()):
+            settings.resolution = modes[0]
+        # The options state opens the general options overlay itself.
+        statemanager.append("options")
+        self.options = statemanager.current_state()
+        for overlay in self.overlays:
+            overlaymanager.append(overlay)
+        self.ticks = 0
+
+    @override
+    def teardown(self) -> None:
+        # The general options overlay is removed by the options state.
+        for _ in self.overlays:
+            overlaymanager.pop()
+        statemanager.pop()
+        settings.resolution = self.resolution
+
+    @override
+    def tick(self, timer: Timer) -> None:
+        self.ticks += 1
+        rect = self.options.bg_rect
+        events.process(
+            [],
+            (
+                rect.left + self.ticks * 37 % rect.width,
+                rect.top + self.ticks * 23 % rect.height,
+            ),
+        )
+        with timer.wrap(widgethandler, "update"), timer.measure("update"):
+            self.options.update()
+            for overlay in overlaymanager.overlay_stack:
+                overlay.update()
+        with (
+            timer.wrap(widgethandler, "blit"),
+            timer.wrap(renderqueue, "flush"),
+            timer.measure("render"),
+        ):
+            self.options.render()
+            renderqueue.flush()
+            for overlay in overlaymanager.overlay_stack:
+                overlay.render()
+                renderqueue.flush()
+
+
+SCENES = {
+    scene.name: scene
+    for scene in (
+        BulletScene,
+        EnemyScene,
+        ItemScene,
+        PatternScene,
+        ScriptScene,
+        ParticleScene,
+        OptionsScene,
+    )
+}
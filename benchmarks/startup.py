@@ -0,0 +1,120 @@
+"""Measures how long the game takes to start up and present its first frame.
+
+Usage: ``python -m benchmarks.startup [--runs N] [--display] [--output FILE]``
+
+Each run starts the game in a fresh interpreter, so the timings include
+interpreter startup and every import, as they would for a player. The game is
+run headless with SDL's dummy video driver unless `--display` is passed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Ran in the child interpreter. Prints the wall clock time after importing
+# src and after presenting the first frame.
+_CHILD = """
+import time
+import src
+imported = time.time()
+src.main.tick()
+src.main.draw()
+print(imported, time.time())
+"""
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.startup",
+        description="Benchmarks the time to the game's first frame.",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=10, help="number of cold starts to time"
+    )
+    parser.add_argument(
+        "--display",
+        action="store_true",
+        help="open a real window instead of using the dummy video driver",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="json file to save results to, defaults to a timestamped file",
+    )
+    return parser.parse_args()
+
+
+def run_once(*, display: bool) -> tuple[float, float]:
+    """Starts the game in a new interpreter and times its startup.
+
+    :param display: Whether to open a real window.
+    :return: The seconds taken to import the game and to present the first
+    frame, both measured from when the interpreter was started.
+    """
+    env = os.environ.copy()
+    if not display:
+        env["SDL_VIDEODRIVER"] = "dummy"
+        env["SDL_AUDIODRIVER"] = "dummy"
+    start = time.time()
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    ).stdout
+    imported, presented = map(float, output.splitlines()[-1].split())
+    return imported - start, presented - start
+
+
+def main() -> None:
+    args = parse_args()
+    imports, frames = [], []
+    for run in range(args.runs):
+        imported, presented = run_once(display=args.display)
+        imports.append(imported * 1000)
+        frames.append(presented * 1000)
+        print(
+            f"run {run + 1}: imported in {imports[-1]:.0f} ms, first frame "
+            f"in {frames[-1]:.0f} ms"
+        )
+
+    results = {
+        "metadata": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "display": args.display,
+            "runs": args.runs,
+        },
+        "import_ms": {
+            "median": statistics.median(imports),
+            "min": min(imports),
+            "max": max(imports),
+        },
+        "first_frame_ms": {
+            "median": statistics.median(frames),
+            "min": min(frames),
+            "max": max(frames),
+        },
+    }
+    print(
+        f"median: imported in {results['import_ms']['median']:.0f} ms, first "
+        f"frame in {results['first_frame_ms']['median']:.0f} ms"
+    )
+    output = args.output or Path(
+        f"startup-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    with output.open("w") as file:
+        json.dump(results, file, indent=4)
+    print(f"Saved results to {output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Utilities for timing phases of a benchmark tick."""
+
+from __future__ import annotations
+
+import functools
+import statistics
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from types import ModuleType
+
+
+class Timer:
+    def __init__(self):
+        """Records how long each phase takes every tick in milliseconds.
+
+        Phases timed more than once in a tick are summed.
+        """
+        self.ticks: defaultdict[str, list[float]] = defaultdict(list)
+        self._current: defaultdict[str, float] = defaultdict(float)
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Times the body of the with statement as the given phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._current[phase] += (time.perf_counter() - start) * 1000
+
+    @contextmanager
+    def wrap(
+        self, module: ModuleType, name: str, phase: str | None = None
+    ) -> Iterator[None]:
+        """Times every call to a module's function inside the with statement.
+
+        The function is looked up on the module by whoever calls it, so it is
+        temporarily replaced with a timed version.
+
+        :param module: The module the function is an attribute of.
+        :param name: The name of the function.
+        :param phase: The phase to time the function as. Defaults to the
+        function's name prefixed with the module's name.
+        """
+        function = getattr(module, name)
+        if phase is None:
+            phase = f"{module.__name__.rsplit('.', 1)[-1]}.{name}"
+
+        @functools.wraps(function)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            with self.measure(phase):
+                return function(*args, **kwargs)
+
+        setattr(module, name, timed)
+        try:
+            yield
+        finally:
+            setattr(module, name, function)
+
+    def end_tick(self) -> None:
+        """Stores the timings of the current tick and starts the next one."""
+        for phase, milliseconds in self._current.items():
+            self.ticks[phase].append(milliseconds)
+        self._current.clear()
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Gets statistics of each phase's timings in milliseconds."""
+        summary = {}
+        for phase, timings in self.ticks.items():
+            ordered = sorted(timings)
+            summary[phase] = {
+                "mean": statistics.fmean(ordered),
+                "p50": ordered[len(ordered) // 2],
+                "p95": ordered[len(ordered) * 95 // 100],
+                "p99": ordered[len(ordered) * 99 // 100],
+                "max": ordered[-1],
+            }
+        return summary
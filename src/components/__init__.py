@@ -7,4 +7,3 @@ from src.components.colors import shift_rgb, ColorGradient
 from src.components.managers import statemanager, overlaymanager
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
@@ -3,4 +3,8 @@
 from src.components.entities.player import PlayerStats, Remi
 from src.components.entities.enemy import EnemyStats
 from src.components.entities.entity import EntityGroup
+from src.components.entities.bulletfield import BulletField
+from src.components.entities.ecs import EntityView, World
 from src.components.entities.collisionmanager import update_collisions
+from src.components.entities.stage import Stage, StageRunner, load_stage
+from src.components.entities.behavior import Scheduler
@@ -0,0 +1,242 @@
+"""Contains behavior scripts for entities and the scheduler running them.
+
+A behavior script is a generator that yields commands, each telling the
+scheduler what the entity does next and how many milliseconds of game time
+until the script should be resumed:
+
+    def patrol(enemy: Enemy, pattern: Pattern) -> Script:
+        while True:
+            yield from move_along([(100, 100), (300, 100)], speed=20)
+            yield Fire(pattern)
+            yield Wait(500)
+
+Scripts are run by a `Scheduler`, which keeps them in a heap ordered by the
+game time they are next due at, so a script that is waiting or moving costs
+nothing until it is due. Moving is done by setting the entity's velocity for
+as long as it takes to reach the target, which `Entity.update()` applies
+without running any of the script. An entity can run several scripts at
+once, e.g. one moving it and one firing, and scripts stop once their entity
+has been killed.
+
+Durations are in game time rather than updates, so waits and moves last the
+same time at any frame rate. Scripts are resumed on the first update after
+they are due, and each command starts at the time the previous one was due
+rather than when it was resumed, so the lateness doesn't add up.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, TypeAlias, override
+
+from src.core.data import system_data
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Sequence
+
+    from src.components.entities.enemy import Enemy
+    from src.components.entities.entity import Entity
+    from src.components.entities.patterns import Pattern
+    from src.core.types import RectAlignments
+
+Script: TypeAlias = "Generator[Command, None, None]"
+
+
+class Command(ABC):
+    """Something a script yields for its entity to do."""
+
+    @abstractmethod
+    def start(self, entity: Entity, late: float) -> float | None:
+        """Starts the command when it is yielded.
+
+        :param entity: The entity running the script.
+        :param late: How many milliseconds of game time ago the command
+        should have started.
+        :return: The number of milliseconds from when the command should have
+        started until the script is resumed, which is always on a later
+        update. The script is resumed straight away if None.
+        """
+
+    def finish(self, entity: Entity) -> None:
+        """Called when the script is resumed, before it continues.
+
+        Does nothing by default, since most commands are done once started.
+        """
+        return
+
+
+@dataclass(frozen=True)
+class Wait(Command):
+    """Resumes the script after a number of milliseconds of game time."""
+
+    milliseconds: float
+
+    @override
+    def start(self, entity: Entity, late: float) -> float:
+        return max(0, self.milliseconds)
+
+
+@dataclass(frozen=True)
+class MoveTo(Command):
+    """Moves the entity in a straight line, resuming when it arrives.
+
+    :param position: The position to move the entity's alignment point to.
+    :param speed: The speed to move at in pixels per unit of dt.
+    :param alignment: The point of the entity's abs_rect to move.
+    """
+
+    position: tuple[float, float]
+    speed: float
+    alignment: RectAlignments = "center"
+
+    @override
+    def start(self, entity: Entity, late: float) -> float | None:
+        x, y = entity.get_position(self.alignment)
+        target_x, target_y = self.position
+        distance = math.hypot(target_x - x, target_y - y)
+        if distance == 0 or self.speed <= 0:
+            return None
+        entity.dx = (target_x - x) / distance * self.speed
+        entity.dy = (target_y - y) / distance * self.speed
+        # A unit of dt is 100 milliseconds of game time.
+        duration = distance / self.speed * 100
+        if late > 0:
+            # Catches up to where the entity would be if started on time.
+            progress = min(late, duration) / duration
+            entity.move_to(
+                (
+                    x + (target_x - x) * progress,
+                    y + (target_y - y) * progress,
+                ),
+                self.alignment,
+            )
+        return duration
+
+    @override
+    def finish(self, entity: Entity) -> None:
+        entity.dx = entity.dy = 0.0
+        # Moves back the distance overshot since the entity was due to arrive.
+        entity.move_to(self.position, self.alignment)
+
+
+@dataclass(frozen=True)
+class Fire(Command):
+    """Fires the next volley of a pattern from the enemy straight away."""
+
+    pattern: Pattern
+
+    @override
+    def start(self, entity: Enemy, late: float) -> None:
+        entity.fire(self.pattern)
+
+
+def move_along(
+    path: Sequence[tuple[float, float]],
+    speed: float,
+    alignment: RectAlignments = "center",
+) -> Script:
+    """Moves through each point of a path in order, see `MoveTo`.
+
+    Used with `yield from` inside another script.
+    """
+    for point in path:
+        yield MoveTo(tuple(point), speed, alignment)
+
+
+def follow_path(
+    enemy: Enemy, path: Sequence[tuple[float, float]], speed: float
+) -> Script:
+    """Moves an enemy along a path, killing it if it ends off the screen.
+
+    :param enemy: The enemy to move, which should start at the first point.
+    :param path: The points the center of the enemy moves through.
+    :param speed: The speed to move at. The enemy stays where it is if 0.
+    """
+    if speed <= 0:
+        return
+    yield from move_along(path[1:], speed)
+    if not system_data.abs_window_rect.colliderect(enemy.abs_rect):
+        enemy.kill()
+
+
+def fire_pattern(_enemy: Enemy, pattern: Pattern) -> Script:
+    """Fires a pattern every time its interval passes, until killed.
+
+    :param _enemy: The enemy firing, which is unused since commands are run
+    on the script's entity, but is taken so that every script is started
+    the same way, e.g. `fire_pattern(enemy, pattern)`.
+    :param pattern: The pattern to fire.
+    """
+    interval = Wait(pattern.interval)
+    while True:
+        yield interval
+        yield Fire(pattern)
+
+
+class _Task:
+    __slots__ = ("command", "due", "entity", "script")
+
+    def __init__(self, entity: Entity, script: Script):
+        self.entity = entity
+        self.script = script
+        # The game time the script should be resumed at.
+        self.due = system_data.game_time
+        # The command the script is waiting on.
+        self.command: Command | None = None
+
+
+class Scheduler:
+    def __init__(self):
+        """Runs behavior scripts, resuming each once its game time is due."""
+        # Tasks by the game time they are due, then the order they were
+        # queued.
+        self.queue: list[tuple[float, int, _Task]] = []
+        self._order = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def start(self, entity: Entity, script: Script) -> None:
+        """Runs a script for an entity until its first wait.
+
+        :param entity: The entity the script controls, which must already be
+        in a group. The script is stopped once the entity isn't alive.
+        :param script: The script, e.g. `follow_path(enemy, path, speed)`.
+        """
+        self.run(_Task(entity, script))
+
+    def update(self) -> None:
+        """Resumes every script that is due by the current game time."""
+        queue = self.queue
+        now = system_data.game_time
+        due = []
+        # Scripts are popped first, so one queued again while resuming waits
+        # for the next update instead of looping forever.
+        while queue and queue[0][0] <= now:
+            due.append(heapq.heappop(queue)[2])
+        for task in due:
+            self.run(task)
+
+    def run(self, task: _Task) -> None:
+        """Resumes a script until it waits, ends or its entity is dead."""
+        if not task.entity.alive():
+            task.script.close()
+            return
+        if task.command is not None:
+            task.command.finish(task.entity)
+        now = system_data.game_time
+        for command in task.script:
+            duration = command.start(task.entity, now - task.due)
+            if duration is not None:
+                task.command = command
+                task.due += duration
+                heapq.heappush(self.queue, (task.due, next(self._order), task))
+                return
+            command.finish(task.entity)
+            if not task.entity.alive():
+                task.script.close()
+                return
@@ -0,0 +1,368 @@
+"""Contains a bullet engine storing every bullet in numpy arrays.
+
+Bullets in a `BulletField` aren't sprites. Each bullet is a row in a set of
+arrays (structure of arrays), so moving, culling and collision checks are done
+for every bullet at once by numpy, and drawing is done with a single blits
+call.
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pygame
+
+from src.components.entities.projectile import get_bullet_surface
+from src.core import dirty, renderqueue
+from src.core.constants import BULLET_FIELD_CAPACITY
+from src.core.data import settings, system_data
+from src.core.load import get_packed
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike
+
+    from src.components.entities.entity import Entity
+    from src.components.entities.hitbox import Hitbox
+
+
+class BulletField:
+    # The arrays holding a value for every bullet.
+    _arrays = (
+        "positions",
+        "previous_positions",
+        "velocities",
+        "sizes",
+        "radii",
+        "grazed",
+        "sprite_ids",
+    )
+
+    def __init__(
+        self,
+        owner_type: str,
+        layer: int,
+        capacity: int = BULLET_FIELD_CAPACITY,
+    ):
+        """Stores, moves and draws every bullet fired by one side.
+
+        Bullets are stored by the position of their center, their velocity in
+        pixels per unit of dt, the size of their hitbox, the radius of their
+        circular hitbox, whether they have been grazed, and the id of their
+        sprite in `sprites`. Only the first `count` rows of each array are
+        bullets, and the arrays double in size whenever they are full.
+
+        Bullets are removed once their hitbox is no longer fully inside the
+        internal surface, the same as projectile entities.
+
+        :param owner_type: The type of the entities firing the bullets, used
+        to make the type of the field, e.g. "player" makes "playerbullet".
+        :param layer: The render queue layer the bullets are drawn on.
+        :param capacity: The number of bullets to allocate space for.
+        """
+        self.type = f"{owner_type}bullet"
+        self.layer = layer
+        self.count = 0
+        self.positions = np.zeros((capacity, 2))
+        self.previous_positions = np.zeros((capacity, 2))
+        self.velocities = np.zeros((capacity, 2))
+        self.sizes = np.zeros((capacity, 2))
+        self.radii = np.zeros(capacity)
+        self.grazed = np.zeros(capacity, bool)
+        self.sprite_ids = np.zeros(capacity, np.intp)
+        self.sprites: list[pygame.Surface] = []
+        self._sprite_sizes = np.zeros((0, 2))
+        self._sprite_lookup: dict[int | tuple[int, int], int] = {}
+        self._index: tuple[np.ndarray, np.ndarray] | None = None
+        self._grid = (0, 0, 0)
+        self._max_half_size = (0, 0)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get_sprite_id(
+        self, sprite: pygame.Surface | None, size: tuple[int, int]
+    ) -> int:
+        """Gets the id of a sprite, adding it to the sprite table if needed.
+
+        :param sprite: The sprite surface. A white rectangle of the given size
+        is used if None.
+        :param size: The size of the hitbox.
+        """
+        key = id(sprite) if sprite is not None else tuple(size)
+        if (sprite_id := self._sprite_lookup.get(key)) is not None:
+            return sprite_id
+        if sprite is None:
+            sprite = get_bullet_surface(size)
+        self.sprites.append(get_packed(sprite))
+        self._sprite_sizes = np.vstack(
+            (self._sprite_sizes, sprite.get_size())
+        )
+        self._sprite_lookup[key] = len(self.sprites) - 1
+        return len(self.sprites) - 1
+
+    def spawn(
+        self,
+        positions: ArrayLike,
+        velocities: ArrayLike,
+        size: tuple[int, int] = (4, 4),
+        sprite: pygame.Surface | None = None,
+        origin: tuple[float, float] = (0, 0),
+        radius: float | None = None,
+    ) -> None:
+        """Adds bullets to the field.
+
+        Bullets are written straight into the field's arrays, so spawning a
+        volley from a precomputed array of positions doesn't allocate
+        anything unless the arrays need to grow.
+
+        :param positions: The center of each bullet relative to the origin,
+        as an (n, 2) array.
+        :param velocities: The velocity of each bullet, as an (n, 2) array,
+        or a single velocity shared by every bullet.
+        :param size: The size of the hitbox of every bullet.
+        :param sprite: The sprite of every bullet. A white rectangle the size
+        of the hitbox is used if None.
+        :param origin: The position the bullet positions are relative to.
+        :param radius: The radius of the circular hitbox of every bullet,
+        which is used against entities with a `Hitbox`. Defaults to the
+        largest circle fitting in the hitbox rect.
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        number = len(positions)
+        end = self.count + number
+        if end > len(self.positions):
+            self._grow(end)
+        self.positions[self.count : end] = positions
+        self.positions[self.count : end] += origin
+        self.previous_positions[self.count : end] = self.positions[
+            self.count : end
+        ]
+        self.velocities[self.count : end] = velocities
+        self.sizes[self.count : end] = size
+        self.radii[self.count : end] = (
+            min(size) / 2 if radius is None else radius
+        )
+        self.grazed[self.count : end] = False
+        self.sprite_ids[self.count : end] = self.get_sprite_id(sprite, size)
+        self.count = end
+        self._index = None
+
+    def _grow(self, minimum: int) -> None:
+        capacity = max(minimum, len(self.positions) * 2)
+        for name in self._arrays:
+            old = getattr(self, name)
+            new = np.zeros((capacity, *old.shape[1:]), old.dtype)
+            new[: self.count] = old[: self.count]
+            setattr(self, name, new)
+
+    def update(self) -> None:
+        """Moves every bullet and removes bullets that left the screen."""
+        n = self.count
+        if not n:
+            return
+        positions = self.positions[:n]
+        self.previous_positions[:n] = positions
+        positions += self.velocities[:n] * system_data.dt
+        self._index = None
+        if settings.dirty_rects:
+            self._mark_dirty()
+
+        half_sizes = self.sizes[:n] / 2
+        width, height = system_data.abs_window_rect.size
+        inside = (
+            (positions - half_sizes >= 0).all(axis=1)
+            & (positions[:, 0] + half_sizes[:, 0] <= width)
+            & (positions[:, 1] + half_sizes[:, 1] <= height)
+        )
+        if not inside.all():
+            self._keep(inside)
+
+    def build_index(self, cell_size: int) -> None:
+        """Sorts the bullets by the cell of a uniform grid they are in.
+
+        The grid covers the internal surface, with bullets outside of it
+        counted as being in the nearest cell. Until the bullets next move or
+        are added or removed, `collide_rect()` only checks the bullets in the
+        cells a rect overlaps instead of every bullet.
+
+        :param cell_size: The width and height of each cell in pixels.
+        """
+        width, height = system_data.abs_window_rect.size
+        columns, rows = -(-width // cell_size), -(-height // cell_size)
+        self._grid = (cell_size, columns, rows)
+        positions = self.positions[: self.count]
+        cells = np.floor_divide(positions, cell_size).astype(np.intp)
+        np.clip(cells, 0, (columns - 1, rows - 1), out=cells)
+        keys = cells[:, 1] * columns + cells[:, 0]
+        order = np.argsort(keys, kind="stable")
+        self._index = (order, keys[order])
+        # Bullets can collide this far from their center, by their rect or
+        # their circular hitbox.
+        self._max_half_size = (
+            np.maximum(
+                self.sizes[: self.count].max(axis=0) / 2,
+                self.radii[: self.count].max(),
+            )
+            if self.count
+            else (0, 0)
+        )
+
+    def _get_candidates(self, rect: pygame.Rect) -> np.ndarray:
+        """Gets the indices of the bullets in the grid cells a rect overlaps.
+
+        The rect is grown by the largest bullet's half size first, since
+        bullets are indexed by their center.
+        """
+        order, keys = self._index
+        cell_size, columns, rows = self._grid
+        half_width, half_height = self._max_half_size
+        left, top, right, bottom = (
+            int(min(max(coord // cell_size, 0), limit - 1))
+            for coord, limit in (
+                (rect.left - half_width, columns),
+                (rect.top - half_height, rows),
+                (rect.right + half_width, columns),
+                (rect.bottom + half_height, rows),
+            )
+        )
+        row_keys = np.arange(top, bottom + 1) * columns
+        starts = np.searchsorted(keys, row_keys + left)
+        ends = np.searchsorted(keys, row_keys + right, "right")
+        return np.concatenate(
+            [order[start:end] for start, end in zip(starts, ends, strict=True)]
+        )
+
+    def collide_rect(self, rect: pygame.Rect) -> np.ndarray:
+        """Gets the indices of the bullets with hitboxes colliding with a rect.
+
+        Only checks nearby bullets if the field has been indexed with
+        `build_index()` since the bullets last changed.
+
+        :param rect: The rect to check, e.g. the hitbox of an entity.
+        """
+        positions = self.positions[: self.count]
+        half_sizes = self.sizes[: self.count] / 2
+        candidates = None
+        if self._index is not None and self.count:
+            candidates = self._get_candidates(rect)
+            positions = positions[candidates]
+            half_sizes = half_sizes[candidates]
+        hits = np.flatnonzero(
+            (positions[:, 0] + half_sizes[:, 0] > rect.left)
+            & (positions[:, 0] - half_sizes[:, 0] < rect.right)
+            & (positions[:, 1] + half_sizes[:, 1] > rect.top)
+            & (positions[:, 1] - half_sizes[:, 1] < rect.bottom)
+        )
+        return hits if candidates is None else candidates[hits]
+
+    def collide_hitbox(
+        self,
+        hitbox: Hitbox,
+        position: tuple[float, float],
+        graze_distance: float = 0,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Gets the bullets colliding with and grazing a circle or capsule.
+
+        Uses the circular hitbox of each bullet. A bullet grazes the hitbox
+        if it is within `graze_distance` of it without colliding, and can
+        only graze once.
+
+        :param hitbox: The hitbox to check.
+        :param position: The position of the hitbox, usually the center of
+        the entity's rect.
+        :param graze_distance: How close a bullet has to get to graze.
+        :return: The indices of the colliding bullets, and of the bullets
+        that grazed for the first time.
+        """
+        if self._index is not None and self.count:
+            candidates = self._get_candidates(
+                hitbox.get_bounding_rect(position, graze_distance)
+            )
+        else:
+            candidates = np.arange(self.count)
+        gaps = hitbox.get_gaps(
+            position, self.positions[candidates], self.radii[candidates]
+        )
+        hits = candidates[gaps < 0]
+        if not graze_distance:
+            return hits, candidates[:0]
+        grazes = candidates[
+            (gaps >= 0) & (gaps < graze_distance) & ~self.grazed[candidates]
+        ]
+        self.grazed[grazes] = True
+        return hits, grazes
+
+    def kill(self, indices: ArrayLike) -> None:
+        """Removes bullets from the field.
+
+        :param indices: The indices of the bullets to remove.
+        """
+        keep = np.ones(self.count, bool)
+        keep[indices] = False
+        self._keep(keep)
+
+    def _keep(self, mask: np.ndarray) -> None:
+        """Removes every bullet not in the mask, keeping their order."""
+        kept = int(mask.sum())
+        for name in self._arrays:
+            array = getattr(self, name)
+            array[:kept] = array[: self.count][mask]
+        self.count = kept
+        self._index = None
+
+    def empty(self) -> None:
+        """Removes every bullet from the field."""
+        if settings.dirty_rects and self.count:
+            self._mark_dirty()
+        self.count = 0
+        self._index = None
+
+    def on_collide(self, collided_entity: Entity) -> None:
+        """Called whenever a bullet has collided with an entity.
+
+        Bullets are removed by the collision manager rather than here, so by
+        default this does nothing.
+        """
+
+    def _mark_dirty(self) -> None:
+        """Marks the area covering every bullet's sprite as dirty.
+
+        Covers both the previous and current positions of the bullets, since
+        they can be drawn anywhere between them when interpolating.
+        """
+        n = self.count
+        half_sprite = self._sprite_sizes.max(axis=0) / 2
+        points = np.concatenate(
+            (self.previous_positions[:n], self.positions[:n])
+        )
+        left, top = np.floor(points.min(axis=0) - half_sprite)
+        right, bottom = np.ceil(points.max(axis=0) + half_sprite)
+        dirty.mark(pygame.Rect(left, top, right - left, bottom - top))
+
+    def blit(self) -> None:
+        """Queues every bullet to be drawn centered on its position.
+
+        Bullets are interpolated between their previous and current positions
+        when the game loop uses a fixed timestep.
+        """
+        n = self.count
+        if not n:
+            return
+        positions = self.positions[:n]
+        if system_data.interpolation < 1:
+            previous = self.previous_positions[:n]
+            positions = (
+                previous + (positions - previous) * system_data.interpolation
+            )
+        sprite_ids = self.sprite_ids[:n]
+        topleft = (positions - self._sprite_sizes[sprite_ids] / 2).tolist()
+        if len(self.sprites) == 1:
+            sprites = itertools.repeat(self.sprites[0])
+        else:
+            sprites = map(self.sprites.__getitem__, sprite_ids.tolist())
+        # Not strict, since a single sprite is repeated forever.
+        renderqueue.submit_many(
+            self.layer, zip(sprites, topleft, strict=False)
+        )
@@ -1,55 +1,301 @@
-"""Handles collisions with entities."""
+"""Handles collisions with entities.
 
-from typing import TYPE_CHECKING
+Collisions are checked between collision layers, which are attributes of the
+game holding either an entity, an entity group, a bullet field or an entity
+component system world. Every pair of layers that can collide is listed in
+`layer_pairs`, along with how its collisions are resolved.
 
-import pygame.sprite
+Every tick, each layer is indexed once in a uniform grid, then every pair is
+resolved in a single pass by only checking colliders in nearby cells against
+each other. Bullets are then checked precisely against entities with circle or
+capsule hitboxes, see `src.components.entities.hitbox`.
 
+The callbacks of every collider are called before any of them are killed, and
+colliders killed while resolving a layer pair don't collide with anything else
+afterwards.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal
+
+from src.components.entities.bulletfield import BulletField
+from src.components.entities.ecs import EntityView, World
 from src.components.entities.entity import Entity, EntityGroup
+from src.components.entities.spatialhash import SpatialHash
+from src.core import instrumentation
+from src.core.constants import COLLISION_CELL_SIZE
 
 if TYPE_CHECKING:
     from src.states.game import Game
 
+logger = logging.getLogger("src.components.entities")
+
+
+@dataclass(frozen=True)
+class CollisionRule:
+    kill_a: bool = False
+    kill_b: bool = False
+    hitbox_a: Literal["rect", "abs_rect"] = "rect"
+    hitbox_b: Literal["rect", "abs_rect"] = "rect"
 
-def update_collisions(game: "Game") -> None:
+
+# Pairs of layers (a, b) that are checked for collisions. At least one layer
+# of each pair must be an entity or an entity group.
+layer_pairs: dict[tuple[str, str], CollisionRule] = {
+    ("player", "enemies"): CollisionRule(),
+    ("player_bullets", "enemies"): CollisionRule(kill_a=True, kill_b=True),
+    ("enemy_bullets", "player"): CollisionRule(kill_a=True),
+    ("player", "enemy_drops"): CollisionRule(
+        kill_b=True, hitbox_a="abs_rect"
+    ),
+}
+
+
+def update_collisions(game: Game) -> None:
     """Checks for collisions and notifies collided sprites."""
-    player_enemy_collisions = pygame.sprite.spritecollide(
-        game.player, game.enemies, dokill=False
-    )
-    handle_sprite_collisions(game.player, player_enemy_collisions)
+    layers = {
+        name: getattr(game, name) for pair in layer_pairs for name in pair
+    }
+    grids = build_grids(layers)
+    bullet_kills = {}
+    for (name_a, name_b), rule in layer_pairs.items():
+        layer_a, layer_b = layers[name_a], layers[name_b]
+        pair = (layer_a, layer_b)
+        if any(isinstance(layer, BulletField) for layer in pair):
+            collisions = resolve_bullet_pair(
+                layer_a, layer_b, rule, bullet_kills
+            )
+        elif any(isinstance(layer, World) for layer in pair):
+            collisions = resolve_world_pair(layer_a, layer_b, rule)
+        else:
+            collisions = resolve_entity_collisions(
+                layer_a, layer_b, grids[name_b], rule
+            )
+        if instrumentation.enabled:
+            logger.debug(
+                "%s collisions between %s and %s.",
+                len(collisions),
+                name_a,
+                name_b,
+            )
 
-    player_bullet_enemy_collisions = pygame.sprite.groupcollide(
-        game.player_bullets, game.enemies, dokilla=True, dokillb=True
-    )
-    handle_group_collisions(player_bullet_enemy_collisions)
-    print(*[f"{sprite} bullet" for sprite in game.player_bullets.sprites()])
-    print(*[f"{enemy} enemy" for enemy in game.enemies.sprites()])
+    for bullets, indices in bullet_kills.items():
+        bullets.kill(indices)
+
+
+def build_grids(
+    layers: dict[str, Entity | EntityGroup | BulletField | World],
+) -> dict[str, SpatialHash[Entity]]:
+    """Indexes every layer for this tick.
+
+    Bullet fields index themselves, and worlds are checked against each
+    entity directly, so only entity layers get a grid.
+
+    :return: The grid of each entity layer, by the layer's name.
+    """
+    grids = {}
+    for name, layer in layers.items():
+        if isinstance(layer, BulletField):
+            layer.build_index(COLLISION_CELL_SIZE)
+            continue
+        if isinstance(layer, World):
+            continue
+        grid = grids[name] = SpatialHash(COLLISION_CELL_SIZE)
+        for entity in get_entities(layer):
+            # Covers both hitboxes, since either can be used by a layer pair.
+            grid.insert(entity, entity.rect.union(entity.abs_rect))
+    return grids
 
-    enemy_bullet_player_collisions = pygame.sprite.spritecollide(
-        game.player, game.enemy_bullets, dokill=True
+
+def resolve_bullet_pair(
+    layer_a: Entity | EntityGroup | BulletField,
+    layer_b: Entity | EntityGroup | BulletField,
+    rule: CollisionRule,
+    bullet_kills: dict[BulletField, list[int]],
+) -> list[int]:
+    """Resolves a layer pair where one of the layers is a bullet field.
+
+    :param bullet_kills: The indices of the bullets to kill by their field,
+    which the collided bullets are added to if the rule kills them. They are
+    killed after every pair is resolved, since killing bullets moves the
+    other bullets to new indices.
+    :return: The indices of the bullets that collided.
+    """
+    if isinstance(layer_a, BulletField):
+        bullets, layer, hitbox = layer_a, layer_b, rule.hitbox_b
+        kill_bullets, kill_entities = rule.kill_a, rule.kill_b
+    else:
+        bullets, layer, hitbox = layer_b, layer_a, rule.hitbox_a
+        kill_bullets, kill_entities = rule.kill_b, rule.kill_a
+    collisions = resolve_bullet_collisions(
+        bullets, layer, hitbox, kill_entities=kill_entities
     )
-    handle_sprite_collisions(game.player, enemy_bullet_player_collisions)
+    if kill_bullets:
+        bullet_kills.setdefault(bullets, []).extend(collisions)
+    return collisions
+
+
+def resolve_world_pair(
+    layer_a: Entity | EntityGroup | World,
+    layer_b: Entity | EntityGroup | World,
+    rule: CollisionRule,
+) -> list[int]:
+    """Resolves a layer pair where one of the layers is a world.
 
-    enemy_drop_player_collisions = pygame.sprite.spritecollide(
-        game.player, game.enemy_drops, dokill=True, collided=abs1_spritecollide
+    :return: The ids of the world entities that collided.
+    """
+    if isinstance(layer_a, World):
+        return resolve_world_collisions(
+            layer_a,
+            layer_b,
+            rule.hitbox_b,
+            damage_world=rule.kill_a,
+            kill_entities=rule.kill_b,
+        )
+    return resolve_world_collisions(
+        layer_b,
+        layer_a,
+        rule.hitbox_a,
+        damage_world=rule.kill_b,
+        kill_entities=rule.kill_a,
     )
-    handle_sprite_collisions(game.player, enemy_drop_player_collisions)
 
 
-def handle_group_collisions(collisions: dict) -> None:
-    print("che", collisions.items())
-    for sprite, collided_sprites in collisions.items():
-        print(sprite, collided_sprites, "check")
-        for other_sprite in collided_sprites:
-            print(sprite, other_sprite, "checking")
-            sprite.on_collide(other_sprite)
-            other_sprite.on_collide(sprite)
+def get_entities(layer: Entity | EntityGroup) -> list[Entity]:
+    if isinstance(layer, Entity):
+        return [layer]
+    return layer.sprites()
+
+
+def is_alive(entity: Entity, layer: Entity | EntityGroup) -> bool:
+    """Checks if an entity can still collide.
+
+    Entities in a group can't once they are killed, while entities that are
+    a layer by themselves, like the player, aren't in any group.
+    """
+    return entity is layer or entity.alive()
+
+
+def resolve_entity_collisions(
+    layer_a: Entity | EntityGroup,
+    layer_b: Entity | EntityGroup,
+    grid_b: SpatialHash[Entity],
+    rule: CollisionRule,
+) -> list[tuple[Entity, Entity]]:
+    """Notifies every pair of colliding entities between two layers.
+
+    :return: Every pair of entities that collided.
+    """
+    collisions = []
+    for entity in get_entities(layer_a):
+        hitbox = getattr(entity, rule.hitbox_a)
+        for other_entity in grid_b.query(hitbox):
+            if not (
+                is_alive(entity, layer_a) and is_alive(other_entity, layer_b)
+            ):
+                continue
+            if hitbox.colliderect(getattr(other_entity, rule.hitbox_b)):
+                handle_sprite_collisions(entity, [other_entity])
+                collisions.append((entity, other_entity))
+    for entity, other_entity in collisions:
+        if rule.kill_a:
+            entity.kill()
+        if rule.kill_b:
+            other_entity.kill()
+    return collisions
+
+
+def resolve_bullet_collisions(
+    bullets: BulletField,
+    layer: Entity | EntityGroup,
+    hitbox: Literal["rect", "abs_rect"],
+    *,
+    kill_entities: bool,
+) -> list[int]:
+    """Notifies every entity in a layer of the bullets colliding with it.
+
+    Entities with a circle or capsule hitbox are checked against the circular
+    hitbox of each bullet, and notified of bullets grazing them. Otherwise
+    the given rect of the entity is used.
+
+    Entities are notified once per bullet while they are alive. Every bullet
+    colliding with an entity that was alive is counted as having collided,
+    even if the entity was killed by another bullet.
+
+    :return: The indices of the bullets that collided.
+    """
+    collisions = []
+    collided_entities = []
+    for entity in get_entities(layer):
+        if not is_alive(entity, layer):
+            continue
+        if entity.hitbox is None:
+            hits = bullets.collide_rect(getattr(entity, hitbox))
+        else:
+            hits, grazes = bullets.collide_hitbox(
+                entity.hitbox, entity.rect.center, entity.graze_distance
+            )
+            if grazes.size:
+                entity.on_graze(bullets, len(grazes))
+        if not hits.size:
+            continue
+        for _ in hits:
+            if not is_alive(entity, layer):
+                break
+            handle_sprite_collisions(entity, [bullets])
+        collisions.extend(hits.tolist())
+        collided_entities.append(entity)
+    if kill_entities:
+        for entity in collided_entities:
+            entity.kill()
+    return collisions
+
+
+def resolve_world_collisions(
+    world: World,
+    layer: Entity | EntityGroup,
+    hitbox: Literal["rect", "abs_rect"],
+    *,
+    damage_world: bool,
+    kill_entities: bool,
+) -> list[int]:
+    """Notifies every entity in a layer of world entities colliding with it.
+
+    Each entity is checked against the hitbox of every world entity in one
+    pass, and notified of each collision with an `EntityView` of the world
+    entity.
+
+    :param damage_world: Whether to take one health from the world entities
+    per entity they collided with, destroying them once they run out.
+    :param kill_entities: Whether to kill the entities that collided.
+    :return: The ids of the world entities that collided.
+    """
+    collisions = []
+    collided_entities = []
+    for entity in get_entities(layer):
+        if not is_alive(entity, layer):
+            continue
+        hits = world.collide_rect(getattr(entity, hitbox)).tolist()
+        if not hits:
+            continue
+        for entity_id in hits:
+            if not is_alive(entity, layer):
+                break
+            handle_sprite_collisions(entity, [EntityView(world, entity_id)])
+        collisions.extend(hits)
+        collided_entities.append(entity)
+    if damage_world:
+        world.damage(collisions)
+    if kill_entities:
+        for entity in collided_entities:
+            entity.kill()
+    return collisions
 
 
 def handle_sprite_collisions(sprite: Entity, collisions: list) -> None:
     for other_sprite in collisions:
         sprite.on_collide(other_sprite)
         other_sprite.on_collide(sprite)
-
-
-def abs1_spritecollide(sprite1: Entity, sprite2: Entity) -> bool:
-    return sprite1.abs_rect.colliderect(sprite2.rect)
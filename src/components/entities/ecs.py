@@ -0,0 +1,476 @@
+"""Contains an opt-in entity component system for large numbers of entities.
+
+Entities in a `World` aren't objects. Each is an id with a set of components,
+and entities with the same set of components, an archetype, are stored
+together as rows of one array per component. Systems update every entity
+with the components they need using a few numpy operations per archetype,
+instead of calling a Python method on every entity:
+
+- Movement accelerates every entity with an acceleration, up to its max
+  speed, then moves every entity with a transform by its velocity,
+  destroying entities that leave the world's bounds, if it has any.
+- Lifetime counts down lifetimes, destroying entities when they run out.
+- Collision finds the entities with a hitbox overlapping a rect, and damages
+  entities with health.
+- Render queues every entity with a sprite to be drawn in one batch.
+
+The components are:
+
+- transform: The position of the entity's center.
+- velocity: The velocity in pixels per unit of dt.
+- acceleration: The velocity added per unit of dt.
+- max_speed: The speed the velocity is limited to.
+- hitbox: The width and height of the hitbox rect centered on the transform.
+- sprite: The surface to draw, stored by its id in the world's sprite table.
+- health: Hits left before the entity is destroyed.
+- lifetime: Milliseconds left before the entity is destroyed.
+
+Worlds are opt in. The game keeps the items dropped by enemies in one, while
+everything else is still an `Entity`. `EntityView` is a facade giving an
+entity in a world the parts of the `Entity` interface used by collisions, so
+entities can collide with it.
+
+The ids of destroyed entities are reused by later spawns, so a world of
+short-lived entities doesn't grow forever. Each id has a generation that is
+incremented when its entity is destroyed, which lets an `EntityView` tell
+that its entity is gone even once the id has been reused.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pygame
+
+from src.core import dirty, renderqueue
+from src.core.constants import ECS_ARCHETYPE_CAPACITY
+from src.core.data import settings, system_data
+from src.core.load import get_packed
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from numpy.typing import ArrayLike
+
+    from src.components.entities.entity import Entity
+
+# The shape and dtype of one entity's value of each component.
+COMPONENTS: dict[str, tuple[tuple[int, ...], type]] = {
+    "transform": ((2,), float),
+    "velocity": ((2,), float),
+    "acceleration": ((2,), float),
+    "max_speed": ((), float),
+    "hitbox": ((2,), float),
+    "sprite": ((), np.intp),
+    "health": ((), int),
+    "lifetime": ((), float),
+}
+
+
+class Archetype:
+    def __init__(
+        self,
+        components: frozenset[str],
+        capacity: int = ECS_ARCHETYPE_CAPACITY,
+    ):
+        """Stores every entity with exactly the same set of components.
+
+        Each component is a column array with a row per entity, and only the
+        first `count` rows are entities. Entities with a transform also store
+        their previous transform, for interpolating when rendering.
+
+        :param components: The names of the components in `COMPONENTS`.
+        :param capacity: The number of entities to allocate space for.
+        """
+        if unknown := components - COMPONENTS.keys():
+            msg = f"Unknown components: {sorted(unknown)}."
+            raise ValueError(msg)
+        self.components = components
+        self.count = 0
+        self.ids = np.zeros(capacity, np.intp)
+        self.columns: dict[str, np.ndarray] = {}
+        for name in components:
+            shape, dtype = COMPONENTS[name]
+            self.columns[name] = np.zeros((capacity, *shape), dtype)
+        if "transform" in components:
+            self.columns["previous"] = np.zeros((capacity, 2))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def has(self, *components: str) -> bool:
+        return self.components.issuperset(components)
+
+    def add(self, ids: np.ndarray, values: dict[str, ArrayLike]) -> None:
+        """Adds entities to the end of the columns.
+
+        :param ids: The ids of the entities.
+        :param values: The value of every component, either one per entity
+        or one shared by every entity.
+        """
+        end = self.count + len(ids)
+        if end > len(self.ids):
+            self._grow(end)
+        self.ids[self.count : end] = ids
+        for name, value in values.items():
+            self.columns[name][self.count : end] = value
+        if "previous" in self.columns:
+            self.columns["previous"][self.count : end] = self.columns[
+                "transform"
+            ][self.count : end]
+        self.count = end
+
+    def keep(self, mask: np.ndarray) -> None:
+        """Removes every entity not in the mask, keeping their order."""
+        kept = int(mask.sum())
+        self.ids[:kept] = self.ids[: self.count][mask]
+        for column in self.columns.values():
+            column[:kept] = column[: self.count][mask]
+        self.count = kept
+
+    def _grow(self, minimum: int) -> None:
+        capacity = max(minimum, len(self.ids) * 2)
+        for name, old in (("ids", self.ids), *self.columns.items()):
+            new = np.zeros((capacity, *old.shape[1:]), old.dtype)
+            new[: self.count] = old[: self.count]
+            if name == "ids":
+                self.ids = new
+            else:
+                self.columns[name] = new
+
+
+class World:
+    def __init__(
+        self,
+        entity_type: str,
+        layer: int,
+        bounds: pygame.Rect | None = None,
+    ):
+        """Stores entities by archetype and runs the systems over them.
+
+        :param entity_type: The type of every entity in the world, as seen
+        by entities colliding with them, e.g. "enemy".
+        :param layer: The render queue layer the entities are drawn on.
+        :param bounds: The area entities are destroyed when their transform
+        leaves, e.g. the window. Entities are never destroyed for moving if
+        None.
+        """
+        self.type = entity_type
+        self.layer = layer
+        self.bounds = bounds
+        self.archetypes: dict[frozenset[str], Archetype] = {}
+        # The archetype, row and generation of every id. Destroyed entities
+        # have a row of -1 until their id is reused.
+        self._archetype_of: list[Archetype] = []
+        self._rows = np.zeros(ECS_ARCHETYPE_CAPACITY, np.intp)
+        self._generations = np.zeros(ECS_ARCHETYPE_CAPACITY, np.intp)
+        # Ids of destroyed entities, reused by the next spawns.
+        self._free_ids = np.zeros(0, np.intp)
+        self.sprites: list[pygame.Surface] = []
+        self._sprite_sizes = np.zeros((0, 2))
+        self._sprite_lookup: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return sum(len(archetype) for archetype in self.archetypes.values())
+
+    def query(self, *components: str) -> Iterator[Archetype]:
+        """Gets every archetype with entities having the given components."""
+        for archetype in self.archetypes.values():
+            if archetype.count and archetype.has(*components):
+                yield archetype
+
+    def get_sprite_id(self, sprite: pygame.Surface) -> int:
+        """Gets the id of a sprite, adding it to the sprite table if needed."""
+        if (sprite_id := self._sprite_lookup.get(id(sprite))) is not None:
+            return sprite_id
+        self.sprites.append(get_packed(sprite))
+        self._sprite_sizes = np.vstack(
+            (self._sprite_sizes, sprite.get_size())
+        )
+        self._sprite_lookup[id(sprite)] = len(self.sprites) - 1
+        return len(self.sprites) - 1
+
+    def spawn(self, **components: Any) -> int:
+        """Adds an entity.
+
+        :param components: The value of each of the entity's components. The
+        sprite component is given as a surface.
+        :return: The id of the entity.
+        """
+        return int(self.spawn_many(1, **components)[0])
+
+    def spawn_many(self, number: int, **components: Any) -> np.ndarray:
+        """Adds entities with the same components in one batch.
+
+        :param number: The number of entities to add.
+        :param components: The value of each of the entities' components,
+        either as an array with a value per entity, or a single value shared
+        by every entity. The sprite component is given as a single surface.
+        :return: The ids of the entities.
+        """
+        if "sprite" in components:
+            components["sprite"] = self.get_sprite_id(components["sprite"])
+        key = frozenset(components)
+        if (archetype := self.archetypes.get(key)) is None:
+            archetype = self.archetypes[key] = Archetype(key)
+        free = len(self._free_ids)
+        reused = min(number, free)
+        start = len(self._archetype_of)
+        end = start + number - reused
+        ids = np.concatenate(
+            (self._free_ids[free - reused :], np.arange(start, end))
+        )
+        self._free_ids = self._free_ids[: free - reused]
+        if end > len(self._rows):
+            self._grow(end)
+        self._rows[ids] = np.arange(archetype.count, archetype.count + number)
+        for entity_id in ids[:reused].tolist():
+            self._archetype_of[entity_id] = archetype
+        self._archetype_of.extend([archetype] * (end - start))
+        archetype.add(ids, components)
+        return ids
+
+    def _grow(self, minimum: int) -> None:
+        capacity = max(minimum, len(self._rows) * 2)
+        count = len(self._archetype_of)
+        rows = np.zeros(capacity, np.intp)
+        rows[:count] = self._rows[:count]
+        generations = np.zeros(capacity, np.intp)
+        generations[:count] = self._generations[:count]
+        self._rows, self._generations = rows, generations
+
+    def has(self, entity_id: int, *components: str) -> bool:
+        """Checks if an entity has every one of the given components."""
+        return self._archetype_of[entity_id].has(*components)
+
+    def is_alive(self, entity_id: int) -> bool:
+        return (
+            entity_id < len(self._archetype_of)
+            and self._rows[entity_id] >= 0
+        )
+
+    def get_generation(self, entity_id: int) -> int:
+        """Gets how many times the entity with an id has been destroyed."""
+        return int(self._generations[entity_id])
+
+    def get(self, entity_id: int, component: str) -> np.ndarray:
+        """Gets a view of one entity's component, which can be modified.
+
+        :raises KeyError: If the entity doesn't have the component.
+        """
+        archetype = self._archetype_of[entity_id]
+        return archetype.columns[component][self._rows[entity_id]]
+
+    def destroy(self, ids: ArrayLike) -> None:
+        """Removes entities. Ids of destroyed entities are ignored.
+
+        :param ids: The ids of the entities.
+        """
+        rows: dict[frozenset[str], list[int]] = {}
+        for entity_id in np.unique(ids).tolist():
+            if self.is_alive(entity_id):
+                key = self._archetype_of[entity_id].components
+                rows.setdefault(key, []).append(int(self._rows[entity_id]))
+        for key, archetype_rows in rows.items():
+            archetype = self.archetypes[key]
+            keep = np.ones(archetype.count, bool)
+            keep[archetype_rows] = False
+            self._remove(archetype, keep)
+
+    def _remove(self, archetype: Archetype, keep: np.ndarray) -> None:
+        """Removes every entity of an archetype not in the mask."""
+        if settings.dirty_rects:
+            self._mark_dirty(archetype)
+        removed = archetype.ids[: archetype.count][~keep]
+        self._rows[removed] = -1
+        self._generations[removed] += 1
+        self._free_ids = np.concatenate((self._free_ids, removed))
+        archetype.keep(keep)
+        self._rows[archetype.ids[: archetype.count]] = np.arange(
+            archetype.count
+        )
+
+    def empty(self) -> None:
+        """Removes every entity."""
+        for archetype in list(self.query()):
+            self._remove(archetype, np.zeros(archetype.count, bool))
+
+    def update(self) -> None:
+        """Runs the movement and lifetime systems."""
+        dt = system_data.dt
+        for archetype in list(self.query("transform")):
+            n = archetype.count
+            transforms = archetype.columns["transform"][:n]
+            archetype.columns["previous"][:n] = transforms
+            if archetype.has("velocity"):
+                velocities = archetype.columns["velocity"][:n]
+                if archetype.has("acceleration"):
+                    velocities += archetype.columns["acceleration"][:n] * dt
+                if archetype.has("max_speed"):
+                    self._limit_speed(
+                        velocities, archetype.columns["max_speed"][:n]
+                    )
+                transforms += velocities * dt
+            if settings.dirty_rects and archetype.has("sprite"):
+                self._mark_dirty(archetype)
+            if (bounds := self.bounds) is not None:
+                inside = (
+                    (transforms[:, 0] >= bounds.left)
+                    & (transforms[:, 0] < bounds.right)
+                    & (transforms[:, 1] >= bounds.top)
+                    & (transforms[:, 1] < bounds.bottom)
+                )
+                if not inside.all():
+                    self._remove(archetype, inside)
+        for archetype in list(self.query("lifetime")):
+            lifetimes = archetype.columns["lifetime"][: archetype.count]
+            lifetimes -= dt * 100
+            if (expired := lifetimes <= 0).any():
+                self._remove(archetype, ~expired)
+
+    @staticmethod
+    def _limit_speed(velocities: np.ndarray, max_speeds: np.ndarray) -> None:
+        """Scales down every velocity faster than its max speed in place."""
+        speeds = np.hypot(velocities[:, 0], velocities[:, 1])
+        if (too_fast := speeds > max_speeds).any():
+            velocities[too_fast] *= (max_speeds / speeds)[too_fast, np.newaxis]
+
+    def collide_rect(self, rect: pygame.Rect) -> np.ndarray:
+        """Gets the ids of every entity with a hitbox colliding with a rect.
+
+        :param rect: The rect to check, e.g. the hitbox of an entity.
+        """
+        hits = []
+        for archetype in self.query("transform", "hitbox"):
+            n = archetype.count
+            positions = archetype.columns["transform"][:n]
+            half_sizes = archetype.columns["hitbox"][:n] / 2
+            hits.append(
+                archetype.ids[:n][
+                    (positions[:, 0] + half_sizes[:, 0] > rect.left)
+                    & (positions[:, 0] - half_sizes[:, 0] < rect.right)
+                    & (positions[:, 1] + half_sizes[:, 1] > rect.top)
+                    & (positions[:, 1] - half_sizes[:, 1] < rect.bottom)
+                ]
+            )
+        return np.concatenate(hits) if hits else np.zeros(0, np.intp)
+
+    def damage(self, ids: ArrayLike, amount: int = 1) -> None:
+        """Takes health from entities, destroying those left without any.
+
+        Entities without health are destroyed straight away.
+
+        :param ids: The ids of the entities. An id appearing more than once
+        is damaged once per appearance.
+        :param amount: The health to take from each entity.
+        """
+        destroyed = []
+        for entity_id in np.asarray(ids).tolist():
+            if not self.is_alive(entity_id):
+                continue
+            archetype = self._archetype_of[entity_id]
+            if not archetype.has("health"):
+                destroyed.append(entity_id)
+                continue
+            health = archetype.columns["health"]
+            health[self._rows[entity_id]] -= amount
+            if health[self._rows[entity_id]] <= 0:
+                destroyed.append(entity_id)
+        self.destroy(destroyed)
+
+    def blit(self) -> None:
+        """Queues every entity with a sprite to be drawn centered on it.
+
+        Entities are interpolated between their previous and current
+        transforms when the game loop uses a fixed timestep.
+        """
+        for archetype in self.query("transform", "sprite"):
+            n = archetype.count
+            positions = archetype.columns["transform"][:n]
+            if system_data.interpolation < 1:
+                previous = archetype.columns["previous"][:n]
+                positions = (
+                    previous
+                    + (positions - previous) * system_data.interpolation
+                )
+            sprite_ids = archetype.columns["sprite"][:n]
+            topleft = (positions - self._sprite_sizes[sprite_ids] / 2).tolist()
+            sprites = map(self.sprites.__getitem__, sprite_ids.tolist())
+            renderqueue.submit_many(
+                self.layer, zip(sprites, topleft, strict=True)
+            )
+
+    def _mark_dirty(self, archetype: Archetype) -> None:
+        """Marks the area covering the sprites of an archetype as dirty."""
+        if not archetype.has("transform", "sprite"):
+            return
+        n = archetype.count
+        half_sprite = (
+            self._sprite_sizes[archetype.columns["sprite"][:n]].max(axis=0)
+            / 2
+        )
+        points = np.concatenate(
+            (
+                archetype.columns["previous"][:n],
+                archetype.columns["transform"][:n],
+            )
+        )
+        left, top = np.floor(points.min(axis=0) - half_sprite)
+        right, bottom = np.ceil(points.max(axis=0) + half_sprite)
+        dirty.mark(pygame.Rect(left, top, right - left, bottom - top))
+
+
+class EntityView:
+    def __init__(self, world: World, entity_id: int):
+        """Facade letting an entity in a world be used like an `Entity`.
+
+        :param world: The world the entity is in.
+        :param entity_id: The id of the entity.
+        """
+        self.world = world
+        self.id = entity_id
+        # Tells this entity apart from later entities reusing its id.
+        self.generation = world.get_generation(entity_id)
+
+    @property
+    def type(self) -> str:
+        return self.world.type
+
+    @property
+    def position(self) -> tuple[float, float]:
+        x, y = self.world.get(self.id, "transform").tolist()
+        return x, y
+
+    @property
+    def rect(self) -> pygame.Rect:
+        """The entity's hitbox rect, or an empty rect if it has no hitbox."""
+        size = (
+            self.world.get(self.id, "hitbox").tolist()
+            if self.world.has(self.id, "hitbox")
+            else (0, 0)
+        )
+        rect = pygame.Rect((0, 0), size)
+        rect.center = self.position
+        return rect
+
+    @property
+    def abs_rect(self) -> pygame.Rect:
+        return self.rect
+
+    def alive(self) -> bool:
+        return (
+            self.world.is_alive(self.id)
+            and self.world.get_generation(self.id) == self.generation
+        )
+
+    def kill(self) -> None:
+        if self.alive():
+            self.world.destroy([self.id])
+
+    def on_collide(self, collided_entity: Entity) -> None:
+        """Called whenever the entity has collided with another entity.
+
+        Damage is dealt by the collision manager rather than here, so this
+        does nothing.
+        """
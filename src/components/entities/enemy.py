@@ -5,14 +5,13 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from typing import TypedDict, override
 
-import pygame
-
 from src.components.entities.entity import Entity
-from src.components.entities.item import FallingItem
-from src.components.entities.projectile import Projectile
-from src.core.load import Load
+from src.components.entities.patterns import Emitter
+from src.core.load import get_variant, load_image
 
 if TYPE_CHECKING:
+    from src.components.entities.bulletfield import BulletField
+    from src.components.entities.patterns import Pattern
     from src.states import Game
 
 
@@ -24,38 +23,58 @@ class Enemy(Entity):
     """Base class for all the game's enemies."""
 
     def __init__(
-        self, game: Game, *args, stats: EnemyStats | None = None, **kwargs
+        self,
+        game: Game,
+        *args,
+        stats: EnemyStats | None = None,
+        **kwargs,
     ):
+        """Enemy that moves and fires bullet patterns.
+
+        Enemies don't do anything by themselves every update besides moving
+        at their velocity. What they do is driven by behavior scripts run by
+        the game's scheduler, see `src.components.entities.behavior`.
+
+        :param game: The game the enemy is in.
+        :param stats: The stats of the enemy.
+        """
         super().__init__(*args, **kwargs)
         self.type = "enemy"
         self.game = game
         stats = {} if stats is None else stats
         self.health = stats.get("health", 1)
+        # The emitter of each pattern the enemy has fired, which keeps track
+        # of how far the pattern has rotated.
+        self.emitters: dict[Pattern, Emitter] = {}
 
-    @override
-    def update(self) -> None:
-        ...
+    def fire(self, pattern: Pattern) -> None:
+        """Fires the next volley of a pattern from the enemy's center.
+
+        :param pattern: The pattern to fire.
+        """
+        if (emitter := self.emitters.get(pattern)) is None:
+            emitter = Emitter(pattern, self.game.enemy_bullets)
+            self.emitters[pattern] = emitter
+        emitter.fire(self.get_position("center"))
 
     @override
     def blit(self) -> None:
         super().blit()
 
     @override
-    def on_collide(self, sprite: Entity) -> None:
-        if isinstance(sprite, Projectile):
+    def on_collide(self, sprite: Entity | BulletField) -> None:
+        if sprite.type == "playerbullet":
             self.drop_item()
             self.kill()
 
     def drop_item(self) -> None:
-        self.game.enemy_drops.add(
-            FallingItem(
-                1,
-                self.abs_rect.center,
-                acceleration=7,
-                max_speed=30,
-                sprite=pygame.image.load(
-                    Load("image").path["level"]
-                ).convert(),
-                sprite_scale=2,
-            )
+        """Drops an item falling from the enemy's center."""
+        sprite = get_variant(load_image("level", "opaque"), scale=2)
+        self.game.enemy_drops.spawn(
+            transform=self.get_position("center"),
+            velocity=(0, 1),
+            acceleration=(0, 7),
+            max_speed=30,
+            hitbox=sprite.get_size(),
+            sprite=sprite,
         )
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import math
 from abc import ABC
 from typing import Literal, TYPE_CHECKING
 from typing import override
@@ -9,18 +10,56 @@ from typing import override
 import pygame.display
 from pygame.sprite import Sprite
 
-from src.core import system_data
-from src.core.load import Load, get_sprites
+from src.components.entities.spatialhash import SpatialHash
+from src.core import dirty, renderqueue, settings, system_data
+from src.core.constants import QUERY_CELL_SIZE
+from src.core.load import Load, get_packed, get_sprites, get_variant, is_cached
 
 if TYPE_CHECKING:
+    from src.components.entities.bulletfield import BulletField
+    from src.components.entities.hitbox import Hitbox
     from src.core.types import RectAlignments
 
 
 class Entity(Sprite, ABC):
+    # Instance attributes are stored in slots rather than a __dict__, which
+    # saves memory for entities there are thousands of, such as bullets.
+    # Subclasses that don't declare __slots__ get a __dict__ as usual, so
+    # slots only need declaring on high-count classes. pygame's Sprite
+    # doesn't declare slots, so the private attributes it sets in __init__,
+    # `__g`, `__image` and `__rect`, are included under their mangled names.
+    __slots__ = (
+        "_Sprite__g",
+        "_Sprite__image",
+        "_Sprite__rect",
+        "_abs_rect",
+        "_rect",
+        "_rect_delta",
+        "_synced_x",
+        "_synced_y",
+        "dx",
+        "dy",
+        "previous_pos",
+        "rect_alignment",
+        "rect_offset",
+        "spawn_alignment",
+        "spawnpoint",
+        "sprite",
+        "sprites",
+        "type",
+        "x",
+        "y",
+    )
 
     type: (
         Literal["player", "enemy", "playerbullet", "enemybullet", "item"] | str
     )
+    # Circle or capsule used instead of the rect when colliding with bullets.
+    hitbox: Hitbox | None = None
+    # How close bullets have to get to the hitbox to graze the entity.
+    graze_distance: float = 0
+    # The render queue layer the entity is drawn on.
+    layer: int = renderqueue.Layer.ENEMIES
 
     def __init__(
         self,
@@ -35,6 +74,14 @@ class Entity(Sprite, ABC):
     ):
         """Base class for all the game's entities.
 
+        The position of an entity is the topleft of its abs_rect, stored as
+        floats in `x` and `y`, and it moves by its velocity, `dx` and `dy`,
+        every update. The rect and abs_rect are derived from the position,
+        rounded to whole pixels, the first time they are used after the
+        entity moves, so entities that aren't collided with or drawn don't
+        update their rects, and slow entities don't lose movement to
+        rounding. The rects must not be moved directly.
+
         :param spawnpoint: The position the entity should start at.
         :param spawn_alignment: The alignment of the spawnpoint coordinates.
         :param sprite: Either a singular surface of the sprite, or the string
@@ -57,92 +104,189 @@ class Entity(Sprite, ABC):
             msg = "Must provide either sprite or sprite_rect, not neither."
             raise ValueError(msg)
         if isinstance(sprite, str):
-            if sprite_scale > 1:
-                self.sprites = tuple(
-                    pygame.transform.scale_by(sprite, 2)
-                    for sprite in get_sprites(Load("image").path[sprite])
-                )
-            else:
-                self.sprites = get_sprites(Load("image").path[sprite])
+            self.sprites = tuple(
+                get_packed(get_variant(sprite, scale=sprite_scale))
+                for sprite in get_sprites(Load("image").path[sprite])
+            )
             self.sprite = self.sprites[0]
         else:
             self.sprites = ()
             if sprite is None:
                 self.sprite = pygame.Surface(sprite_rect.size)
-                self.rect = sprite_rect
             else:
                 self.sprite = sprite
-            if sprite_scale > 1:
+            if is_cached(self.sprite):
+                self.sprite = get_packed(
+                    get_variant(self.sprite, scale=sprite_scale)
+                )
+            elif sprite_scale != 1:
+                # Caching variants of surfaces only this entity uses would
+                # keep them alive forever.
                 self.sprite = pygame.transform.scale_by(
                     self.sprite, sprite_scale
                 )
-        self.rect = (
+        self._rect = (
             sprite_rect if sprite_rect is not None else self.sprite.get_rect()
         )
-        self.abs_rect = (
+        self._abs_rect = (
             self.sprite.get_rect()
             if sprite_rect is not None
-            else self.rect.copy()
+            else self._rect.copy()
         )
         self.rect_alignment = rect_alignment
         self.rect_offset = rect_offset
+        self._rect_delta = self.get_rect_delta()
+        # NaN is never equal to the position, so the rects are synced the
+        # first time they are used.
+        self._synced_x = self._synced_y = math.nan
+        self.dx, self.dy = 0.0, 0.0
         self.move_to_spawn()
 
-    def move_to_spawn(self) -> None:
-        """Sets the position of the entity to the spawn position.
-
-        First sets the position of the abs_rect to the spawnpoint using the
-        spawn alignment, then updates the position of the rect to match the
-        abs_rect.
+    @property
+    def abs_rect(self) -> pygame.Rect:
+        """The rect the sprite is drawn in, at the entity's position."""
+        if self.x != self._synced_x or self.y != self._synced_y:
+            self.sync_rects()
+        return self._abs_rect
+
+    @property
+    def rect(self) -> pygame.Rect:
+        """The rect used for collisions, offset from the abs_rect."""
+        if self.x != self._synced_x or self.y != self._synced_y:
+            self.sync_rects()
+        return self._rect
+
+    def sync_rects(self) -> None:
+        """Moves the rect and abs_rect to the entity's current position."""
+        x, y = round(self.x), round(self.y)
+        self._abs_rect.topleft = x, y
+        self._rect.topleft = x + self._rect_delta[0], y + self._rect_delta[1]
+        self._synced_x, self._synced_y = self.x, self.y
+
+    def get_rect_delta(self) -> tuple[int, int]:
+        """Gets the offset from the topleft of the abs_rect to the rect's.
+
+        The rect is aligned to the abs_rect using the rect alignment, then
+        moved by the rect offset. Neither rect changes size, so the offset is
+        only found once.
         """
-        setattr(self.abs_rect, self.spawn_alignment, self.spawnpoint)
+        abs_rect = pygame.Rect((0, 0), self._abs_rect.size)
+        rect = pygame.Rect((0, 0), self._rect.size)
+        x, y = getattr(abs_rect, self.rect_alignment)
         setattr(
-            self.rect,
+            rect,
             self.rect_alignment,
-            self.get_rect_pos(self.rect_alignment),
+            (x + self.rect_offset[0], y + self.rect_offset[1]),
         )
+        return rect.topleft
 
-    def get_rect_pos(self, alignment: RectAlignments) -> list[int]:
-        """Gets the position of the rect based on the position of the abs_rect.
+    def get_position(
+        self, alignment: RectAlignments = "center"
+    ) -> tuple[float, float]:
+        """Gets the unrounded position of a point of the abs_rect.
 
-        Adds the rect_offset to each coordinate.
+        :param alignment: The point of the abs_rect to get.
         """
-        return [
-            coord + self.rect_offset[i]
-            for i, coord in enumerate(getattr(self.abs_rect, alignment))
-        ]
+        rect = self._abs_rect
+        align_x, align_y = getattr(rect, alignment)
+        return self.x + align_x - rect.x, self.y + align_y - rect.y
 
-    def get_abs_rect_pos(self, alignment: RectAlignments) -> list[int]:
-        """Gets the position of the abs_rect based on the position of the rect.
+    def move_to(
+        self,
+        position: tuple[float, float],
+        alignment: RectAlignments = "center",
+    ) -> None:
+        """Moves the entity so that a point of its abs_rect is at a position.
 
-        Subtracts the rect_offset from each coordinate.
+        :param position: The position to move to, which can be fractional.
+        :param alignment: The point of the abs_rect to put at the position.
         """
-        return [
-            coord - self.rect_offset[i]
-            for i, coord in enumerate(getattr(self.rect, alignment))
-        ]
+        rect = self._abs_rect
+        align_x, align_y = getattr(rect, alignment)
+        self.x = position[0] - align_x + rect.x
+        self.y = position[1] - align_y + rect.y
+
+    def move_to_spawn(self) -> None:
+        """Sets the position of the entity to the spawn position.
+
+        Puts the spawn alignment of the abs_rect at the spawnpoint.
+        """
+        # Marks the position being left, unless the entity is being spawned
+        # for the first time.
+        if hasattr(self, "previous_pos"):
+            self.mark_dirty()
+        self.move_to(self.spawnpoint, self.spawn_alignment)
+        # Prevents the entity being interpolated from its previous position
+        # when respawning.
+        self.previous_pos = self.x, self.y
 
     @override
     def update(self) -> None:
         """Called every game loop to update the sprite before blitting.
 
-        Updates the position of the rect based on the position of the abs_rect.
-        Should be overriden with other updates that should happen to the
-        entitiy.
+        Moves the entity by its velocity. Should be overriden with other
+        updates that should happen to the entitiy.
         """
-        setattr(
-            self.rect,
-            self.rect_alignment,
-            self.get_rect_pos(self.rect_alignment),
+        if self.dx or self.dy:
+            self.x += self.dx * system_data.dt
+            self.y += self.dy * system_data.dt
+
+    def mark_dirty(self) -> None:
+        """Marks the area the entity was and is drawn in to be redrawn.
+
+        Covers the abs_rect at both its previous and current position, since
+        it can be drawn anywhere between them when interpolating, as well as
+        the rect.
+        """
+        if not settings.dirty_rects:
+            return
+        abs_rect = self.abs_rect
+        dirty.mark(
+            abs_rect.union(
+                abs_rect.move(
+                    round(self.previous_pos[0]) - abs_rect.x,
+                    round(self.previous_pos[1]) - abs_rect.y,
+                )
+            ).union(self.rect)
         )
 
+    @override
+    def kill(self) -> None:
+        self.mark_dirty()
+        super().kill()
+
+    def get_draw_offset(self) -> tuple[float, float]:
+        """Gets the offset from the entity's position to draw it at.
+
+        When the game loop uses a fixed timestep, the entity is drawn between
+        its position in the previous tick and its current position, based on
+        how far the game loop is through the current tick. Otherwise the
+        offset is always (0, 0).
+        """
+        if system_data.interpolation >= 1:
+            return 0, 0
+        weight = 1 - system_data.interpolation
+        return (
+            (self.previous_pos[0] - self.x) * weight,
+            (self.previous_pos[1] - self.y) * weight,
+        )
+
+    def get_draw_pos(self) -> tuple[int, int]:
+        """Gets the topleft to draw the sprite at, offset by interpolation.
+
+        Rounded the same way as the abs_rect, so that an entity that isn't
+        being interpolated is drawn exactly where its abs_rect is.
+        """
+        offset_x, offset_y = self.get_draw_offset()
+        return round(self.x + offset_x), round(self.y + offset_y)
+
     def blit(self) -> None:
         """Draws the entitiy onto the screen after updating.
 
-        Draws the current sprite onto the screen at the position of the
-        absolute rect.
+        Queues the current sprite to be drawn on the entity's layer at the
+        entity's position, offset by the interpolation offset.
         """
-        system_data.abs_window.blit(self.sprite, self.abs_rect)
+        renderqueue.submit(self.layer, self.sprite, self.get_draw_pos())
 
     def on_collide(self, collided_entity: Entity) -> None:
         """Method called whenever the entity has collided with another entity.
@@ -150,22 +294,122 @@ class Entity(Sprite, ABC):
         The collided entity is passed as a parameter.
         """
 
+    def on_graze(self, bullets: BulletField, number: int) -> None:
+        """Method called whenever bullets have narrowly missed the entity.
+
+        Only called for entities with a hitbox and a graze distance. Each
+        bullet can only graze once.
+
+        :param bullets: The bullet field of the bullets.
+        :param number: The number of bullets that grazed the entity.
+        """
+
     def __repr__(self):
         return (f"<{self.__class__.__module__}.{self.__class__.__name__} "
                 f"{self.spawnpoint=} {self.rect=}, {self.abs_rect=}>")
 
 
 class EntityGroup(pygame.sprite.Group):
-    """Child class of `pygame.sprite.Group` that includes a `blit()` method."""
+    """Child class of `pygame.sprite.Group` that includes a `blit()` method.
+
+    Entities can be queried by their position, e.g. for the nearest entity to
+    a point. Queries use the center of each entity's rect, and are answered
+    using a spatial hash of the entities that is rebuilt the first time the
+    group is queried after being updated or changed. Entities moved outside
+    of `update()` are found where they were when the spatial hash was built.
+    """
 
     def __init__(self):
         super().__init__()
+        self._index: SpatialHash[Entity] | None = None
+
+    @override
+    def add_internal(self, sprite: Entity, layer: None = None) -> None:
+        super().add_internal(sprite, layer)
+        self._index = None
+
+    @override
+    def remove_internal(self, sprite: Entity) -> None:
+        super().remove_internal(sprite)
+        self._index = None
+
+    def get_index(self) -> SpatialHash[Entity]:
+        """Gets the spatial hash of the entities, building it if needed."""
+        if self._index is None:
+            self._index = SpatialHash(QUERY_CELL_SIZE)
+            for sprite in self.sprites():
+                self._index.insert(sprite, sprite.rect)
+        return self._index
+
+    def nearest(
+        self, point: tuple[float, float], max_distance: float = math.inf
+    ) -> Entity | None:
+        """Gets the entity closest to a point.
+
+        :param point: The point to search from.
+        :param max_distance: The furthest an entity can be from the point.
+        :return: The closest entity, or None if no entity is within the max
+        distance.
+        """
+        return self.get_index().nearest(point, _get_center, max_distance)[0]
+
+    def within_radius(
+        self, point: tuple[float, float], radius: float
+    ) -> list[Entity]:
+        """Gets every entity within a distance of a point, closest first.
+
+        :param point: The center of the circle to search in.
+        :param radius: The radius of the circle to search in.
+        """
+        x, y = point
+        bounding_rect = pygame.Rect(0, 0, radius * 2 + 1, radius * 2 + 1)
+        bounding_rect.center = round(x), round(y)
+        found = []
+        for sprite in self.get_index().query(bounding_rect):
+            sprite_x, sprite_y = sprite.rect.center
+            distance = math.hypot(sprite_x - x, sprite_y - y)
+            if distance <= radius:
+                found.append((distance, sprite))
+        found.sort(key=lambda pair: pair[0])
+        return [sprite for _, sprite in found]
+
+    def within_rect(self, rect: pygame.Rect) -> list[Entity]:
+        """Gets every entity with a rect colliding with a rect.
+
+        :param rect: The rect to search in.
+        """
+        return [
+            sprite
+            for sprite in self.get_index().query(rect)
+            if rect.colliderect(sprite.rect)
+        ]
+
+    @override
+    def update(self, *args, **kwargs) -> None:
+        """Updates every entity in the group.
+
+        Stores the position of each entity before updating so that it can be
+        interpolated when rendering with a fixed timestep, and marks the area
+        each entity moved over as dirty after updating.
+        """
+        for sprite in self.sprites():
+            sprite.previous_pos = sprite.x, sprite.y
+        super().update(*args, **kwargs)
+        self._index = None
+        if settings.dirty_rects:
+            for sprite in self.sprites():
+                sprite.mark_dirty()
 
     def blit(self) -> None:
+        """Queues every entity in the group to be drawn."""
         for sprite in self.sprites():
             sprite.blit()
 
 
+def _get_center(entity: Entity) -> tuple[int, int]:
+    return entity.rect.center
+
+
 class Animation:
     def __init__(
         self,
@@ -175,13 +419,10 @@ class Animation:
         *,
         start_playing: bool = False,
     ):
-        if frame_scale > 1:
-            self.frames = tuple(
-                pygame.transform.scale_by(sprite, 2)
-                for sprite in get_sprites(Load("image").path[frame])
-            )
-        else:
-            self.frames = get_sprites(Load("image").path[frame])
+        self.frames = tuple(
+            get_variant(sprite, scale=frame_scale)
+            for sprite in get_sprites(Load("image").path[frame])
+        )
         self.frame_duration = frame_duration
         self.current_frame = 0
         self.time_since_last_frame = 0
@@ -193,7 +434,7 @@ class Animation:
         if not self.is_playing:
             return
 
-        current_time = pygame.time.get_ticks()
+        current_time = system_data.game_time
 
         if current_time - self.time_since_last_frame >= self.frame_duration:
             self.time_since_last_frame = current_time
@@ -0,0 +1,118 @@
+"""Contains circle and capsule hitboxes for precise bullet collisions.
+
+Hitboxes are tested against arrays of bullet centers and radii at once, so a
+single entity can be checked against every nearby bullet with a handful of
+numpy operations. Rather than whether each bullet collides, the gap between
+each bullet and the hitbox is returned, so bullets that only just missed can
+be counted as grazing.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+import numpy as np
+import pygame
+
+
+class Hitbox(ABC):
+    """Base class for hitbox shapes, positioned relative to an entity."""
+
+    @abstractmethod
+    def get_gaps(
+        self,
+        position: tuple[float, float],
+        centers: np.ndarray,
+        radii: np.ndarray,
+    ) -> np.ndarray:
+        """Gets the distance between the hitbox and the edge of each circle.
+
+        :param position: The center of the entity's rect.
+        :param centers: The center of each circle, as an (n, 2) array.
+        :param radii: The radius of each circle, as an (n,) array.
+        :return: The gap between the hitbox and each circle, which is
+        negative if they overlap.
+        """
+
+    @abstractmethod
+    def get_bounding_rect(
+        self, position: tuple[float, float], margin: float = 0
+    ) -> pygame.Rect:
+        """Gets the smallest rect containing the hitbox.
+
+        :param position: The center of the entity's rect.
+        :param margin: Extra distance to grow the rect by on every side.
+        """
+
+
+@dataclass
+class Circle(Hitbox):
+    """Circle centered on the entity's rect, moved by an offset."""
+
+    radius: float
+    offset: tuple[float, float] = (0, 0)
+
+    def get_center(self, position: tuple[float, float]) -> tuple[float, float]:
+        return position[0] + self.offset[0], position[1] + self.offset[1]
+
+    def get_gaps(
+        self,
+        position: tuple[float, float],
+        centers: np.ndarray,
+        radii: np.ndarray,
+    ) -> np.ndarray:
+        x, y = self.get_center(position)
+        return (
+            np.hypot(centers[:, 0] - x, centers[:, 1] - y)
+            - radii
+            - self.radius
+        )
+
+    def get_bounding_rect(
+        self, position: tuple[float, float], margin: float = 0
+    ) -> pygame.Rect:
+        x, y = self.get_center(position)
+        extent = self.radius + margin
+        rect = pygame.Rect(0, 0, extent * 2 + 1, extent * 2 + 1)
+        rect.center = round(x), round(y)
+        return rect
+
+
+@dataclass
+class Capsule(Hitbox):
+    """Circle swept along a line segment, e.g. for lasers or fast entities."""
+
+    radius: float
+    start: tuple[float, float]
+    end: tuple[float, float]
+
+    def get_gaps(
+        self,
+        position: tuple[float, float],
+        centers: np.ndarray,
+        radii: np.ndarray,
+    ) -> np.ndarray:
+        start = np.add(position, self.start)
+        segment = np.subtract(self.end, self.start)
+        length_squared = segment @ segment
+        relative = centers - start
+        if length_squared:
+            # How far along the segment the closest point to each center is.
+            t = np.clip(relative @ segment / length_squared, 0, 1)
+            relative -= t[:, np.newaxis] * segment
+        return (
+            np.hypot(relative[:, 0], relative[:, 1]) - radii - self.radius
+        )
+
+    def get_bounding_rect(
+        self, position: tuple[float, float], margin: float = 0
+    ) -> pygame.Rect:
+        extent = self.radius + margin
+        left = position[0] + min(self.start[0], self.end[0]) - extent
+        top = position[1] + min(self.start[1], self.end[1]) - extent
+        right = position[0] + max(self.start[0], self.end[0]) + extent
+        bottom = position[1] + max(self.start[1], self.end[1]) + extent
+        return pygame.Rect(
+            int(left), int(top), int(right - left) + 2, int(bottom - top) + 2
+        )
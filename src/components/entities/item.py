@@ -3,10 +3,14 @@ from __future__ import annotations
 from typing import override
 
 from src.components.entities.entity import Entity
-from src.core import system_data
+from src.core import renderqueue, system_data
 
 
 class Item(Entity):
+    __slots__ = ()
+
+    layer = renderqueue.Layer.ITEMS
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.type = "item"
@@ -24,6 +28,8 @@ class Item(Entity):
 
 
 class FallingItem(Item):
+    __slots__ = ("acceleration", "max_speed", "speed")
+
     def __init__(
         self,
         speed: int,
@@ -36,11 +42,10 @@ class FallingItem(Item):
         super().__init__(*args, **kwargs)
         self.acceleration = acceleration
         self.max_speed = max_speed
-        self.current_speed = self.speed
+        self.dy = self.speed
 
     def update(self) -> None:
-        super().update()
-        self.current_speed += self.acceleration * system_data.dt
+        self.dy += self.acceleration * system_data.dt
         if self.max_speed is not None:
-            self.current_speed = min(self.current_speed, self.max_speed)
-        self.abs_rect.move_ip(0, self.current_speed * system_data.dt)
+            self.dy = min(self.dy, self.max_speed)
+        super().update()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, override
+
+from src.components.entities.entity import Entity
+from src.core import renderqueue, system_data
+
+if TYPE_CHECKING:
+    import pygame
+
+    from src.core.types import RectAlignments
+
+
+class Particle(Entity):
+    __slots__ = ("lifetime", "spawn_time")
+    layer = renderqueue.Layer.PARTICLES
+
+    def __init__(
+        self,
+        spawnpoint: list[int, int],
+        velocity: tuple[float, float],
+        lifetime: float,
+        *,
+        sprite: pygame.Surface | str,
+        sprite_scale: int = 1,
+        spawn_alignment: RectAlignments = "center",
+    ):
+        """Short-lived decoration, such as a spark, that moves in a line.
+
+        Particles don't collide with anything, and are killed once their
+        lifetime is over or they leave the screen.
+
+        :param spawnpoint: The position the particle should start at.
+        :param velocity: The velocity to move at in pixels per unit of dt.
+        :param lifetime: How many milliseconds the particle lasts for.
+        :param sprite: The sprite of the particle, see `Entity`.
+        :param sprite_scale: The scale factor of the sprite surface.
+        :param spawn_alignment: The alignment of the spawnpoint coordinates.
+        """
+        super().__init__(
+            spawnpoint,
+            spawn_alignment,
+            sprite=sprite,
+            sprite_scale=sprite_scale,
+        )
+        self.type = "particle"
+        self.dx, self.dy = velocity
+        self.lifetime = lifetime
+        self.spawn_time = system_data.game_time
+
+    @override
+    def update(self) -> None:
+        if system_data.game_time - self.spawn_time >= self.lifetime:
+            self.kill()
+            return
+        super().update()
+        if not system_data.abs_window_rect.colliderect(self.rect):
+            self.kill()
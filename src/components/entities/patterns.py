@@ -0,0 +1,192 @@
+"""Contains declarative bullet patterns and their compiler.
+
+A `Pattern` describes the volleys an emitter fires: how many bullets, the arc
+they are spread over, how far apart they start, how fast they go and how much
+the pattern turns between volleys. `compile_pattern()` turns a pattern into
+arrays of the offset, direction and velocity of every bullet in every volley,
+which are cached by pattern, so the trigonometry for a pattern is only done
+once no matter how many enemies fire it.
+
+Volleys are then fired by an `Emitter` in one `BulletField.spawn()` call
+straight from the tables, without any per-bullet Python code.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from src.core.constants import MAX_PATTERN_VOLLEYS
+from src.core.data import system_data
+
+if TYPE_CHECKING:
+    from src.components.entities.bulletfield import BulletField
+
+logger = logging.getLogger("src.components.entities")
+
+
+@dataclass(frozen=True)
+class Pattern:
+    """A ring, fan or row of bullets fired at a fixed interval.
+
+    Angles are in degrees clockwise from the right, so 90 is straight down.
+
+    :param count: The number of directions bullets are fired in per volley.
+    :param arc: The angle the directions are spread over. Directions are
+    spread evenly around a full circle if 360 or more.
+    :param direction: The angle of the middle of the volley.
+    :param spacing: The distance in pixels between neighbouring bullets,
+    perpendicular to their direction, e.g. for parallel rows.
+    :param radius: The distance from the origin bullets start at, along
+    their direction.
+    :param layers: The number of bullets fired in each direction, each
+    faster than the last by the speed ramp.
+    :param speed: The speed of the first layer in pixels per unit of dt.
+    :param speed_ramp: The speed added to each layer after the first.
+    :param rotation: The angle the pattern turns by after each volley. Rounded
+    so that a whole number of volleys, at most `MAX_PATTERN_VOLLEYS`, make a
+    full turn.
+    :param interval: The milliseconds between volleys.
+    :param size: The size of each bullet's hitbox.
+    """
+
+    count: int = 1
+    arc: float = 360
+    direction: float = 90
+    spacing: float = 0
+    radius: float = 0
+    layers: int = 1
+    speed: float = 30
+    speed_ramp: float = 0
+    rotation: float = 0
+    interval: float = 1000
+    size: tuple[int, int] = (4, 4)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Pattern:
+        if "size" in data:
+            data = {**data, "size": tuple(data["size"])}
+        return cls(**data)
+
+
+@dataclass(frozen=True)
+class CompiledPattern:
+    """The bullets of every volley of a pattern, until it repeats.
+
+    Each array has the shape (volleys, bullets, 2), and is read only since it
+    is shared by everything firing the pattern.
+    """
+
+    pattern: Pattern
+    # The position of each bullet relative to the emitter.
+    offsets: np.ndarray
+    # The unit vector each bullet moves along.
+    directions: np.ndarray
+    velocities: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+
+def compile_pattern(pattern: Pattern) -> CompiledPattern:
+    """Gets the tables of a pattern, building them the first time.
+
+    :param pattern: The pattern to compile.
+    """
+    if (compiled := _compiled_patterns.get(pattern)) is not None:
+        return compiled
+    count = pattern.count
+    if pattern.rotation:
+        volleys = max(1, round(360 / abs(pattern.rotation)))
+        if volleys > MAX_PATTERN_VOLLEYS:
+            logger.warning(
+                "Rotation of %s is too small to compile, using %s.",
+                pattern.rotation,
+                math.copysign(360 / MAX_PATTERN_VOLLEYS, pattern.rotation),
+            )
+            volleys = MAX_PATTERN_VOLLEYS
+        step = math.copysign(360 / volleys, pattern.rotation)
+    else:
+        volleys, step = 1, 0
+    # Position of each direction from the middle of the volley.
+    index = np.arange(count) - (count - 1) / 2
+    if count == 1:
+        spread = 0
+    else:
+        # A full circle would otherwise fire two bullets the same way.
+        gaps = count if pattern.arc >= 360 else count - 1
+        spread = min(pattern.arc, 360) / gaps
+    angles = np.radians(
+        pattern.direction
+        + np.arange(volleys)[:, np.newaxis] * step
+        + index * spread
+    )
+    cos, sin = np.cos(angles), np.sin(angles)
+    directions = np.stack((cos, sin), axis=-1)
+    offsets = (
+        directions * pattern.radius
+        + np.stack((-sin, cos), axis=-1)
+        * (index * pattern.spacing)[:, np.newaxis]
+    )
+    # Every layer fires in every direction, each at its own speed.
+    directions = np.tile(directions, (1, pattern.layers, 1))
+    offsets = np.tile(offsets, (1, pattern.layers, 1))
+    speeds = np.repeat(
+        pattern.speed + np.arange(pattern.layers) * pattern.speed_ramp, count
+    )
+    velocities = directions * speeds[:, np.newaxis]
+    for array in (offsets, directions, velocities):
+        array.setflags(write=False)
+    compiled = CompiledPattern(pattern, offsets, directions, velocities)
+    _compiled_patterns[pattern] = compiled
+    return compiled
+
+
+class Emitter:
+    def __init__(self, pattern: Pattern, bullets: BulletField):
+        """Fires the volleys of a pattern into a bullet field.
+
+        :param pattern: The pattern to fire.
+        :param bullets: The bullet field to spawn the bullets into.
+        """
+        self.compiled = compile_pattern(pattern)
+        self.bullets = bullets
+        # The index of the next volley in the compiled tables.
+        self.volley = 0
+        self.last_shot_time = system_data.game_time
+
+    @property
+    def pattern(self) -> Pattern:
+        return self.compiled.pattern
+
+    def update(self, origin: tuple[float, float]) -> None:
+        """Fires the next volley if the pattern's interval has passed.
+
+        :param origin: The position to fire the volley from.
+        """
+        if (
+            system_data.game_time - self.last_shot_time
+            >= self.pattern.interval
+        ):
+            self.fire(origin)
+            self.last_shot_time = system_data.game_time
+
+    def fire(self, origin: tuple[float, float]) -> None:
+        """Fires the next volley straight away.
+
+        :param origin: The position to fire the volley from.
+        """
+        self.bullets.spawn(
+            self.compiled.offsets[self.volley],
+            self.compiled.velocities[self.volley],
+            self.pattern.size,
+            origin=origin,
+        )
+        self.volley = (self.volley + 1) % len(self.compiled)
+
+
+_compiled_patterns: dict[Pattern, CompiledPattern] = {}
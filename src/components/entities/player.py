@@ -6,14 +6,19 @@ from abc import ABC
 from dataclasses import dataclass
 from typing import override, TYPE_CHECKING
 
+import numpy as np
 import pygame
 
 from src.components import events
 from src.components.entities.entity import Entity
-from src.components.entities.projectile import SimpleBullet, SimpleBulletPattern, SimpleBulletConfig
+from src.components.entities.hitbox import Circle
+from src.core import renderqueue
+from src.core.constants import GRAZE_DISTANCE
+from src.core.load import get_variant
 from src.core.data import system_data
 
 if TYPE_CHECKING:
+    from src.components.entities.bulletfield import BulletField
     from src.core.types import RectAlignments
     from src.states.game import Game
 
@@ -31,6 +36,8 @@ class Player(Entity, ABC):
 
     direction_map: dict[None | str, list[pygame.Surface]]
     level: int
+    graze_distance = GRAZE_DISTANCE
+    layer = renderqueue.Layer.PLAYER
     def __init__(
         self,
         game: Game,
@@ -52,6 +59,7 @@ class Player(Entity, ABC):
         self.spells = stats.spells
         self.fire_rate = stats.fire_rate
         self.level = 0
+        self.graze = 0
         self.type = "player"
         self.keys = []
         self.dx, self.dy = 0.0, 0.0
@@ -94,6 +102,7 @@ class Player(Entity, ABC):
 
     @override
     def update(self) -> None:
+        self.previous_pos = self.x, self.y
         for key in (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT):
             if events.is_key_down(key) and key not in self.keys:
                 self.keys.append(key)
@@ -101,22 +110,20 @@ class Player(Entity, ABC):
                 self.keys.remove(key)
 
         self.set_direction()
-        self.abs_rect.move_ip(
-            round(self.dx * system_data.dt), round(self.dy * system_data.dt)
-        )
         super().update()
-        if not system_data.abs_window_rect.contains(self.rect):
-            self.rect.clamp_ip(system_data.abs_window_rect)
-            setattr(
-                self.abs_rect,
-                self.rect_alignment,
-                self.get_abs_rect_pos(self.rect_alignment),
-            )
+        rect = self.rect
+        if not system_data.abs_window_rect.contains(rect):
+            clamped = rect.clamp(system_data.abs_window_rect)
+            self.x += clamped.x - rect.x
+            self.y += clamped.y - rect.y
+        self.mark_dirty()
 
     @override
     def blit(self) -> None:
-        pygame.draw.rect(
-            system_data.abs_window, pygame.Color("white"), self.rect
+        renderqueue.submit_rect(
+            renderqueue.Layer.PLAYER_HITBOX,
+            pygame.Color("white"),
+            self.rect.move(self.get_draw_offset()),
         )
 
     @override
@@ -127,6 +134,10 @@ class Player(Entity, ABC):
         elif sprite.type == "item":
             self.level += 1
 
+    @override
+    def on_graze(self, bullets: BulletField, number: int) -> None:
+        self.graze += number
+
 
 class FocusPlayer(Player):
     def __init__(self, *args, **kwargs):
@@ -134,13 +145,13 @@ class FocusPlayer(Player):
         self.show_hitbox = False
 
         def make_faded_sprite(sprite_: pygame.Surface) -> pygame.Surface:
-            faded_sprite = sprite_.copy()
-            faded_sprite.set_alpha(128)
-            return faded_sprite
+            return get_variant(sprite_, alpha=128)
 
         self.faded_sprites = []
         if self.sprites:
-            for i, sprite_key in enumerate(zip(self.sprites, self.direction_map.keys())):
+            for i, sprite_key in enumerate(
+                zip(self.sprites, self.direction_map.keys(), strict=True)
+            ):
                 self.faded_sprites.append(make_faded_sprite(sprite_key[0]))
                 self.direction_map[sprite_key[1]].append(self.faded_sprites[i])
             self.faded_sprite = self.faded_sprites[0]
@@ -150,7 +161,9 @@ class FocusPlayer(Player):
     @override
     def blit(self) -> None:
         if self.show_hitbox:
-            system_data.abs_window.blit(self.faded_sprite, self.abs_rect)
+            renderqueue.submit(
+                self.layer, self.faded_sprite, self.get_draw_pos()
+            )
             super().blit()
         else:
             Entity.blit(self)
@@ -175,6 +188,11 @@ class Remi(FocusPlayer):
         ((1, 0),),
         ((1, 5), (1, -5)),
     )
+    bullet_size = (4, 4)
+    bullet_spacing = 10
+    bullet_velocity = (0, -100)
+    # Fits inside the hitbox rect.
+    hitbox = Circle(10)
 
     def __init__(self, game: Game):
         super().__init__(
@@ -188,6 +206,7 @@ class Remi(FocusPlayer):
         )
         self.level = 2
         self.last_shot_time = 0
+        self.volleys: dict[int, np.ndarray] = {}
 
     @override
     def update(self) -> None:
@@ -195,22 +214,38 @@ class Remi(FocusPlayer):
         super().update()
         if events.is_key_pressed(pygame.K_z):
             # Set attacking state and check fire rate cooldown
-            current_time = pygame.time.get_ticks()
+            current_time = system_data.game_time
             if current_time - self.last_shot_time >= self.fire_rate:
                 self.attack()
                 self.last_shot_time = current_time
 
     @override
     def attack(self) -> None:
-        """Fires a bullet and triggers an animation frame update."""
-        config = SimpleBulletConfig(
-            sprite_rect=pygame.Rect(0, 0, 4, 4),
-            spawn_location=[0, 0],
-            spawn_alignment="midtop")
-        bullets = SimpleBulletPattern(self, config, "up", self.level+1)
-
-        self.game.player_bullets.add(SimpleBullet(self, sprite_rect=pygame.Rect(0, 0, 4, 4), spawn_location=[100, 0], spawn_alignment="midtop"), SimpleBullet(self, sprite_rect=pygame.Rect(0, 0, 4, 4), spawn_location=[110, 0], spawn_alignment="midtop"))
-        self.game.player_bullets.add(*bullets.bullets)
+        """Fires a row of bullets, plus two off to the side, straight up."""
+        if (volley := self.volleys.get(self.level)) is None:
+            volley = self.volleys[self.level] = self.make_volley(self.level)
+        self.game.player_bullets.spawn(
+            volley,
+            self.bullet_velocity,
+            self.bullet_size,
+            origin=self.abs_rect.midtop,
+        )
+
+    @classmethod
+    def make_volley(cls, level: int) -> np.ndarray:
+        """Gets the positions of the bullets fired at a level.
+
+        Positions are relative to the midtop of the player, and are cached
+        in `volleys` so that firing doesn't allocate anything.
+        """
+        number = level + 1
+        width, height = cls.bullet_size
+        # Bullets are spread evenly in a row centered on the player.
+        step = width + cls.bullet_spacing
+        left = -(number * step - cls.bullet_spacing) / 2
+        positions = [(left + i * step, 0) for i in range(number)]
+        positions += [(100, 0), (110, 0)]
+        return np.array(positions) + (0, height / 2)
 
     @override
     def on_collide(self, sprite: Entity) -> None:
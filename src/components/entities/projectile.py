@@ -1,8 +1,5 @@
 from __future__ import annotations
 
-import math
-from abc import abstractmethod, ABC
-from dataclasses import dataclass
 from typing import TYPE_CHECKING
 from typing import override
 
@@ -12,10 +9,12 @@ from src.components.entities.entity import Entity
 from src.core.data import system_data
 
 if TYPE_CHECKING:
-    from src.core.types import RectAlignments, BulletPatterns
+    from src.core.types import RectAlignments
 
 
 class Projectile(Entity):
+    __slots__ = ()
+
     def __init__(
         self,
         owner: Entity,
@@ -25,26 +24,22 @@ class Projectile(Entity):
         spawn_alignment: RectAlignments = "midbottom",
         sprite_rect: pygame.Rect | None = None,
     ):
-        self.type = f"{owner}bullet"
+        self.type = f"{owner.type}bullet"
         if not (sprite or sprite_rect):
             msg = "Must provide either sprite or sprite_rect, not neither."
             raise ValueError(msg)
 
         if sprite is None:
-            current_sprite = pygame.Surface(sprite_rect.size)
-            current_sprite.fill(pygame.Color("white"))
+            # Already scaled, so it isn't scaled again for every bullet.
+            current_sprite = get_bullet_surface(
+                sprite_rect.size, scale=sprite_scale
+            )
+            sprite_scale = 1
         else:
             current_sprite = sprite
 
-        if isinstance(spawn_location, list):
-            x_offset, y_offset = spawn_location
-            spawn_x, spawn_y = getattr(owner.abs_rect, spawn_alignment)
-            calculated_spawn = [spawn_x + x_offset, spawn_y + y_offset]
-        else:
-            calculated_spawn = getattr(owner.abs_rect, spawn_location)
-
         super().__init__(
-            calculated_spawn,
+            self.get_spawnpoint(owner, spawn_location, spawn_alignment),
             sprite=current_sprite, sprite_scale=sprite_scale,
             sprite_rect=(
                 sprite.get_rect() if sprite_rect is None else sprite_rect
@@ -52,6 +47,26 @@ class Projectile(Entity):
             spawn_alignment=spawn_alignment,
         )
 
+    @staticmethod
+    def get_spawnpoint(
+        owner: Entity,
+        spawn_location: RectAlignments | list[int],
+        spawn_alignment: RectAlignments,
+    ) -> list[int]:
+        """Gets the position to spawn a projectile at relative to its owner.
+
+        :param owner: The entity firing the projectile.
+        :param spawn_location: Either the alignment of the owner's abs_rect
+        to spawn at, or an offset from the spawn alignment of the owner's
+        abs_rect.
+        :param spawn_alignment: The alignment of the projectile's abs_rect.
+        """
+        if isinstance(spawn_location, list):
+            x_offset, y_offset = spawn_location
+            spawn_x, spawn_y = getattr(owner.abs_rect, spawn_alignment)
+            return [spawn_x + x_offset, spawn_y + y_offset]
+        return getattr(owner.abs_rect, spawn_location)
+
     @override
     def update(self) -> None:
         super().update()
@@ -59,120 +74,32 @@ class Projectile(Entity):
             self.kill()
 
     def __repr__(self):
-        return f"<{self.__class__.__module__}.{self.__class__.__name__} {self.spawnpoint=} {self.rect.topleft=}>"
+        return (
+            f"<{self.__class__.__module__}.{self.__class__.__name__} "
+            f"{self.spawnpoint=} {self.rect.topleft=}>"
+        )
 
 
-class SimpleBullet(Projectile):
-    def __init__(
-        self,
-        owner: Entity,
-        sprite: pygame.Surface | str | None = None,
-        sprite_scale: int = 1,
-        spawn_location: RectAlignments | list[int] = "midtop",
-        spawn_alignment: RectAlignments = "midbottom",
-        sprite_rect: pygame.Rect | None = None,
-        speed: int = 100,
-        direction: int = 0,
-    ):
-        super().__init__(
-            owner, sprite, sprite_scale, spawn_location, spawn_alignment, sprite_rect
-        )
-        angle_radians = math.radians(direction)
-        self.dx = speed * math.sin(angle_radians)
-        self.dy = -speed * math.cos(angle_radians)
+def get_bullet_surface(
+    size: tuple[int, int],
+    color: pygame.Color | str = "white",
+    scale: int = 1,
+) -> pygame.Surface:
+    """Gets a filled rectangle surface for bullets without a sprite.
 
-    @override
-    def update(self) -> None:
-        dtx = self.dx * system_data.dt
-        dty = self.dy * system_data.dt
-        self.abs_rect.move_ip(
-            math.ceil(dtx) if dtx >= 0 else math.floor(dtx),
-            math.ceil(dty) if dty >= 0 else math.floor(dty)
-        )
-        super().update()
+    Surfaces are cached, so every bullet of the same size, color and scale
+    shares one surface, which therefore must not be modified.
 
-    @override
-    def blit(self) -> None:
-        super().blit()
-
-@dataclass
-class BulletConfig:
-    sprite: pygame.Surface | str | None = None
-    sprite_scale: int = 1
-    spawn_location: RectAlignments | list[int] = "midtop"
-    spawn_alignment: RectAlignments = "midbottom"
-    sprite_rect: pygame.Rect | None = None
-
-
-class BulletPatternBase(ABC):
-    def __init__(self, owner: Entity, config: BulletConfig, pattern: BulletPatterns = "up", number: int = 1, **flags):
-        self.bullets = []
-        self.pattern = pattern
-        match self.pattern:
-            case "up": self.create_up_bullets(owner, config, number, **flags)
-            case "spread": self.create_spread_bullets(owner, config, number, **flags)
-            case "widespread": self.create_widespread_bullets(owner, config, number, **flags)
-
-    @abstractmethod
-    def create_up_bullets(self, owner: Entity, config: BulletConfig, number: int = 1, offset: int = 10, **flags) -> list[Projectile]:
-        pass
-
-    @abstractmethod
-    def create_spread_bullets(self, owner: Entity, config: BulletConfig, number: int = 1, **flags) -> list[Projectile]:
-        pass
-
-    @abstractmethod
-    def create_widespread_bullets(self, owner: Entity, config: BulletConfig, number: int = 1, **flags) -> list[Projectile]:
-        pass
-
-
-@dataclass
-class SimpleBulletConfig(BulletConfig):
-    speed: int = 100
-    direction: int = 0
-
-
-class SimpleBulletPattern(BulletPatternBase):
-    def __init__(self, owner: Entity, config: SimpleBulletConfig, pattern: BulletPatterns = "up",
-                 number: int = 1, offset: int = 10, **flags):
-        super().__init__(owner, config, pattern, number, offset=offset, **flags)
-
-    def create_up_bullets(self, owner: Entity, config: SimpleBulletConfig, number: int = 1, offset: int = 2, **flags) -> list[SimpleBullet]:
-        """Creates bullets evenly distributed at the specified spawn location with equal spacing (offset)."""
-        bullets = []
-        for _ in range(number):
-            # Create the bullet instance
-            bullet = SimpleBullet(
-                owner,
-                config.sprite,
-                config.sprite_scale,
-                [0, 0],  # Temporary spawn location, will be adjusted below
-                config.spawn_alignment,
-                config.sprite_rect,
-                config.speed,
-                config.direction
-            )
-            bullets.append(bullet)
-
-        # Calculate the total width and center offset for distribution
-        total_width = sum(bullet.rect.width for bullet in bullets) + offset * (number - 1)
-        current_offset = -total_width / 2
-
-        for bullet in bullets:
-            # Adjust bullet spawn positions for equal distribution
-            new_spawn = [
-                owner.abs_rect.midtop[0] + current_offset,  # Adjust x-coordinate
-                owner.abs_rect.midtop[1]  # Use owner's y position
-            ]
-            bullet.spawnpoint = new_spawn
-            bullet.move_to_spawn()  # Explicitly move bullet to new position
-            current_offset += bullet.rect.width + offset
-            self.bullets.append(bullet)
-
-        return self.bullets
-
-    def create_spread_bullets(self, owner: Entity, config: BulletConfig, number: int = 1, **flags) -> list[Projectile]:
-        pass
-
-    def create_widespread_bullets(self, owner: Entity, config: BulletConfig, number: int = 1, **flags) -> list[Projectile]:
-        pass
+    :param size: The size of the bullet before scaling.
+    :param color: The color to fill the bullet with.
+    :param scale: The scale factor of the bullet.
+    """
+    key = (tuple(size), str(color), scale)
+    if (surface := _bullet_surfaces.get(key)) is None:
+        surface = pygame.Surface((size[0] * scale, size[1] * scale))
+        surface.fill(color)
+        _bullet_surfaces[key] = surface
+    return surface
+
+
+_bullet_surfaces = {}
@@ -0,0 +1,138 @@
+"""Contains a spatial hash for finding entities near a rect or point."""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    import pygame
+
+T = TypeVar("T")
+
+
+class SpatialHash(Generic[T]):
+    def __init__(self, cell_size: int):
+        """Uniform grid storing items in every cell their rect overlaps.
+
+        Finding the items near a rect only checks the cells that rect
+        overlaps, instead of every item. Cells are only created once an item
+        is inserted into them, so the grid has no fixed bounds.
+
+        :param cell_size: The width and height of each cell in pixels.
+        """
+        self.cell_size = cell_size
+        self.cells: dict[tuple[int, int], list[T]] = {}
+        # The leftmost, topmost, rightmost and bottommost cells with items.
+        self.bounds: tuple[int, int, int, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def get_cells(self, rect: pygame.Rect) -> Iterator[tuple[int, int]]:
+        """Gets the position of every cell a rect overlaps."""
+        left, top = rect.left // self.cell_size, rect.top // self.cell_size
+        # Empty rects are still counted as being in the cell they're in.
+        right = max(rect.right - 1, rect.left) // self.cell_size
+        bottom = max(rect.bottom - 1, rect.top) // self.cell_size
+        for x in range(left, right + 1):
+            for y in range(top, bottom + 1):
+                yield x, y
+
+    def insert(self, item: T, rect: pygame.Rect) -> None:
+        """Adds an item to every cell its rect overlaps."""
+        for cell in self.get_cells(rect):
+            if (items := self.cells.get(cell)) is None:
+                self.cells[cell] = [item]
+            else:
+                items.append(item)
+        left, top = rect.left // self.cell_size, rect.top // self.cell_size
+        right = max(rect.right - 1, rect.left) // self.cell_size
+        bottom = max(rect.bottom - 1, rect.top) // self.cell_size
+        if self.bounds is not None:
+            left = min(left, self.bounds[0])
+            top = min(top, self.bounds[1])
+            right = max(right, self.bounds[2])
+            bottom = max(bottom, self.bounds[3])
+        self.bounds = (left, top, right, bottom)
+
+    def query(self, rect: pygame.Rect) -> list[T]:
+        """Gets every item in the cells a rect overlaps.
+
+        Items can be returned even if their rect doesn't collide with the
+        rect, so they still need to be checked.
+        """
+        found = {}
+        for cell in self.get_cells(rect):
+            if (items := self.cells.get(cell)) is not None:
+                found.update(dict.fromkeys(items))
+        return list(found)
+
+    def nearest(
+        self,
+        point: tuple[float, float],
+        get_position: Callable[[T], tuple[float, float]],
+        max_distance: float = math.inf,
+    ) -> tuple[T | None, float]:
+        """Gets the item closest to a point.
+
+        Searches rings of cells outwards from the cell containing the point,
+        stopping once no item in a further ring could be closer. Each item's
+        position must be inside the rect it was inserted with.
+
+        :param point: The point to search from.
+        :param get_position: Gets the position of an item to measure the
+        distance to.
+        :param max_distance: The furthest an item can be from the point.
+        :return: The closest item and its distance, or None and infinity if
+        no item is within the max distance.
+        """
+        if self.bounds is None:
+            return None, math.inf
+        x, y = point
+        cell_x, cell_y = int(x // self.cell_size), int(y // self.cell_size)
+        left, top, right, bottom = self.bounds
+        # Rings closer than this don't reach any of the cells with items.
+        first_ring = max(
+            left - cell_x, cell_x - right, top - cell_y, cell_y - bottom, 0
+        )
+        last_ring = max(
+            cell_x - left, right - cell_x, cell_y - top, bottom - cell_y
+        )
+        closest, closest_distance = None, max_distance
+        for ring in range(first_ring, last_ring + 1):
+            for cell in self.get_ring((cell_x, cell_y), ring):
+                for item in self.cells.get(cell, ()):
+                    item_x, item_y = get_position(item)
+                    distance = math.hypot(item_x - x, item_y - y)
+                    if distance <= closest_distance:
+                        closest, closest_distance = item, distance
+            # Items in further rings are at least this far from the point.
+            if ring * self.cell_size >= closest_distance:
+                break
+        if closest is None:
+            return None, math.inf
+        return closest, closest_distance
+
+    @staticmethod
+    def get_ring(
+        cell: tuple[int, int], ring: int
+    ) -> Iterator[tuple[int, int]]:
+        """Gets the cells a number of cells away from a cell in a square."""
+        x, y = cell
+        if not ring:
+            yield cell
+            return
+        for offset in range(-ring, ring + 1):
+            yield x + offset, y - ring
+            yield x + offset, y + ring
+        for offset in range(-ring + 1, ring):
+            yield x - ring, y + offset
+            yield x + ring, y + offset
+
+    def clear(self) -> None:
+        """Removes every item."""
+        self.cells.clear()
+        self.bounds = None
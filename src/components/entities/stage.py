@@ -0,0 +1,267 @@
+"""Contains the stage format and the runner streaming a stage's spawns.
+
+Stages are JSON files in `assets/stages`, found with `Load("stage")`. A stage
+is a list of waves, each starting a number of milliseconds after the stage
+starts, and spawning enemies a number of milliseconds after the wave starts:
+
+    {
+        "waves": [
+            {
+                "time": 0,
+                "spawns": [
+                    {
+                        "time": 500,
+                        "sprite": "oscarF",
+                        "scale": 2,
+                        "path": [[500, -60], [500, 300], [1980, 300]],
+                        "speed": 20,
+                        "pattern": {"count": 12, "speed": 30}
+                    }
+                ]
+            }
+        ]
+    }
+
+Each spawn follows its path from the first point to the last at its speed,
+in pixels per unit of dt, firing its bullet pattern, if it has one. See
+`src.components.entities.patterns.Pattern` for the keys of a pattern. Both
+are run as behavior scripts by the game's scheduler. A
+wave's `assets` are the images it needs, which default to the sprites of its
+spawns.
+
+Stages are only parsed into waves and spawns up front. Enemies are created by
+a `StageRunner` as their spawn time is reached. The images of each wave are
+decoded in the background shortly before it starts, and released once the
+wave is over, so only the images of the current waves are kept in memory.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from src.components.entities.behavior import fire_pattern, follow_path
+from src.components.entities.enemy import Enemy
+from src.components.entities.patterns import Pattern
+from src.core.constants import STAGE_PRELOAD_TIME
+from src.core.data import system_data
+from src.core.load import Load, Preload, load_image, preload, release
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from src.states.game import Game
+
+logger = logging.getLogger("src.components.entities")
+
+
+@dataclass(frozen=True)
+class Spawn:
+    time: float
+    sprite: str
+    path: tuple[tuple[float, float], ...]
+    speed: float = 0
+    scale: int = 1
+    health: int = 1
+    pattern: Pattern | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Spawn:
+        pattern = data.get("pattern")
+        return cls(
+            time=data.get("time", 0),
+            sprite=data["sprite"],
+            path=tuple(tuple(point) for point in data["path"]),
+            speed=data.get("speed", 0),
+            scale=data.get("scale", 1),
+            health=data.get("health", 1),
+            pattern=(
+                None if pattern is None else Pattern.from_dict(pattern)
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class Wave:
+    time: float
+    # Ordered by spawn time.
+    spawns: tuple[Spawn, ...]
+    assets: tuple[str, ...]
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Wave:
+        spawns = tuple(
+            sorted(
+                (Spawn.from_dict(spawn) for spawn in data["spawns"]),
+                key=lambda spawn: spawn.time,
+            )
+        )
+        assets = data.get("assets")
+        if assets is None:
+            assets = dict.fromkeys(spawn.sprite for spawn in spawns)
+        return cls(data.get("time", 0), spawns, tuple(assets))
+
+
+@dataclass(frozen=True)
+class Stage:
+    # Ordered by start time.
+    waves: tuple[Wave, ...]
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Stage:
+        return cls(
+            tuple(
+                sorted(
+                    (Wave.from_dict(wave) for wave in data["waves"]),
+                    key=lambda wave: wave.time,
+                )
+            )
+        )
+
+
+def load_stage(name: str) -> Stage:
+    """Parses a stage file.
+
+    :param name: The name of the stage in `Load("stage")`.
+    """
+    path: Path = Load("stage").path[name]
+    with path.open(encoding="UTF-8") as file:
+        stage = Stage.from_dict(json.load(file))
+    logger.info("Loaded stage %s with %s waves.", name, len(stage.waves))
+    return stage
+
+
+@dataclass
+class _ActiveWave:
+    index: int
+    wave: Wave
+    next_spawn: int = 0
+    enemies: list[Enemy] = field(default_factory=list)
+
+    def is_over(self) -> bool:
+        return self.next_spawn == len(self.wave.spawns) and not any(
+            enemy.alive() for enemy in self.enemies
+        )
+
+
+class StageRunner:
+    def __init__(
+        self,
+        game: Game,
+        stage: Stage,
+        preload_time: float = STAGE_PRELOAD_TIME,
+    ):
+        """Spawns the enemies of a stage into the game as time advances.
+
+        A wave is over once all of its enemies have spawned and been killed
+        or left the screen, after which the images it used are released,
+        unless a later wave that is running or being preloaded uses them.
+
+        :param game: The game to spawn enemies into.
+        :param stage: The stage to run.
+        :param preload_time: How many milliseconds before each wave starts
+        its images are preloaded.
+        """
+        self.game = game
+        self.stage = stage
+        self.preload_time = preload_time
+        # Milliseconds since the stage started.
+        self.time = 0.0
+        self.next_wave = 0
+        self.active: list[_ActiveWave] = []
+        # The preloads of every wave that hasn't finished, by its index.
+        self.preloads: dict[int, Preload] = {}
+        self.preload_upcoming()
+
+    @property
+    def finished(self) -> bool:
+        """Whether every wave has started and is over."""
+        return self.next_wave == len(self.stage.waves) and not self.active
+
+    def update(self) -> None:
+        """Advances the stage by one tick, spawning enemies that are due."""
+        self.time += system_data.dt * 100
+        self.preload_upcoming()
+        waves = self.stage.waves
+        while (
+            self.next_wave < len(waves)
+            and waves[self.next_wave].time <= self.time
+        ):
+            self.start_wave()
+        for active in self.active:
+            self.spawn_due(active)
+        if any(active.is_over() for active in self.active):
+            self.end_waves()
+
+    def preload_upcoming(self) -> None:
+        """Starts decoding the images of waves starting soon."""
+        waves = self.stage.waves
+        for index in range(self.next_wave, len(waves)):
+            if waves[index].time - self.preload_time > self.time:
+                break
+            if index not in self.preloads:
+                self.preloads[index] = preload(*waves[index].assets)
+
+    def start_wave(self) -> None:
+        wave = self.stage.waves[self.next_wave]
+        # Waiting avoids decoding the images a second time on this thread.
+        self.preloads[self.next_wave].wait()
+        self.active.append(_ActiveWave(self.next_wave, wave))
+        logger.info("Started wave %s at %.0fms.", self.next_wave, self.time)
+        self.next_wave += 1
+
+    def spawn_due(self, active: _ActiveWave) -> None:
+        spawns = active.wave.spawns
+        wave_time = self.time - active.wave.time
+        while (
+            active.next_spawn < len(spawns)
+            and spawns[active.next_spawn].time <= wave_time
+        ):
+            enemy = self.spawn(spawns[active.next_spawn])
+            active.enemies.append(enemy)
+            active.next_spawn += 1
+        active.enemies = [enemy for enemy in active.enemies if enemy.alive()]
+
+    def spawn(self, spawn: Spawn) -> Enemy:
+        enemy = Enemy(
+            self.game,
+            spawn.path[0],
+            "center",
+            sprite=load_image(spawn.sprite, "alpha"),
+            sprite_scale=spawn.scale,
+            rect_alignment="center",
+            stats={"health": spawn.health},
+        )
+        self.game.enemies.add(enemy)
+        scheduler = self.game.scheduler
+        scheduler.start(enemy, follow_path(enemy, spawn.path, spawn.speed))
+        if spawn.pattern is not None:
+            scheduler.start(enemy, fire_pattern(enemy, spawn.pattern))
+        return enemy
+
+    def end_waves(self) -> None:
+        """Removes waves that are over and releases their images."""
+        over = [active for active in self.active if active.is_over()]
+        self.active = [
+            active for active in self.active if not active.is_over()
+        ]
+        for active in over:
+            del self.preloads[active.index]
+            logger.info("Wave %s is over at %.0fms.", active.index, self.time)
+        # Every wave that isn't over has a preload, even if it hasn't started.
+        still_used = {
+            name
+            for index in self.preloads
+            for name in self.stage.waves[index].assets
+        }
+        release(
+            *{
+                name: None
+                for active in over
+                for name in active.wave.assets
+                if name not in still_used
+            }
+        )
+
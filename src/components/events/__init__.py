@@ -2,7 +2,7 @@
 
 import logging
 
-from src.components.events import eventbinder
+from src.components.events import eventbinder, replay
 from src.components.events.utils import (
     process,
     is_key_up,
@@ -17,4 +17,3 @@ from src.components.events.utils import (
 )
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
@@ -15,6 +15,7 @@ from src.components.events.utils import (
     is_mouse_up,
     is_mouse_down,
 )
+from src.core import instrumentation
 from src.core.data import system_data
 
 if TYPE_CHECKING:
@@ -88,9 +89,12 @@ def notify() -> None:
     for inputs, actions in _sorted_bindings_cache:
         if _are_inputs_active(inputs, used_inputs):
             for action in actions:
-                logging.debug(
-                    "Inputs: %s detected. Calling action %s.", inputs, action
-                )
+                if instrumentation.enabled:
+                    logger.debug(
+                        "Inputs: %s detected. Calling action %s.",
+                        inputs,
+                        action,
+                    )
                 action()
             used_inputs.update(inputs)
 
@@ -0,0 +1,181 @@
+"""Used to record the input of every tick to a replay file and play it back.
+
+A replay file is a gzip compressed binary file starting with a header
+containing the tick rate and random seed the replay was recorded with. Each
+tick is then stored as the mouse position in internal surface coordinates
+followed by every input event that occurred during the tick, so the held keys
+and buttons can be reconstructed exactly by `process()` when played back.
+
+Replays are only deterministic when the game loop uses a fixed timestep, so
+recording or playing back a replay enables it.
+"""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import random
+import struct
+from typing import TYPE_CHECKING
+
+import pygame
+
+from src.core.data import system_data
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+logger = logging.getLogger("src.components.events")
+
+MAGIC = b"SHRP"
+VERSION = 1
+_header = struct.Struct("<4sHHQ")
+_tick = struct.Struct("<ddH")
+_event = struct.Struct("<BI")
+# Event types stored in replays, mapped to their code and the name of the
+# attribute holding their value.
+_event_codes = {
+    pygame.KEYDOWN: (0, "key"),
+    pygame.KEYUP: (1, "key"),
+    pygame.MOUSEBUTTONDOWN: (2, "button"),
+    pygame.MOUSEBUTTONUP: (3, "button"),
+    pygame.QUIT: (4, None),
+}
+_event_types = {
+    code: (event_type, attribute)
+    for event_type, (code, attribute) in _event_codes.items()
+}
+
+_recording: gzip.GzipFile | None = None
+_playback: gzip.GzipFile | None = None
+
+
+class ReplayError(Exception):
+    """Raised when a replay file is invalid."""
+
+
+def is_recording() -> bool:
+    return _recording is not None
+
+
+def is_playing() -> bool:
+    return _playback is not None
+
+
+def start_recording(path: Path, seed: int | None = None) -> None:
+    """Starts recording the input of every tick into a replay file.
+
+    :param path: The path of the replay file, overwritten if it exists.
+    :param seed: The seed to seed the random module with. A random seed is
+    chosen if None.
+    """
+    global _recording
+    if seed is None:
+        seed = random.getrandbits(64)
+    random.seed(seed)
+    system_data.fixed_timestep = True
+    _recording = gzip.open(path, "wb")
+    _recording.write(
+        _header.pack(MAGIC, VERSION, system_data.tick_rate, seed)
+    )
+    logger.info(
+        "Started recording replay to %s with tick rate %s and seed %s.",
+        path,
+        system_data.tick_rate,
+        seed,
+    )
+
+
+def stop_recording() -> None:
+    global _recording
+    if _recording is None:
+        return
+    _recording.close()
+    _recording = None
+    logger.info("Stopped recording replay.")
+
+
+def record(
+    events: list[pygame.event.Event], mouse_pos: tuple[float, float]
+) -> None:
+    """Writes the input of a tick to the replay file being recorded.
+
+    :param events: The events processed during the tick. Events that don't
+    affect input are ignored.
+    :param mouse_pos: The mouse position in internal surface coordinates.
+    """
+    recorded = []
+    for event in events:
+        if event.type not in _event_codes:
+            continue
+        code, attribute = _event_codes[event.type]
+        recorded.append(
+            _event.pack(code, getattr(event, attribute) if attribute else 0)
+        )
+    _recording.write(_tick.pack(*mouse_pos, len(recorded)))
+    _recording.write(b"".join(recorded))
+
+
+def start_playback(path: Path) -> None:
+    """Starts playing back the input of a replay file.
+
+    Sets the tick rate and random seed to the ones the replay was recorded
+    with.
+
+    :param path: The path of the replay file.
+    :raises ReplayError: If the file isn't a replay file or has an
+    unsupported version.
+    """
+    global _playback
+    playback = gzip.open(path, "rb")
+    magic, version, tick_rate, seed = _header.unpack(
+        playback.read(_header.size)
+    )
+    if magic != MAGIC or version != VERSION:
+        playback.close()
+        msg = f"{path} is not a version {VERSION} replay file."
+        raise ReplayError(msg)
+    _playback = playback
+    system_data.tick_rate = tick_rate
+    system_data.fixed_timestep = True
+    random.seed(seed)
+    logger.info(
+        "Started playing back replay %s with tick rate %s and seed %s.",
+        path,
+        tick_rate,
+        seed,
+    )
+
+
+def stop_playback() -> None:
+    global _playback
+    if _playback is None:
+        return
+    _playback.close()
+    _playback = None
+    logger.info("Stopped playing back replay.")
+
+
+def read_tick() -> (
+    tuple[list[pygame.event.Event], tuple[float, float]] | None
+):
+    """Reads the input of the next tick from the replay being played back.
+
+    :return: The events and mouse position of the tick, or None if the end of
+    the replay has been reached.
+    """
+    data = _playback.read(_tick.size)
+    if len(data) < _tick.size:
+        return None
+    mouse_x, mouse_y, count = _tick.unpack(data)
+    events = []
+    for code, value in _event.iter_unpack(
+        _playback.read(_event.size * count)
+    ):
+        event_type, attribute = _event_types[code]
+        events.append(
+            pygame.event.Event(
+                event_type, {attribute: value} if attribute else {}
+            )
+        )
+    return events, (mouse_x, mouse_y)
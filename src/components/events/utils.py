@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 import logging
+from typing import TYPE_CHECKING
 
 import pygame
-import pynput
 
+from src.core import instrumentation
 from src.core.data import system_data
 
+if TYPE_CHECKING:
+    import pynput
+
 logger = logging.getLogger("src.components.events")
 
 _keydown_events = []
@@ -18,10 +22,19 @@ _mousedown_events = []
 _mouseup_events = []
 _mouse_buttons = []
 _mouse_pos = (0, 0)
-_mouse_controller = pynput.mouse.Controller()
+_mouse_controller = None
+
 
+def process(
+    events: list[pygame.event.Event],
+    mouse_pos: tuple[float, float] | None = None,
+) -> None:
+    """Updates the input state from the events of the current tick.
 
-def process(events: list[pygame.event.Event]) -> None:
+    :param events: The events of the current tick.
+    :param mouse_pos: The mouse position in internal surface coordinates. Read
+    from the window and scaled if None.
+    """
     global _mouse_pos
     _keydown_events.clear()
     _keyup_events.clear()
@@ -31,35 +44,46 @@ def process(events: list[pygame.event.Event]) -> None:
     for event in events:
         match event.type:
             case pygame.KEYDOWN:
-                logger.info("Key down event detected. Key %s.", event.key)
+                if instrumentation.enabled:
+                    logger.info("Key down event detected. Key %s.", event.key)
                 _keydown_events.append(event.key)
                 _held_keys.append(event.key)
             case pygame.KEYUP:
-                logger.info("Key up event detected. Key %s.", event.key)
+                if instrumentation.enabled:
+                    logger.info("Key up event detected. Key %s.", event.key)
                 _keyup_events.append(event.key)
                 _held_keys.remove(event.key)
             case pygame.MOUSEBUTTONDOWN:
-                logger.info(
-                    "Mouse button down event detected. Button %s.",
-                    event.button,
-                )
+                if instrumentation.enabled:
+                    logger.info(
+                        "Mouse button down event detected. Button %s.",
+                        event.button,
+                    )
                 _mousedown_events.append(event.button)
                 _mouse_buttons.append(event.button)
             case pygame.MOUSEBUTTONUP:
-                logger.info(
-                    "Mouse button up event detected. Button %s.", event.button
-                )
+                if instrumentation.enabled:
+                    logger.info(
+                        "Mouse button up event detected. Button %s.",
+                        event.button,
+                    )
                 _mouseup_events.append(event.button)
                 _mouse_buttons.remove(event.button)
             case pygame.QUIT:
                 logger.info("Quit event detected.")
                 system_data.quit = True
 
-    _mouse_pos = tuple(
-        coord / system_data.scale_factor[i]
-        for i, coord in enumerate(pygame.mouse.get_pos())
-    )
-    logger.debug("Mouse position updated to new location: %s", _mouse_pos)
+    if mouse_pos is not None:
+        _mouse_pos = mouse_pos
+    else:
+        _mouse_pos = tuple(
+            coord / system_data.scale_factor[i]
+            for i, coord in enumerate(pygame.mouse.get_pos())
+        )
+    if instrumentation.enabled:
+        logger.debug(
+            "Mouse position updated to new location: %s", _mouse_pos
+        )
 
 
 def is_key_down(key: int) -> bool:
@@ -90,9 +114,23 @@ def get_mouse_pos() -> tuple[int, int]:
     return _mouse_pos
 
 
+def _get_mouse_controller() -> pynput.mouse.Controller:
+    """Gets the pynput mouse controller, creating it on first use.
+
+    pynput is slow to import and connects to the display server when the
+    controller is created, so this is only done once it's actually needed.
+    """
+    global _mouse_controller
+    if _mouse_controller is None:
+        import pynput
+
+        _mouse_controller = pynput.mouse.Controller()
+    return _mouse_controller
+
+
 def get_abs_mouse_pos() -> tuple[int, int]:
-    return _mouse_controller.position
+    return _get_mouse_controller().position
 
 
 def set_abs_mouse_pos(pos: tuple[int, int]) -> None:
-    _mouse_controller.position = pos
+    _get_mouse_controller().position = pos
@@ -93,3 +93,14 @@ def remove(overlay: type[Overlay]) -> bool:
         stacklevel=2,
     )
     return False
+
+
+def toggle(overlay: type[Overlay]) -> None:
+    """Removes an overlay if it is in the overlay stack, otherwise adds it.
+
+    :param overlay: The overlay to toggle.
+    """
+    if any(isinstance(obj, overlay) for obj in overlay_stack):
+        remove(overlay)
+    else:
+        append(overlay)
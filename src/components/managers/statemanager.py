@@ -1,7 +1,14 @@
-"""Used to manage states in a state stack."""
+"""Used to manage states in a state stack.
+
+Before a state is appended or switched to, the images listed in its `assets`
+are decoded on worker threads. If they aren't ready yet, the loading overlay
+is shown and the transition is finished by `update()` once they are, so the
+game loop never blocks on decoding images.
+"""
 
 from __future__ import annotations
 
+import importlib
 import logging
 import warnings
 from typing import TYPE_CHECKING
@@ -9,16 +16,24 @@ from typing import TYPE_CHECKING
 import pygame
 
 from src.components import events
+from src.components.managers import overlaymanager
+from src.core.data import system_data
 from src.core.keybinds import keybinds
+from src.core.load import preload
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from src.core.load import Preload
     from src.core.types import AnyState
-    from src.states.state import State
+    from src.states.state import Overlay, State
 
 
 logger = logging.getLogger("src.components.managers")
 state_dict = {}
 state_stack = []
+loading_overlay: type[Overlay] | None = None
+_pending: tuple[Callable[[], None], Preload] | None = None
 
 
 def current_state() -> AnyState:
@@ -40,9 +55,88 @@ def _validate(state_name: str) -> bool:
     return not state_name.lower() not in state_dict
 
 
+def _resolve(state_name: str) -> type[State]:
+    """Gets the class of a state, importing it first if needed.
+
+    States in the state dictionary can be given as an import path in the form
+    "module:Class" so that their module is only imported when the state is
+    first used. The imported class then replaces the import path.
+    """
+    state_class = state_dict[state_name]
+    if isinstance(state_class, str):
+        module_name, _, class_name = state_class.partition(":")
+        state_class = getattr(importlib.import_module(module_name), class_name)
+        state_dict[state_name] = state_class
+        logger.info(
+            "Imported state %s from %s.", state_name, state_class.__module__
+        )
+    return state_class
+
+
+def _defer(state_name: str, transition: Callable[[], None]) -> bool:
+    """Starts preloading a state's assets, deferring the transition to it.
+
+    Assets are loaded synchronously when running headless or with a replay,
+    since how long decoding takes would otherwise change which tick the
+    transition happens on.
+
+    :param state_name: The name of the state being transitioned to.
+    :param transition: Called by `update()` once the assets are decoded.
+    :return: True if the transition was deferred or ignored, and False if the
+    assets are ready and the transition should happen now.
+    """
+    global _pending
+    if _pending is not None:
+        logger.warning(
+            "Ignored transition to state %s while loading another state.",
+            state_name,
+        )
+        return True
+    if not _validate(state_name):
+        return False
+    handle = preload(*_resolve(state_name.lower()).assets)
+    if (
+        system_data.headless
+        or events.replay.is_playing()
+        or events.replay.is_recording()
+    ):
+        handle.wait()
+    if handle.done():
+        return False
+    _pending = (transition, handle)
+    if loading_overlay is not None:
+        overlaymanager.append(loading_overlay)
+    logger.info("Deferred transition to state %s until loaded.", state_name)
+    return True
+
+
+def update() -> None:
+    """Finishes a deferred transition once the state's assets are decoded.
+
+    :raises Exception: Any exception raised while decoding an asset.
+    """
+    global _pending
+    if _pending is None:
+        return
+    transition, handle = _pending
+    if not handle.done():
+        return
+    _pending = None
+    if loading_overlay is not None:
+        overlaymanager.remove(loading_overlay)
+    transition()
+
+
+def loading_progress() -> float:
+    """The fraction of the pending state's assets decoded, from 0 to 1."""
+    if _pending is None:
+        return 1.0
+    return _pending[1].progress
+
+
 def _initialise_state(state_name: str) -> State:
     if _validate(state_name):
-        state_class = state_dict[state_name.lower()]
+        state_class = _resolve(state_name.lower())
         return state_class()
     msg = (
         f"Initializing state {state_name!r} failed. State does not exist in"
@@ -59,6 +153,8 @@ def append(state_name: str, *, initial: bool = False) -> None:
     state. Defaults to False
     :raises KeyError: If initializing the state fails.
     """
+    if not initial and _defer(state_name, lambda: append(state_name)):
+        return
     if not initial:
         current_state().cleanup()
     logger.debug(
@@ -95,6 +191,8 @@ def switch(state_name: str) -> None:
     to.
     :raises KeyError: If initializing the state fails.
     """
+    if _defer(state_name, lambda: switch(state_name)):
+        return
     logger.debug(
         "Attempting to switch state %s for state %s in the state stack %s.",
         current_state(),
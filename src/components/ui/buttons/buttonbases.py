@@ -8,8 +8,12 @@ from typing import override, TYPE_CHECKING
 
 import pygame
 
-from src.components.ui.widgetutils import CompositeWidgetBase, WidgetBase
-from src.core.data import system_data
+from src.components.ui.widgetutils import (
+    CompositeWidgetBase,
+    RedrawNeeded,
+    WidgetBase,
+)
+from src.core import dirty, renderqueue
 from src.core.constants import PRIMARY, SECONDARY, ACCENT
 
 if TYPE_CHECKING:
@@ -26,6 +30,8 @@ class _BaseButtonConfig:
 
 
 class RectButtonBaseMixin(CompositeWidgetBase):
+    color = RedrawNeeded()
+
     def __init__(
         self,
         position: tuple[int, int],
@@ -45,7 +51,7 @@ class RectButtonBaseMixin(CompositeWidgetBase):
             self.colors = colors
         else:
             self.colors = (colors,) * 3
-        self.color = self.colors[0]
+        self._color = self.colors[0]
         self.rect = pygame.Rect(self._x, self._y, self._width, self._height)
         self.radius = radius
         self.audio_tags = (
@@ -75,8 +81,8 @@ class RectButtonBaseMixin(CompositeWidgetBase):
 
     @override
     def blit(self) -> None:
-        pygame.draw.rect(
-            system_data.abs_window,
+        renderqueue.submit_rect(
+            renderqueue.Layer.WIDGETS,
             self.color,
             self.rect,
             border_radius=self.radius,
@@ -91,9 +97,11 @@ class RectButtonBaseMixin(CompositeWidgetBase):
         return True
 
     def align_rect(self) -> None:
+        dirty.mark(self.rect)
         setattr(self.rect, self._align, (self._x, self._y))
         self._x, self._y = self.rect.topleft
         self.requires_realignment = False
+        self.mark_dirty()
 
     @override
     def contains(self, x: int, y: int) -> list[WidgetBase]:
@@ -149,7 +157,7 @@ class ImageButtonBaseMixin(CompositeWidgetBase, ABC):
     image_mask: pygame.Mask = ...
     _width: int = ...
     _height: int = ...
-    image: pygame.Surface = ...
+    image: pygame.Surface
     use_mask: bool = ...
 
     def __init__(
@@ -233,6 +241,11 @@ class ButtonArrayBase(CompositeWidgetBase, ABC):
             if not button.hidden:
                 button.blit()
 
+    @override
+    def mark_dirty(self) -> None:
+        for button in self.buttons:
+            button.mark_dirty()
+
     @override
     def contains(self, x: int, y: int) -> list[AnyButton]:
         if not super().contains(x, y):
@@ -8,8 +8,9 @@ from src.components.ui.buttons.inputmixins import (
     ToggleInputMixin,
     ClickInputMixin,
 )
-from src.core.load import Load, get_sprites
-from src.core.data import system_data
+from src.components.ui.widgetutils import RedrawNeeded
+from src.core import renderqueue
+from src.core.load import Load, get_mask, get_packed, get_sprites, get_variant
 
 if TYPE_CHECKING:
     from src.core.types import Align, Images
@@ -18,6 +19,7 @@ if TYPE_CHECKING:
 class ImageLabelMixin:
     rect: pygame.Rect = ...
     requires_realignment: bool = ...
+    image = RedrawNeeded()
 
     def __init__(
         self,
@@ -32,13 +34,13 @@ class ImageLabelMixin:
         self.images = images if isinstance(images, tuple) else (images,) * 3
         if scale_by is not None:
             self.images = tuple(
-                pygame.transform.scale_by(image, scale_by)
-                for image in self.images
+                get_variant(image, scale=scale_by) for image in self.images
             )
-        self.image = self.images[0]
+        self.images = tuple(get_packed(image) for image in self.images)
+        self._image = self.images[0]
         self.use_mask = True
         if mask_image is None:
-            self.image_mask = pygame.mask.from_surface(self.images[0])
+            self.image_mask = get_mask(self.images[0])
         else:
             if mask_image is False:
                 self.use_mask = False
@@ -67,7 +69,9 @@ class ImageLabelMixin:
         self.align_image()
 
     def blit(self) -> None:
-        system_data.abs_window.blit(self.image, self.image_rect)
+        renderqueue.submit(
+            renderqueue.Layer.WIDGETS, self.image, self.image_rect.topleft
+        )
 
 
 class ToggleImageMixin(ToggleInputMixin, ImageLabelMixin):
@@ -90,7 +94,7 @@ class ToggleImageMixin(ToggleInputMixin, ImageLabelMixin):
         ImageLabelMixin.__init__(
             self, images, scale_by, mask_image, image_align, padding
         )
-        self.image = self.images[start_image]
+        self._image = self.images[start_image]
 
     def toggle_on(self) -> None:
         super().toggle_on()
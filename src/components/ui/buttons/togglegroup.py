@@ -46,6 +46,11 @@ class ToggleButtonGroup(CompositeWidgetBase):
             if not button.disabled:
                 button.blit()
 
+    @override
+    def mark_dirty(self) -> None:
+        for button in self.buttons:
+            button.mark_dirty()
+
     @override
     def contains(self, x: int, y: int) -> list[AnyToggleButton]:
         if not super().contains(x, y):
@@ -9,7 +9,11 @@ from src.components.ui.buttons import (
     TextButtonConfig,
     TextRectClickButtonArray,
 )
-from src.components.ui.widgetutils import CompositeWidgetBase, WidgetBase
+from src.components.ui.widgetutils import (
+    CompositeWidgetBase,
+    RedrawNeeded,
+    WidgetBase,
+)
 
 if TYPE_CHECKING:
     import pygame
@@ -21,6 +25,8 @@ logger = logging.getLogger("src.components.ui")
 
 
 class TextDropdown(CompositeWidgetBase):
+    dropped = RedrawNeeded()
+
     def __init__(
         self,
         position: tuple[int, int],
@@ -48,7 +54,7 @@ class TextDropdown(CompositeWidgetBase):
         self.chosen = (
             choices[0] if start_choice is None else choices[start_choice]
         )
-        self.dropped = False
+        self._dropped = False
         head_config = TextButtonConfig(
             position=position,
             align=align,
@@ -106,6 +112,11 @@ class TextDropdown(CompositeWidgetBase):
         if self.dropped:
             self.option_button_arr.blit()
 
+    @override
+    def mark_dirty(self) -> None:
+        self.head_button.mark_dirty()
+        self.option_button_arr.mark_dirty()
+
     @override
     def update(self, disabled_sub_widgets: list[WidgetBase] = ()) -> None:
         if not super().update(disabled_sub_widgets=disabled_sub_widgets):
@@ -128,7 +139,7 @@ class TextDropdown(CompositeWidgetBase):
         ):
             self.actions[self.choices.index(choice)]()
         self.dropped = False
-        logging.info(
+        logger.info(
             "Selected new choice %s, closing popup, calling action if"
             " not None and setting text of dropdown head to new "
             "choice.",
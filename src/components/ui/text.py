@@ -14,8 +14,8 @@ from src.components.ui.widgetutils import (
     RenderNeeded,
     WidgetBase,
 )
+from src.core import dirty, renderqueue
 from src.core.constants import DEFAULT_FONT_SIZE, DEFAULT_FONT_NAME
-from src.core.data import system_data
 from src.core.load import Load
 
 if TYPE_CHECKING:
@@ -88,10 +88,16 @@ class Text(WidgetBase):
 
     @override
     def blit(self) -> None:
-        system_data.abs_window.blit(self.text_surface, self.rect)
+        renderqueue.submit(
+            renderqueue.Layer.WIDGETS, self.text_surface, self.rect.topleft
+        )
 
     @override
     def update(self) -> None:
+        if not (self.requires_rerender or self.requires_realignment):
+            return
+        old_rect = self.rect.copy()
+        rerendered = self.requires_rerender
         if self.requires_rerender:
             self.line_height = self._font.get_sized_height(self._font_size)
             self.text_surface, self.rect = self.render_text(
@@ -99,6 +105,9 @@ class Text(WidgetBase):
             )
         if self.requires_realignment:
             self.align_rect()
+        if rerendered or self.rect != old_rect:
+            dirty.mark(old_rect)
+            self.mark_dirty()
 
     @override
     def contains(self, x: int, y: int) -> bool:
@@ -252,7 +261,7 @@ class TextArray(CompositeWidgetBase):
             y_pos = self._y
 
     @override
-    def update(self, *, disabled_sub_widgets: list[WidgetBase] = ()) -> None:
+    def update(self, disabled_sub_widgets: list[WidgetBase] = ()) -> None:
         if not super().update(disabled_sub_widgets):
             return
         for text_obj in self.texts:
@@ -265,6 +274,11 @@ class TextArray(CompositeWidgetBase):
             if not text_obj.hidden:
                 text_obj.blit()
 
+    @override
+    def mark_dirty(self) -> None:
+        for text_obj in self.texts:
+            text_obj.mark_dirty()
+
     @override
     def contains(self, x: int, y: int) -> list[Text]:
         if not super().contains(x, y):
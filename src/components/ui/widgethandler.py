@@ -61,6 +61,7 @@ def add_widget(*widgets_: WidgetBase) -> None:
         if widget not in widgets:
             widgets.add(widget)
             move_to_top(widget)
+            widget.mark_dirty()
         elif widget.sub_widget:
             warnings.warn(
                 f"Attempted to add subwidget: {widget!r} to the widgethandler."
@@ -80,6 +81,7 @@ def remove_widget(*widgets_: WidgetBase) -> None:
     try:
         for widget in widgets_:
             widgets.remove(widget)
+            widget.mark_dirty()
     except ValueError as e:
         warnings.warn(
             "Attempted to remove widget which doesn't exist in "
@@ -5,6 +5,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, override, Any
 
+from src.core import dirty
 from src.core.structs import Validator
 
 if TYPE_CHECKING:
@@ -26,6 +27,12 @@ class RenderNeeded(AlignmentNeeded):
         instance.requires_realignment = True
 
 
+class RedrawNeeded(Validator):
+    @override
+    def validate(self, instance: Any, value: Any) -> None:
+        instance.mark_dirty()
+
+
 class WidgetBase(ABC):
     x = AlignmentNeeded()
     y = AlignmentNeeded()
@@ -59,6 +66,10 @@ class WidgetBase(ABC):
     def contains(self, x: int, y: int) -> bool:
         return not self.disabled
 
+    def mark_dirty(self) -> None:
+        """Marks the area the widget is drawn in as needing to be redrawn."""
+        dirty.mark(self.rect)
+
     @override
     def __str__(self):
         return f"<{self.__class__.__module__}.{self.__class__.__name__} {self.x=}, {self.y=}>"
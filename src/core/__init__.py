@@ -8,4 +8,3 @@ from src.core.structs import Validator, Bidict
 from src.core.keybinds import keybinds, keybinds_dir
 
 logger = logging.getLogger("src")
-logger.setLevel(logging.INFO)
@@ -0,0 +1,195 @@
+"""Module for packing small images into a few large texture atlas pages.
+
+Packing small images into shared pages keeps images drawn together close in
+memory, and lets batched drawing blit many images from one source surface
+using the area of each image's region on its page.
+
+Images are packed with `pack()`, which returns a subsurface of an atlas page
+that can be used anywhere the original image was. Pages are in the display's
+pixel format with per-pixel alpha, so the display mode must be set first.
+Images are packed using shelves: each page is filled with rows as tall as the
+first image placed in them, and images are placed left to right in the first
+row they fit in.
+
+Images that are too large, or that use a colorkey or surface alpha, which
+would be lost by packing them, are returned unchanged. Opaque images are
+packed as well, although they are then blitted with alpha blending, since
+pygame's alpha blitters are faster than its opaque ones when drawing many
+small images.
+
+Images that are no longer used can be removed with `release()`. The space
+they took up is reused by the next image of the same size that is packed.
+Until then, packed images are kept alive by the atlas, so only images that
+are cached and released with the cache should be packed, see
+`load.get_packed()`.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+import pygame
+
+from src.core.constants import ATLAS_MAX_SPRITE_SIZE, ATLAS_PAGE_SIZE
+
+logger = logging.getLogger("src.core")
+
+
+@dataclass
+class AtlasRegion:
+    page: pygame.Surface
+    rect: pygame.Rect
+    surface: pygame.Surface
+
+
+class Atlas:
+    def __init__(
+        self,
+        page_size: tuple[int, int] = ATLAS_PAGE_SIZE,
+        max_sprite_size: int = ATLAS_MAX_SPRITE_SIZE,
+        padding: int = 1,
+    ):
+        """Packs images into pages using a shelf packer.
+
+        :param page_size: The size of each page.
+        :param max_sprite_size: The largest width or height of an image that
+        can be packed.
+        :param padding: Transparent space left around each image, so that
+        scaling an image doesn't sample its neighbours.
+        """
+        self.page_size = page_size
+        self.max_sprite_size = max_sprite_size
+        self.padding = padding
+        self.pages: list[pygame.Surface] = []
+        # The shelves of each page, as [top, height, next free x].
+        self.shelves: list[list[list[int]]] = []
+        self.regions: dict[int, AtlasRegion] = {}
+        # Packed images are kept so that their ids can't be reused.
+        self.sources: dict[int, pygame.Surface] = {}
+        # Regions of released images, by their size.
+        self.free: dict[tuple[int, int], list[AtlasRegion]] = {}
+
+    def can_pack(self, surface: pygame.Surface) -> bool:
+        width, height = surface.get_size()
+        return (
+            0 < width <= self.max_sprite_size
+            and 0 < height <= self.max_sprite_size
+            and surface.get_colorkey() is None
+            and surface.get_alpha() in (None, 255)
+        )
+
+    def pack(self, surface: pygame.Surface) -> AtlasRegion | None:
+        """Copies an image onto a page, if it hasn't been already.
+
+        :param surface: The image to pack.
+        :return: The region of the page the image was copied to, or None if
+        the image can't be packed.
+        """
+        if (region := self.regions.get(id(surface))) is not None:
+            return region
+        if not self.can_pack(surface):
+            return None
+        if free := self.free.get(surface.get_size()):
+            region = free.pop()
+        else:
+            width, height = surface.get_size()
+            page_index, position = self._allocate(
+                width + self.padding * 2, height + self.padding * 2
+            )
+            page = self.pages[page_index]
+            rect = pygame.Rect(
+                (position[0] + self.padding, position[1] + self.padding),
+                (width, height),
+            )
+            region = AtlasRegion(page, rect, page.subsurface(rect))
+        region.page.blit(surface, region.rect)
+        # Regions are also stored by their subsurface, so packing a surface
+        # that was already packed returns the same region.
+        self.regions[id(surface)] = self.regions[id(region.surface)] = region
+        self.sources[id(surface)] = surface
+        return region
+
+    def release(self, surface: pygame.Surface) -> None:
+        """Removes a packed image, so its space can be reused.
+
+        Anything still drawing the packed copy of the image will draw
+        whatever is packed into its space next.
+
+        :param surface: The image that was packed. Does nothing if it wasn't.
+        """
+        if self.sources.pop(id(surface), None) is None:
+            return
+        region = self.regions.pop(id(surface))
+        del self.regions[id(region.surface)]
+        region.page.fill((0, 0, 0, 0), region.rect)
+        self.free.setdefault(region.rect.size, []).append(region)
+
+    def _allocate(
+        self, width: int, height: int
+    ) -> tuple[int, tuple[int, int]]:
+        """Finds space for a rect, adding a shelf or page if needed.
+
+        Uses the shelf with the least height to spare that the rect fits in.
+
+        :return: The index of the page and the topleft of the space.
+        """
+        best = None
+        for page_index, shelves in enumerate(self.shelves):
+            for shelf in shelves:
+                _, shelf_height, x = shelf
+                if (
+                    shelf_height >= height
+                    and x + width <= self.page_size[0]
+                    and (best is None or shelf_height < best[1][1])
+                ):
+                    best = (page_index, shelf)
+        if best is not None:
+            page_index, shelf = best
+            x = shelf[2]
+            shelf[2] += width
+            return page_index, (x, shelf[0])
+
+        for page_index, shelves in enumerate(self.shelves):
+            top = shelves[-1][0] + shelves[-1][1] if shelves else 0
+            if top + height <= self.page_size[1]:
+                shelves.append([top, height, width])
+                return page_index, (0, top)
+
+        self.pages.append(
+            pygame.Surface(self.page_size, pygame.SRCALPHA).convert_alpha()
+        )
+        self.shelves.append([[0, height, width]])
+        logger.info(
+            "Added atlas page %s of size %s.", len(self.pages), self.page_size
+        )
+        return len(self.pages) - 1, (0, 0)
+
+
+def pack(surface: pygame.Surface) -> pygame.Surface:
+    """Packs an image into the atlas, returning its packed copy.
+
+    :param surface: The image to pack. Must not be modified afterwards, since
+    the packed copy won't be updated.
+    :return: The subsurface of the atlas page the image was packed into, or
+    the image itself if it can't be packed.
+    """
+    region = atlas.pack(surface)
+    return surface if region is None else region.surface
+
+
+def release(surface: pygame.Surface) -> None:
+    """Removes an image from the atlas, see `Atlas.release()`."""
+    atlas.release(surface)
+
+
+def get_region(surface: pygame.Surface) -> AtlasRegion | None:
+    """Gets the region of the atlas a packed image is in.
+
+    :param surface: Either the image that was packed, or its packed copy.
+    :return: The region, or None if the image hasn't been packed.
+    """
+    return atlas.regions.get(id(surface))
+
+
+atlas = Atlas()
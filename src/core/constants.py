@@ -24,6 +24,61 @@ ACCENT = (85, 85, 85)
 DEFAULT_FONT_NAME = "editundo"
 DEFAULT_FONT_SIZE = 32
 
+# timing
+
+# Longest frame time in milliseconds that the fixed timestep accumulator will
+# catch up on, so the game doesn't stall trying to catch up after a hitch.
+MAX_FRAME_TIME = 250
+
+# rendering
+
+# Past this many dirty rects or this fraction of the internal surface being
+# dirty, redrawing the whole frame is cheaper than redrawing each rect.
+MAX_DIRTY_RECTS = 32
+MAX_DIRTY_AREA = 0.5
+
+# entities
+
+# Number of bullets a bullet field allocates space for before growing.
+BULLET_FIELD_CAPACITY = 1024
+
+# Width and height in pixels of the cells of the grid used to find colliders
+# near each other.
+COLLISION_CELL_SIZE = 64
+
+# Width and height in pixels of the cells of the grid used to answer proximity
+# queries on entity groups.
+QUERY_CELL_SIZE = 128
+
+# Distance in pixels bullets have to get to the player's hitbox to graze it.
+GRAZE_DISTANCE = 16
+
+# Largest number of volleys a bullet pattern is compiled into. Patterns
+# rotating by less than a full turn divided by this are rotated faster.
+MAX_PATTERN_VOLLEYS = 360
+
+# Number of entities each archetype of an entity component system world
+# allocates space for before growing.
+ECS_ARCHETYPE_CAPACITY = 256
+
+# Size of each texture atlas page, and the largest width or height of an
+# image that is packed into the atlas.
+ATLAS_PAGE_SIZE = (1024, 1024)
+ATLAS_MAX_SPRITE_SIZE = 128
+
+# loading
+
+# Number of worker threads used to decode images in the background.
+LOADER_THREADS = 4
+
+# How many milliseconds before a stage wave starts its images are preloaded.
+STAGE_PRELOAD_TIME = 2000
+
+# profiling
+
+# Number of frames of timings kept by the profiler.
+PROFILER_HISTORY = 600
+
 # convert from constant to name
 
 DISPLAY_FLAG_NAMES_MAP = Bidict(
@@ -76,6 +76,9 @@ class Settings(FileModel):
     non_int_scaling: bool = True
     non_native_ratio: bool = False
     keep_mouse_pos: bool = True
+    dirty_rects: bool = False
+    instrumentation: bool = False
+    log_levels: dict[str, str] = {"src": "INFO"}
 
 
 @dataclass(kw_only=True)
@@ -85,6 +88,15 @@ class SystemData:
     flags: int = pygame.SCALED
     fps: int = 165
     dt: float = 1.0
+    # Simulation settings used by the game loop.
+    tick_rate: int = 120
+    fixed_timestep: bool = False
+    headless: bool = False
+    ticks: int = 0
+    # Milliseconds of game time simulated, used instead of wall clock time so
+    # that replays are deterministic.
+    game_time: float = 0.0
+    interpolation: float = 1.0
     quit: bool = False
     version: str = "0.0.3"
     version_type: str = "prototype"
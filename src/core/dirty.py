@@ -0,0 +1,79 @@
+"""Module for tracking which regions of the internal surface need redrawing.
+
+When `settings.dirty_rects` is enabled, states, overlays, widgets and entities
+mark the regions of the internal surface that have changed since the last
+frame. Only those regions are then redrawn, scaled and presented by the game
+loop. Marking without a rect requests that the whole frame is redrawn, which
+should be done whenever something changes that isn't tracked by a rect, such
+as a state being entered.
+
+When the setting is disabled, marking does nothing and every frame is redrawn
+in full.
+"""
+
+from __future__ import annotations
+
+import pygame
+
+from src.core.constants import MAX_DIRTY_AREA, MAX_DIRTY_RECTS
+from src.core.data import settings, system_data
+
+_rects: list[pygame.Rect] = []
+_full_redraw = True
+
+
+def mark(
+    rect: pygame.Rect | tuple[int, int, int, int] | None = None,
+) -> None:
+    """Marks a region of the internal surface as needing to be redrawn.
+
+    :param rect: The region to redraw. Redraws the whole frame if None.
+    """
+    global _full_redraw
+    if not settings.dirty_rects or _full_redraw:
+        return
+    if rect is None:
+        _full_redraw = True
+        _rects.clear()
+        return
+    _rects.append(pygame.Rect(rect))
+
+
+def collect() -> list[pygame.Rect] | None:
+    """Gets the regions that need to be redrawn this frame and resets them.
+
+    Overlapping rects are merged, and rects are clipped to the internal
+    surface.
+
+    :return: The list of rects to redraw, which is empty if nothing has
+    changed, or None if the whole frame should be redrawn.
+    """
+    global _full_redraw
+    if not settings.dirty_rects:
+        _full_redraw = True
+        return None
+    if _full_redraw:
+        _full_redraw = False
+        _rects.clear()
+        return None
+
+    merged = []
+    for rect in _rects:
+        rect = rect.clip(system_data.abs_window_rect)
+        if not rect:
+            continue
+        # Rect and the rects it is merged with are removed until it no longer
+        # overlaps any other rect.
+        while (i := rect.collidelist(merged)) != -1:
+            rect.union_ip(merged.pop(i))
+        merged.append(rect)
+    _rects.clear()
+
+    if len(merged) > MAX_DIRTY_RECTS or (
+        sum(rect.w * rect.h for rect in merged)
+        > system_data.abs_window_rect.w
+        * system_data.abs_window_rect.h
+        * MAX_DIRTY_AREA
+    ):
+        return None
+    return merged
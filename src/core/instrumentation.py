@@ -0,0 +1,61 @@
+"""Module for switching hot path logging and debug output on and off.
+
+Logging in code that runs every tick, such as input processing and collision
+checking, is guarded by `enabled`, so when instrumentation is off those calls
+cost a single attribute lookup instead of creating and filtering a log record.
+
+When instrumentation is on, every log record is written as a single line of
+json, including the subsystem (logger name) and tick it was logged during, so
+records can be filtered and compared between runs.
+
+The level of each subsystem's logger is set from `settings.log_levels`.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import override
+
+from src.core.data import settings, system_data
+
+logger = logging.getLogger("src.core")
+
+enabled = False
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formats log records as single line json objects."""
+
+    @override
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record),
+            "subsystem": record.name,
+            "level": record.levelname,
+            "tick": system_data.ticks,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+def configure(*, enable: bool | None = None) -> None:
+    """Sets logger levels and switches instrumentation on or off.
+
+    :param enable: Whether to turn instrumentation on. Uses
+    `settings.instrumentation` if None.
+    """
+    global enabled
+    enabled = settings.instrumentation if enable is None else enable
+    for name, level in settings.log_levels.items():
+        logging.getLogger(name).setLevel(level.upper())
+    if enabled:
+        for handler in logging.getLogger().handlers:
+            handler.setFormatter(StructuredFormatter())
+    logger.info(
+        "Instrumentation turned %s with log levels %s.",
+        "on" if enabled else "off",
+        settings.log_levels,
+    )
@@ -17,6 +17,11 @@ class UiKeybinds(BaseModel):
         [("key", pygame.K_LSHIFT), ("keydown", pygame.K_F11)],
         [("key", pygame.K_RSHIFT), ("keydown", pygame.K_F11)],
     ]
+    profiler: Keybinds_ = [[("keydown", pygame.K_F3)]]
+    profiler_dump: Keybinds_ = [
+        [("key", pygame.K_LSHIFT), ("keydown", pygame.K_F3)],
+        [("key", pygame.K_RSHIFT), ("keydown", pygame.K_F3)],
+    ]
 
 
 class GameKeybinds(BaseModel):
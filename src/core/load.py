@@ -1,19 +1,269 @@
-"""Module for loading assets from files."""
+"""Module for loading assets from files.
+
+Images are decoded once and cached by path. They can be decoded ahead of time
+on worker threads using `preload()`, so that states can be created without
+blocking the game loop while their images are decoded.
+
+Every image should be loaded with `load_image()` or `get_sprites()`, which
+cache the surfaces they return by name and conversion mode, so images are
+never read from disk or converted to the display's pixel format again in the
+middle of the game. Converting is done on the main thread. How often the cache
+is hit is counted in `image_cache_stats`.
+
+Variants of images, such as scaled or faded copies, and their masks should be
+made with `get_variant()` and `get_mask()`, so each is only made once and is
+shared by everything using it. Cached images can be packed into the texture
+atlas with `get_packed()`.
+
+Images that are only needed for part of the game, such as the enemies of a
+stage wave, can be removed from every cache with `release()` once nothing is
+using them.
+"""
 
 from __future__ import annotations
 
+import concurrent.futures
 import json
 import logging
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import ClassVar
+from typing import ClassVar, Literal
 
 import pygame
 
+from src.core import atlas
+from src.core.constants import LOADER_THREADS
 
 logger = logging.getLogger("src.core")
 
 
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    def reset(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+
+class Preload:
+    def __init__(self, futures: list[Future]):
+        """Handle for images being decoded by `preload()`.
+
+        :param futures: The futures of the images being decoded.
+        """
+        self.futures = futures
+
+    @property
+    def progress(self) -> float:
+        """The fraction of images that have been decoded, from 0 to 1."""
+        if not self.futures:
+            return 1.0
+        return sum(future.done() for future in self.futures) / len(
+            self.futures
+        )
+
+    def done(self) -> bool:
+        """Checks if every image has been decoded.
+
+        :raises Exception: Any exception raised while decoding an image.
+        """
+        if not all(future.done() for future in self.futures):
+            return False
+        for future in self.futures:
+            future.result()
+        return True
+
+    def wait(self) -> None:
+        """Blocks until every image has been decoded.
+
+        :raises Exception: Any exception raised while decoding an image.
+        """
+        concurrent.futures.wait(self.futures)
+        self.done()
+
+
+def preload(*names: str) -> Preload:
+    """Starts decoding images on worker threads.
+
+    Images that are already decoded or being decoded are skipped.
+
+    :param names: The names of the images in `Load("image")`.
+    :return: A handle to check when the images have been decoded.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            LOADER_THREADS, thread_name_prefix="loader"
+        )
+    futures = []
+    for name in names:
+        path = Load("image").path[name]
+        if path in _decoded:
+            continue
+        if path not in _decoding:
+            _decoding[path] = _executor.submit(_decode, path)
+        futures.append(_decoding[path])
+    logger.info(
+        "Preloading %s images out of %s requested.", len(futures), len(names)
+    )
+    return Preload(futures)
+
+
+def load_image(
+    name: str, convert: Literal["opaque", "alpha"] | None = None
+) -> pygame.Surface:
+    """Gets an image, decoding it if it hasn't been preloaded.
+
+    The surface is cached and shared by everything loading the image with the
+    same conversion, so it must not be modified in place.
+
+    :param name: The name of the image in `Load("image")`.
+    :param convert: Converts the image to the display's pixel format with
+    `Surface.convert()` if "opaque", or `Surface.convert_alpha()` if "alpha".
+    The image is left as decoded if None.
+    """
+    key = (name, convert)
+    if (surface := _cached_images.get(key)) is not None:
+        image_cache_stats.hits += 1
+        return surface
+    image_cache_stats.misses += 1
+    surface = _load_path(Load("image").path[name])
+    if convert == "opaque":
+        surface = surface.convert()
+    elif convert == "alpha":
+        surface = surface.convert_alpha()
+    _cached_images[key] = surface
+    _cached_ids.add(id(surface))
+    return surface
+
+
+def release(*names: str) -> None:
+    """Removes images from every cache, along with their variants and masks.
+
+    Packed copies of the images and their variants are removed from the
+    texture atlas. Must only be called once nothing is drawing the images,
+    and images being preloaded must have finished decoding.
+
+    :param names: The names of the images in `Load("image")`.
+    """
+    released = []
+    for name in names:
+        path = Load("image").path[name]
+        if (surface := _decoded.pop(path, None)) is not None:
+            released.append(surface)
+        for convert in (None, "opaque", "alpha"):
+            surface = _cached_images.pop((name, convert), None)
+            if surface is not None:
+                released.append(surface)
+        released.extend(_cached_sprites.pop(path, ()))
+    released_ids = {id(surface) for surface in released}
+    for key, (source, variant) in list(_cached_variants.items()):
+        if id(source) in released_ids:
+            del _cached_variants[key]
+            released.append(variant)
+            released_ids.add(id(variant))
+    for key, (source, _) in list(_cached_masks.items()):
+        if id(source) in released_ids:
+            del _cached_masks[key]
+    for surface in released:
+        _cached_ids.discard(id(surface))
+        atlas.release(surface)
+    logger.info("Released %s images and variants.", len(released))
+
+
+def get_variant(
+    surface: pygame.Surface,
+    *,
+    scale: float = 1,
+    alpha: int | None = None,
+    flip: tuple[bool, bool] = (False, False),
+) -> pygame.Surface:
+    """Gets a transformed copy of a surface, cached by the transform.
+
+    The copy is shared by everything asking for the same variant of the same
+    surface, so neither must be modified in place.
+
+    :param surface: The surface to transform, e.g. from `load_image()`.
+    :param scale: The factor to scale the surface by.
+    :param alpha: The alpha value to fade the surface with, or None to leave
+    it opaque.
+    :param flip: Whether to flip the surface horizontally and vertically.
+    :return: The transformed surface, or the surface itself if it isn't
+    transformed.
+    """
+    if scale == 1 and alpha is None and not any(flip):
+        return surface
+    key = (id(surface), scale, alpha, flip)
+    if (cached := _cached_variants.get(key)) is not None:
+        variant_cache_stats.hits += 1
+        return cached[1]
+    variant_cache_stats.misses += 1
+    variant = surface
+    if any(flip):
+        variant = pygame.transform.flip(variant, *flip)
+    if scale != 1:
+        variant = pygame.transform.scale_by(variant, scale)
+    if alpha is not None:
+        if variant is surface:
+            variant = surface.copy()
+        variant.set_alpha(alpha)
+    # The surface is kept so its id can't be reused by another surface.
+    _cached_variants[key] = (surface, variant)
+    _cached_ids.add(id(variant))
+    return variant
+
+
+def get_mask(surface: pygame.Surface) -> pygame.Mask:
+    """Gets the mask of a surface, cached by the surface.
+
+    :param surface: The surface to get the mask of.
+    """
+    if (cached := _cached_masks.get(id(surface))) is not None:
+        variant_cache_stats.hits += 1
+        return cached[1]
+    variant_cache_stats.misses += 1
+    mask = pygame.mask.from_surface(surface)
+    _cached_masks[id(surface)] = (surface, mask)
+    return mask
+
+
+def get_packed(surface: pygame.Surface) -> pygame.Surface:
+    """Packs a cached image into the texture atlas, see `atlas.pack()`.
+
+    Only images cached by this module are packed, since packed images are
+    kept in the atlas until they are released by name with `release()`.
+
+    :param surface: An image from `load_image()`, `get_sprites()` or
+    `get_variant()`.
+    :return: The packed copy of the image, or the image itself if it isn't
+    cached or can't be packed.
+    """
+    if not is_cached(surface):
+        return surface
+    return atlas.pack(surface)
+
+
+def is_cached(surface: pygame.Surface) -> bool:
+    """Checks if a surface is an image or variant cached by this module."""
+    return id(surface) in _cached_ids
+
+
+def _decode(path: Path) -> None:
+    _decoded[path] = pygame.image.load(path)
+    _decoding.pop(path, None)
+
+
+def _load_path(path: Path) -> pygame.Surface:
+    if (surface := _decoded.get(path)) is None:
+        _decode(path)
+        surface = _decoded[path]
+    return surface
+
+
 def parse_spritesheet(spritesheet_file: Path) -> tuple[pygame.Surface, ...]:
     """Gets the subsurfaces from a spritesheet image.
 
@@ -26,7 +276,7 @@ def parse_spritesheet(spritesheet_file: Path) -> tuple[pygame.Surface, ...]:
     :param spritesheet_file: Path to the spritesheet image.
     :returns: A tuple of surfaces based on the metadata in the json file.
     """
-    spritesheet = pygame.image.load(spritesheet_file).convert_alpha()
+    spritesheet = _load_path(spritesheet_file).convert_alpha()
     metadata = spritesheet_file.with_suffix(".json")
     try:
         file = Path.open(metadata, encoding="UTF-8")
@@ -62,7 +312,11 @@ def get_sprites(directory: Path) -> tuple[pygame.Surface, ...]:
     :return: A tuple of surfaces based on the spritesheet's metadata json file.
     """
     if directory not in _cached_sprites:
+        image_cache_stats.misses += 1
         _cached_sprites[directory] = parse_spritesheet(directory)
+        _cached_ids.update(map(id, _cached_sprites[directory]))
+    else:
+        image_cache_stats.hits += 1
     return _cached_sprites[directory]
 
 
@@ -106,18 +360,45 @@ class Load(metaclass=_LoadMeta):
         :param accept: File types to accept.
         :param exclude_dirs: Subdirectories inside the directory to ignore.
         """
-        self.path = {}
+        self.directory = directory
+        self.accept = accept
         self.exclude_dirs = exclude_dirs if exclude_dirs else []
-        for path, _, files in os.walk(directory):
+        self._path = None
+
+    @property
+    def path(self) -> dict[str, Path]:
+        """The path of every accepted file bound to its name.
+
+        The directory is only searched the first time this is accessed.
+        """
+        if self._path is None:
+            self._path = self.search()
+        return self._path
+
+    def search(self) -> dict[str, Path]:
+        paths = {}
+        for path, _, files in os.walk(self.directory):
             if any(
-                excluded in os.path.relpath(path, directory)
+                excluded in os.path.relpath(path, self.directory)
                 for excluded in self.exclude_dirs
             ):
                 continue
             for file in files:
                 name, ext = Path(file).stem, Path(file).suffix
-                if ext.lower() in accept:
-                    self.path[name] = Path(path) / file
+                if ext.lower() in self.accept:
+                    paths[name] = Path(path) / file
+        logger.debug("Found %s files in %s.", len(paths), self.directory)
+        return paths
 
 
 _cached_sprites = {}
+_cached_images: dict[tuple[str, str | None], pygame.Surface] = {}
+image_cache_stats = CacheStats()
+_cached_variants: dict[tuple, tuple[pygame.Surface, pygame.Surface]] = {}
+_cached_masks: dict[int, tuple[pygame.Surface, pygame.Mask]] = {}
+variant_cache_stats = CacheStats()
+# The ids of every surface in the caches above.
+_cached_ids: set[int] = set()
+_decoded: dict[Path, pygame.Surface] = {}
+_decoding: dict[Path, Future] = {}
+_executor: ThreadPoolExecutor | None = None
@@ -2,16 +2,32 @@
 
 Must be initialised with `state_dict` and `start_state` otherwise a
 RuntimeError will be raised.
+
+The game loop runs in one of three modes:
+
+- Variable timestep (default): the game is updated and rendered once per
+  iteration, and `system_data.dt` is based on how long the last frame took.
+- Fixed timestep: the game is updated in fixed steps of
+  `1 / system_data.tick_rate` seconds using an accumulator, and rendered once
+  per iteration with entities interpolated between the last two ticks.
+- Headless: used when running under the SDL dummy video driver. The game is
+  updated with a fixed timestep as fast as possible and never rendered.
+
+When `settings.dirty_rects` is enabled, only the regions marked as dirty since
+the last frame are redrawn and presented. See `src.core.dirty`.
 """
 
 from __future__ import annotations
 
 import logging
+import time
 from typing import TYPE_CHECKING
 
 import pygame.display
 
 from src.components import events, overlaymanager, statemanager
+from src.core import dirty, present, profiler, renderqueue
+from src.core.constants import MAX_FRAME_TIME
 from src.core.data import config_dir, settings, system_data
 from src.core.keybinds import keybinds, keybinds_dir
 
@@ -21,50 +37,153 @@ if TYPE_CHECKING:
 logger = logging.getLogger("src")
 
 
-def init(state_dict: dict[str, type[State]], start_state: str) -> None:
+def init(
+    state_dict: dict[str, type[State] | str], start_state: str
+) -> None:
     """Initialises the module with the state_dictionary and start state.
 
     :param state_dict: A dictionary containing the name of every game state
-    bound to its class.
+    bound to its class, or to an import path of the form "module:Class" to
+    import the class from when the state is first used.
     :param start_state: The state which the game should start in.
     """
     statemanager.state_dict = state_dict
     statemanager.append(start_state, initial=True)
 
 
-def gameloop() -> None:
-    """Starts the while loop that updates the game every iteration."""
+def tick() -> None:
+    """Processes input and updates the current state and overlays once."""
+    global _running
+    start = time.perf_counter()
+    if events.replay.is_playing():
+        # Live input is ignored, but the window can still be closed.
+        if any(event.type == pygame.QUIT for event in pygame.event.get()):
+            system_data.quit = True
+        if (tick_input := events.replay.read_tick()) is None:
+            logger.info("Replay finished, stopping game loop.")
+            events.replay.stop_playback()
+            _running = False
+            return
+        events.process(*tick_input)
+    else:
+        tick_events = pygame.event.get()
+        events.process(tick_events)
+        if events.replay.is_recording():
+            events.replay.record(tick_events, events.get_mouse_pos())
+    start = profiler.record("events", start)
+    events.eventbinder.notify()
+    start = profiler.record("notify", start)
+    if system_data.quit:
+        logger.info("Quit set to True, saving and exiting game.")
+        settings.save(config_dir)
+        keybinds.save(keybinds_dir)
+        events.replay.stop_recording()
+        _running = False
+
+    statemanager.update()
+    statemanager.current_state().update()
+    start = profiler.record("state update", start)
+    # Conversion is used since overlays can be added or removed by updating.
+    for overlay in list(overlaymanager.overlay_stack):
+        overlay.update()
+    profiler.record("overlay update", start)
+    system_data.ticks += 1
+    system_data.game_time += system_data.dt * 100
+
+
+def render() -> None:
+    """Renders the current state and overlays onto the internal surface.
+
+    The render queue is flushed after the state and each overlay renders, so
+    every overlay is drawn above everything below it.
+    """
+    statemanager.current_state().render()
+    renderqueue.flush()
+    for overlay in overlaymanager.overlay_stack:
+        overlay.render()
+        renderqueue.flush()
+
+
+def draw() -> None:
+    """Renders the current state and overlay and presents them.
+
+    If only some regions are dirty, everything is rendered once per region
+    with the internal surface clipped to that region, and only those regions
+    are presented. Nothing is drawn if no regions are dirty.
+    """
+    rects = dirty.collect()
+    if rects is None:
+        start = time.perf_counter()
+        render()
+        start = profiler.record("render", start)
+        present.present()
+        start = profiler.record("scale", start)
+        pygame.display.flip()
+        profiler.record("flip", start)
+        return
+    if not rects:
+        return
+
+    start = time.perf_counter()
+    for rect in rects:
+        system_data.abs_window.set_clip(rect)
+        render()
+    system_data.abs_window.set_clip(None)
+    start = profiler.record("render", start)
+    window_rects = present.present(rects)
+    start = profiler.record("scale", start)
+    pygame.display.update(window_rects)
+    profiler.record("flip", start)
+
+
+def gameloop(max_ticks: int | None = None) -> None:
+    """Starts the while loop that updates the game every iteration.
+
+    :param max_ticks: The number of ticks to stop the game loop after. Runs
+    until the game is quit if None.
+    """
     global _running
     if statemanager.state_dict is None:
         msg = "Control module has not been initialised with state_dict."
         raise RuntimeError(msg)
     clock = pygame.time.Clock()
+    step = 1000 / system_data.tick_rate
+    accumulator = 0.0
+    start_ticks, start_time = system_data.ticks, time.perf_counter()
 
     while _running:
-        events.process(pygame.event.get())
-        events.eventbinder.notify()
-        if system_data.quit:
-            logger.info("Quit set to True, saving and exiting game.")
-            settings.save(config_dir)
-            keybinds.save(keybinds_dir)
+        if system_data.headless:
+            system_data.dt = step / 100
+            tick()
+        elif system_data.fixed_timestep:
+            accumulator += min(clock.tick(system_data.fps), MAX_FRAME_TIME)
+            system_data.dt = step / 100
+            while accumulator >= step and _running:
+                tick()
+                accumulator -= step
+            system_data.interpolation = accumulator / step
+            draw()
+        else:
+            tick()
+            draw()
+            system_data.dt = clock.tick(system_data.fps) / 100
+
+        if (
+            max_ticks is not None
+            and system_data.ticks - start_ticks >= max_ticks
+        ):
             _running = False
-
-        statemanager.current_state().update()
-        if overlay := overlaymanager.current_overlay(accept_no_overlay=True):
-            overlay.update()
-        statemanager.current_state().render()
-        if overlay:
-            overlay.render()
-
-        system_data.dt = clock.tick(system_data.fps) / 100
-        system_data.window.blit(
-            pygame.transform.scale_by(
-                system_data.abs_window, system_data.scale_factor
-            ),
-            (0, 0),
-        )
-        pygame.display.flip()
-        logger.debug("\n")
+        profiler.end_frame()
+
+    events.replay.stop_recording()
+    elapsed = time.perf_counter() - start_time
+    ticks = system_data.ticks - start_ticks
+    logger.info(
+        "Game loop stopped after %s ticks in %.2fs (%.0f ticks/sec).",
+        ticks,
+        elapsed,
+        ticks / elapsed if elapsed else 0,
+    )
 
 
 _running = True
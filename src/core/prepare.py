@@ -6,20 +6,26 @@ import logging
 from pathlib import Path
 
 from src.components import Audio, events
-from src.components.managers import statemanager
+from src.components.managers import overlaymanager, statemanager
 from src.components.managers.statemanager import back
-from src.core import keybinds, main, settings, system_data
+from src.core import instrumentation, keybinds, main, settings, system_data
 from src.core.constants import ROOT, DISPLAY_FLAG_NAMES_MAP
 from src.core.utils import toggle_flag, toggle_fullscreen, update_scale_factor
 
 import pygame
 
-from src.core.load import Load
-from src.states import game, options, title
+from src.core.load import Load, load_image
+from src.states import loading, profiler
 
 logger = logging.getLogger("src.core")
 
+instrumentation.configure()
 pygame.init()
+# The dummy video driver is used when there is no display, e.g. when
+# benchmarking on build machines, so there is no point rendering anything.
+system_data.headless = pygame.display.get_driver() == "dummy"
+if system_data.headless:
+    logger.info("Using dummy video driver, running game loop headless.")
 pygame.display.set_caption(
     f"shmup {system_data.version}-{system_data.version_type}"
 )
@@ -38,7 +44,7 @@ system_data.window = pygame.display.set_mode(
 logger.info("Created window with resolution %s.", settings.resolution)
 
 system_data.window_rect = system_data.window.get_rect()
-system_data.abs_window = pygame.Surface((1920, 1080))
+system_data.abs_window = pygame.Surface((1920, 1080), 0, system_data.window)
 system_data.abs_window_rect = system_data.abs_window.get_rect()
 update_scale_factor()
 
@@ -57,7 +63,8 @@ if (
 Load("image", Path(ROOT) / "assets" / "graphics", ".png")
 Load("audio", Path(ROOT) / "assets" / "audio", ".wav")
 Load("font", Path(ROOT) / "assets" / "fonts", ".ttf")
-pygame.display.set_icon(pygame.image.load(Load("image").path["icon"]))
+Load("stage", Path(ROOT) / "assets" / "stages", ".json")
+pygame.display.set_icon(load_image("icon"))
 
 Audio("bgm").set_volume(0.2)
 Audio("bgm").add_audio(Load("audio").path["menuloop rmx"])
@@ -65,8 +72,15 @@ Audio("bgm").add_audio(Load("audio").path["menuloop rmx"])
 Audio("sfx").set_volume(0.2)
 Audio("sfx").add_audio(Load("audio").path["click"])
 
-states = {"title": title.Title, "options": options.Options, "game": game.Game}
+# States are imported when first used, so only the start state is imported
+# before the first frame.
+states = {
+    "title": "src.states.title:Title",
+    "options": "src.states.options:Options",
+    "game": "src.states.game:Game",
+}
 start_state = "title"
+statemanager.loading_overlay = loading.LoadingOverlay
 
 for keybind in keybinds.ui.fullscreen:
     events.eventbinder.register(*keybind, action=toggle_fullscreen)
@@ -78,6 +92,11 @@ for keybind in keybinds.ui.noframe:
     )
 for key_combo in keybinds.ui.back:
     events.eventbinder.register(*key_combo, action=back)
+for keybind in keybinds.ui.profiler:
+    events.eventbinder.register(
+        *keybind,
+        action=lambda: overlaymanager.toggle(profiler.ProfilerOverlay),
+    )
 
 
 main.init(states, start_state)
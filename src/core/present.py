@@ -0,0 +1,121 @@
+"""Module for presenting the internal surface to the window.
+
+The internal surface (`system_data.abs_window`) is always 1920x1080 and is
+scaled to the window every frame. To avoid allocating a new window sized
+surface every frame, it is scaled directly into a subsurface of the window that
+is only recreated when the window or scale factor changes.
+
+When the scale factor is exactly 1, the internal surface is instead made a
+subsurface of the window itself, so everything is drawn straight into the
+window and nothing needs to be scaled or copied.
+
+When only some regions of the internal surface were redrawn, only those
+regions are scaled, and the corresponding window rects are returned so that
+only they need to be updated on the display.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+
+import pygame
+
+from src.core import dirty
+from src.core.data import system_data
+
+logger = logging.getLogger("src.core")
+
+_window = None
+_scaled_window = None
+
+
+def rebuild() -> None:
+    """Recreates the surfaces used to present the internal surface.
+
+    Must be called whenever the window mode is set or the scale factor
+    changes, since subsurfaces of the old window surface are no longer valid.
+    """
+    global _window, _scaled_window
+    _window = system_data.window
+    _window.fill((0, 0, 0))
+    dirty.mark()
+    scale_x, scale_y = system_data.scale_factor
+    size = (
+        min(
+            round(system_data.abs_window_rect.width * scale_x),
+            _window.get_width(),
+        ),
+        min(
+            round(system_data.abs_window_rect.height * scale_y),
+            _window.get_height(),
+        ),
+    )
+    if size == system_data.abs_window_rect.size:
+        system_data.abs_window = _window.subsurface(
+            system_data.abs_window_rect
+        )
+        _scaled_window = None
+        logger.info(
+            "Scale factor is 1, drawing internal surface directly into the "
+            "window."
+        )
+        return
+
+    # Surfaces must have the same format as the window to be scaled directly
+    # into it.
+    if (
+        system_data.abs_window.get_parent() is not None
+        or system_data.abs_window.get_bitsize() != _window.get_bitsize()
+    ):
+        system_data.abs_window = pygame.Surface(
+            system_data.abs_window_rect.size, 0, _window
+        )
+    _scaled_window = _window.subsurface((0, 0), size)
+    logger.info("Presenting internal surface scaled to size %s.", size)
+
+
+def present(rects: list[pygame.Rect] | None = None) -> list[pygame.Rect]:
+    """Scales the internal surface into the window.
+
+    :param rects: The regions of the internal surface to present. Presents
+    the whole surface if None.
+    :return: The regions of the window that were changed.
+    """
+    if system_data.window is not _window:
+        rebuild()
+    if rects is None:
+        if _scaled_window is not None:
+            pygame.transform.scale(
+                system_data.abs_window,
+                _scaled_window.get_size(),
+                _scaled_window,
+            )
+        return [_window.get_rect()]
+    if _scaled_window is None:
+        return [
+            rect.move(system_data.abs_window_rect.topleft) for rect in rects
+        ]
+
+    scale_x, scale_y = system_data.scale_factor
+    scaled_rect = _scaled_window.get_rect()
+    window_rects = []
+    for rect in rects:
+        # Rounded outwards so that no gaps are left between adjacent regions.
+        left = math.floor(rect.left * scale_x)
+        top = math.floor(rect.top * scale_y)
+        window_rect = pygame.Rect(
+            left,
+            top,
+            math.ceil(rect.right * scale_x) - left,
+            math.ceil(rect.bottom * scale_y) - top,
+        ).clip(scaled_rect)
+        if not window_rect:
+            continue
+        pygame.transform.scale(
+            system_data.abs_window.subsurface(rect),
+            window_rect.size,
+            _scaled_window.subsurface(window_rect),
+        )
+        window_rects.append(window_rect)
+    return window_rects
@@ -0,0 +1,109 @@
+"""Module for timing each phase of every frame of the game loop.
+
+The game loop records how long each phase takes using `record()`, and calls
+`end_frame()` once per iteration. When the profiler is enabled, the timings of
+each frame are kept in a ring buffer for each phase, which can be summarised
+with `percentiles()` or dumped with `dump_csv()`.
+
+Phases that happen more than once per frame, such as updating when running
+with a fixed timestep, are summed.
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from src.core.constants import PROFILER_HISTORY
+from src.core.structs import RingBuffer
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+logger = logging.getLogger("src.core")
+
+PHASES = (
+    "events",
+    "notify",
+    "state update",
+    "overlay update",
+    "render",
+    "scale",
+    "flip",
+)
+
+enabled = False
+history = {
+    phase: RingBuffer(PROFILER_HISTORY) for phase in (*PHASES, "frame")
+}
+_current = dict.fromkeys(PHASES, 0.0)
+_frame_start = time.perf_counter()
+
+
+def record(phase: str, start: float) -> float:
+    """Adds the time since start to the phase's timing for this frame.
+
+    :param phase: The name of the phase in `PHASES`.
+    :param start: The value of `time.perf_counter()` when the phase started.
+    :return: The current value of `time.perf_counter()`, so that the next
+    phase can be timed from it.
+    """
+    now = time.perf_counter()
+    _current[phase] += now - start
+    return now
+
+
+def end_frame() -> None:
+    """Stores the timings of the current frame and starts the next one."""
+    global _frame_start
+    now = time.perf_counter()
+    if enabled:
+        for phase, seconds in _current.items():
+            history[phase].append(seconds * 1000)
+        history["frame"].append((now - _frame_start) * 1000)
+    _current.update(dict.fromkeys(PHASES, 0.0))
+    _frame_start = now
+
+
+def reset() -> None:
+    """Clears the timings of every frame stored."""
+    for buffer in history.values():
+        buffer.clear()
+
+
+def percentiles(phase: str, *percents: float) -> tuple[float, ...]:
+    """Gets percentiles of the timings of a phase in milliseconds.
+
+    :param phase: The name of the phase, or "frame" for the whole frame.
+    :param percents: The percentiles to get, between 0 and 100.
+    :return: The timing at each percentile, or 0 for each if no frames have
+    been stored yet.
+    """
+    values = sorted(history[phase])
+    if not values:
+        return (0.0,) * len(percents)
+    return tuple(
+        values[min(round(percent / 100 * (len(values) - 1)), len(values) - 1)]
+        for percent in percents
+    )
+
+
+def dump_csv(path: Path) -> None:
+    """Writes the timings of every frame stored to a csv file.
+
+    :param path: The path of the csv file, which is overwritten if it exists.
+    """
+    columns = (*PHASES, "frame")
+    with path.open("w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        writer.writerows(
+            zip(*(history[column] for column in columns), strict=True)
+        )
+    logger.info(
+        "Dumped %s frames of profiler timings to %s.",
+        len(history["frame"]),
+        path,
+    )
@@ -0,0 +1,160 @@
+"""Module for batching draws onto the internal surface.
+
+Instead of drawing onto the internal surface directly, entities and widgets
+submit draw commands to a layer of the render queue while rendering. When the
+queue is flushed, layers are drawn from lowest to highest, and consecutive
+blits are drawn with a single `Surface.fblits` or `Surface.blits` call instead
+of one Python method call per image.
+
+Commands in the same layer are drawn grouped by their source surface, with
+images packed into the same texture atlas page counted as the same source
+(see `src.core.atlas`), so the order they were submitted in isn't kept.
+Layers in `ordered_layers`, such as the widget layer where widgets have to be
+drawn on top of the widgets below them, are drawn in submission order instead.
+
+The queue is flushed by the game loop after the current state renders and
+after each overlay renders, so anything drawn directly by an overlay is drawn
+above the commands submitted before it.
+"""
+
+from __future__ import annotations
+
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+import pygame
+
+from src.core.data import system_data
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class Layer(IntEnum):
+    """The layers used by the game, from bottom to top."""
+
+    WIDGETS = 0
+    PLAYER = 1
+    PLAYER_HITBOX = 2
+    ENEMIES = 3
+    ENEMY_BULLETS = 4
+    PLAYER_BULLETS = 5
+    ITEMS = 6
+    PARTICLES = 7
+
+
+# Layers drawn in the order their commands were submitted.
+ordered_layers = {Layer.WIDGETS}
+
+# The commands of each layer. Blits are stored as (surface, dest), while
+# rects are stored as (None, rect, color, border_radius).
+_layers: dict[int, list[tuple]] = {}
+# Layers that have rect commands, which have to be drawn one at a time.
+_rect_layers: set[int] = set()
+
+
+def submit(
+    layer: int, surface: pygame.Surface, dest: tuple[float, float]
+) -> None:
+    """Queues a surface to be blitted onto the internal surface.
+
+    :param layer: The layer to draw the surface on.
+    :param surface: The surface to blit.
+    :param dest: The topleft position to blit the surface at.
+    """
+    if (commands := _layers.get(layer)) is None:
+        _layers[layer] = [(surface, dest)]
+    else:
+        commands.append((surface, dest))
+
+
+def submit_many(
+    layer: int,
+    blits: Iterable[tuple[pygame.Surface, tuple[float, float]]],
+) -> None:
+    """Queues many surfaces to be blitted onto the internal surface.
+
+    :param layer: The layer to draw the surfaces on.
+    :param blits: Pairs of a surface and the topleft position to blit it at.
+    """
+    if (commands := _layers.get(layer)) is None:
+        _layers[layer] = list(blits)
+    else:
+        commands.extend(blits)
+
+
+def submit_rect(
+    layer: int,
+    color: pygame.Color,
+    rect: pygame.Rect,
+    border_radius: int = 0,
+) -> None:
+    """Queues a filled rect to be drawn onto the internal surface.
+
+    :param layer: The layer to draw the rect on.
+    :param color: The color of the rect.
+    :param rect: The rect to draw.
+    :param border_radius: The radius of the rect's rounded corners.
+    """
+    _layers.setdefault(layer, []).append((None, rect, color, border_radius))
+    _rect_layers.add(layer)
+
+
+def flush(surface: pygame.Surface | None = None) -> None:
+    """Draws every queued command, then empties the queue.
+
+    :param surface: The surface to draw onto. Uses the internal surface if
+    None.
+    """
+    if not _layers:
+        return
+    if surface is None:
+        surface = system_data.abs_window
+    batch = []
+    for layer in sorted(_layers):
+        commands = _layers[layer]
+        if layer not in ordered_layers:
+            commands.sort(key=_get_source)
+        if layer not in _rect_layers:
+            batch.extend(commands)
+            continue
+        for command in commands:
+            if command[0] is not None:
+                batch.append(command)
+                continue
+            _blit_batch(surface, batch)
+            batch.clear()
+            _, rect, color, border_radius = command
+            pygame.draw.rect(
+                surface, color, rect, border_radius=border_radius
+            )
+    _blit_batch(surface, batch)
+    clear()
+
+
+def clear() -> None:
+    """Empties the queue without drawing anything."""
+    _layers.clear()
+    _rect_layers.clear()
+
+
+def _get_source(command: tuple) -> int:
+    """Gets the key grouping commands by their source surface."""
+    surface = command[0]
+    if surface is None:
+        return 0
+    if (parent := surface.get_parent()) is not None:
+        return id(parent)
+    return id(surface)
+
+
+def _blit_batch(
+    surface: pygame.Surface,
+    batch: list[tuple[pygame.Surface, tuple[float, float]]],
+) -> None:
+    if not batch:
+        return
+    if hasattr(surface, "fblits"):
+        surface.fblits(batch)
+    else:
+        surface.blits(batch, doreturn=False)
@@ -37,6 +37,42 @@ class Validator(ABC):
         pass
 
 
+class RingBuffer:
+    """Fixed size buffer that overwrites its oldest values when full."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._values = [0.0] * capacity
+        self._start = 0
+        self._length = 0
+
+    def append(self, value: Any) -> None:
+        self._values[(self._start + self._length) % self.capacity] = value
+        if self._length < self.capacity:
+            self._length += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def clear(self) -> None:
+        self._start = 0
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield self._values[(self._start + i) % self.capacity]
+
+    def __getitem__(self, index: int):
+        if not -self._length <= index < self._length:
+            msg = f"RingBuffer index {index} out of range."
+            raise IndexError(msg)
+        if index < 0:
+            index += self._length
+        return self._values[(self._start + index) % self.capacity]
+
+
 class Bidict(dict):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -2,29 +2,30 @@
 
 from __future__ import annotations
 
-from typing import Literal
+from typing import Literal, TYPE_CHECKING, TypeAlias
 
 import pygame
 
-from src.components.ui import (
-    TextToggleButtonArray,
-    TextRectToggleButtonArray,
-    ImageToggleButtonArray,
-)
-from src.components.ui.buttons import (
-    TextToggleButton,
-    TextClickButton,
-    TextRectToggleButton,
-    TextRectClickButton,
-    ImageClickButton,
-    ImageToggleButton,
-    ImageRectToggleButton,
-    ImageRectClickButton,
-)
-from src.components.ui.buttons.imagebuttonarray import (
-    ImageRectToggleButtonArray,
-)
-from src.states import Title, Options, Game
+if TYPE_CHECKING:
+    from src.components.ui import (
+        TextToggleButtonArray,
+        TextRectToggleButtonArray,
+        ImageToggleButtonArray,
+    )
+    from src.components.ui.buttons import (
+        TextToggleButton,
+        TextClickButton,
+        TextRectToggleButton,
+        TextRectClickButton,
+        ImageClickButton,
+        ImageToggleButton,
+        ImageRectToggleButton,
+        ImageRectClickButton,
+    )
+    from src.components.ui.buttons.imagebuttonarray import (
+        ImageRectToggleButtonArray,
+    )
+    from src.states import Title, Options, Game
 
 # Literals
 
@@ -43,7 +44,6 @@ TextRectAlignments = Literal["right", "left", "center", "justified"]
 EventTypes = Literal[
     "key", "keydown", "keyup", "mouse", "mousedown", "mouseup", "quit"
 ]
-BulletPatterns = Literal["up", "spread", "widespread"]
 
 # Commonly needed parameter types
 
@@ -53,26 +53,20 @@ Images = tuple[pygame.Surface, ...] | pygame.Surface | str
 
 # Any
 
-AnyButton = (
-    TextToggleButton
-    | TextClickButton
-    | TextRectToggleButton
-    | TextRectClickButton
-    | ImageClickButton
-    | ImageToggleButton
-    | ImageRectClickButton
-    | ImageRectToggleButton
+# Written as strings so these classes only need to be imported when type
+# checking.
+AnyButton: TypeAlias = (
+    "TextToggleButton | TextClickButton | TextRectToggleButton"
+    " | TextRectClickButton | ImageClickButton"
+    " | ImageToggleButton | ImageRectClickButton"
+    " | ImageRectToggleButton"
 )
-AnyState = Title | Options | Game
-AnyToggleButton = (
-    TextToggleButton
-    | TextRectToggleButton
-    | ImageToggleButton
-    | ImageRectToggleButton
+AnyState: TypeAlias = "Title | Options | Game"
+AnyToggleButton: TypeAlias = (
+    "TextToggleButton | TextRectToggleButton | ImageToggleButton"
+    " | ImageRectToggleButton"
 )
-AnyToggleArray = (
-    TextToggleButtonArray
-    | TextRectToggleButtonArray
-    | ImageToggleButtonArray
-    | ImageRectToggleButtonArray
+AnyToggleArray: TypeAlias = (
+    "TextToggleButtonArray | TextRectToggleButtonArray"
+    " | ImageToggleButtonArray | ImageRectToggleButtonArray"
 )
@@ -6,6 +6,7 @@ import logging
 
 import pygame
 
+from src.core import present
 from src.core.constants import DISPLAY_FLAG_NAMES_MAP
 from src.core.data import settings, system_data
 from src.components import events
@@ -30,6 +31,7 @@ def toggle_flag(flag: int) -> None:
     )
     pygame.display.set_mode(settings.resolution, system_data.flags)
     system_data.window = pygame.display.get_surface()
+    present.rebuild()
     logger.info(
         "Window flag %s toggled %s", flag_name, "on" if toggled else "off"
     )
@@ -37,7 +39,7 @@ def toggle_flag(flag: int) -> None:
 
 def set_resolution(size: tuple[int, int]) -> None:
     if size == settings.resolution:
-        logging.info(
+        logger.info(
             "Window resolution: %s equal to new resolution. Ignoring call.",
             settings.resolution,
         )
@@ -85,6 +87,7 @@ def toggle_fullscreen() -> None:
         settings.flags["fullscreen"] = True
         pygame.display.toggle_fullscreen()
         system_data.window = pygame.display.get_surface()
+        present.rebuild()
         logger.info(
             "Fullscreen safely toggled on using"
             " pygame.display.toggle_fullscreen()."
@@ -128,7 +131,7 @@ def update_scale_factor(*, non_native_ratio: bool | None = None) -> None:
             system_data.scale_factor = (int_scalex, int_scaley)
         else:
             minimum_int_ratio = min(int_scalex, int_scaley)
-            system_data.scale_factor = minimum_int_ratio
+            system_data.scale_factor = (minimum_int_ratio, minimum_int_ratio)
     logger.info(
         "Scale factor calculated as %s filtering based on non_int_scaling as "
         "%s, non_native_resolution as %s, window size: %s and internal "
@@ -139,3 +142,4 @@ def update_scale_factor(*, non_native_ratio: bool | None = None) -> None:
         system_data.window_rect.size,
         system_data.abs_window_rect.size,
     )
+    present.rebuild()
@@ -1,5 +1,27 @@
-"""Contains all of the game's states."""
+"""Contains all of the game's states.
 
-from src.states.title import Title
-from src.states.options import Options
-from src.states.game import Game
+States are imported lazily when accessed, so importing this package doesn't
+import every state module.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.states.state import State
+
+_state_modules = {
+    "Title": "src.states.title",
+    "Options": "src.states.options",
+    "Game": "src.states.game",
+}
+__all__ = ["Game", "Options", "Title"]
+
+
+def __getattr__(name: str) -> type[State]:
+    if name in _state_modules:
+        return getattr(importlib.import_module(_state_modules[name]), name)
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -1,18 +1,25 @@
 from typing import override
 
-import pygame
-
 from src.components import entities
-from src.components.entities import EntityGroup, Remi
+from src.components.entities import (
+    BulletField,
+    EntityGroup,
+    Remi,
+    Scheduler,
+    StageRunner,
+    World,
+    load_stage,
+)
 from src.components.managers import statemanager
 from src.components.ui import Text, TextArray, TextArrayConfig, widgethandler
-from src.core.load import Load
 from src.states.state import State
-from src.components.entities.enemy import Enemy
 from src.core import system_data
+from src.core.renderqueue import Layer
 
 
 class Game(State):
+    assets = ("level", "remi")
+
     def __init__(self):
         super().__init__()
         self.player = Remi(self)
@@ -22,18 +29,21 @@ class Game(State):
         )
         self.stats = TextArray(system_data.abs_window_rect.topright, (2, 1), 20, config)
         self.enemies = EntityGroup()
-        self.enemy = Enemy(self, (500, 800), "topleft", sprite=pygame.image.load(Load("image").path["oscarF"]),
-              sprite_scale=2, rect_alignment="center")
-        self.enemy1 = Enemy(self, (700, 800), "topleft", sprite=pygame.image.load(Load("image").path["oscarF"]),
-                           sprite_scale=2, rect_alignment="center")
-        self.enemies.add(self.enemy, self.enemy1)
-        self.player_bullets = EntityGroup()
-        self.enemy_bullets = EntityGroup()
-        self.enemy_drops = EntityGroup()
+        self.player_bullets = BulletField("player", Layer.PLAYER_BULLETS)
+        self.enemy_bullets = BulletField("enemy", Layer.ENEMY_BULLETS)
+        # Items are too numerous to be sprites, so are kept in a world.
+        self.enemy_drops = World(
+            "item", Layer.ITEMS, system_data.abs_window_rect
+        )
+        # Runs the behavior scripts of enemies.
+        self.scheduler = Scheduler()
         self.widgets = [self.stats]
+        self.stage = StageRunner(self, load_stage("stage1"))
 
     @override
     def update(self) -> None:
+        self.stage.update()
+        self.scheduler.update()
         self.player.update()
         self.enemies.update()
         self.player_bullets.update()
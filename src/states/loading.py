@@ -0,0 +1,80 @@
+"""Overlay shown while the assets of the next state are being loaded."""
+
+from __future__ import annotations
+
+from typing import override
+
+import pygame
+from pygame import freetype
+
+from src.components.managers import statemanager
+from src.core import dirty
+from src.core.constants import DEFAULT_FONT_NAME, PRIMARY
+from src.core.data import system_data
+from src.core.load import Load
+from src.states.state import Overlay
+
+
+class LoadingOverlay(Overlay):
+    font_size = 40
+    bar_size = (600, 20)
+    padding = 20
+
+    def __init__(self):
+        """Overlay showing a progress bar while a state is being loaded.
+
+        Added and removed by the statemanager while the images of the state
+        being switched to are decoded in the background. Only the panel is
+        redrawn, and only when the progress changes.
+        """
+        super().__init__()
+        self.font = freetype.Font(Load("font").path[DEFAULT_FONT_NAME])
+        text_height = self.font.get_sized_height(self.font_size)
+        self.panel = pygame.Surface(
+            (
+                self.bar_size[0] + self.padding * 2,
+                text_height + self.bar_size[1] + self.padding * 3,
+            )
+        )
+        self.panel_rect = self.panel.get_rect(
+            center=system_data.abs_window_rect.center
+        )
+        self.bar_rect = pygame.Rect(
+            (self.padding, text_height + self.padding * 2), self.bar_size
+        )
+        self.progress = None
+
+    @override
+    def update(self) -> None:
+        progress = statemanager.loading_progress()
+        if progress != self.progress:
+            self.progress = progress
+            self.redraw_panel()
+
+    @override
+    def render(self) -> None:
+        system_data.abs_window.blit(self.panel, self.panel_rect)
+
+    def redraw_panel(self) -> None:
+        """Redraws the loading text and progress bar onto the panel."""
+        self.panel.fill(PRIMARY)
+        self.font.render_to(
+            self.panel,
+            (self.padding, self.padding),
+            "Loading",
+            pygame.Color("white"),
+            size=self.font_size,
+        )
+        pygame.draw.rect(self.panel, pygame.Color("black"), self.bar_rect)
+        pygame.draw.rect(
+            self.panel,
+            pygame.Color("white"),
+            (
+                self.bar_rect.topleft,
+                (
+                    round(self.bar_rect.width * self.progress),
+                    self.bar_rect.height,
+                ),
+            ),
+        )
+        dirty.mark(self.panel_rect)
@@ -12,7 +12,7 @@ from src.components.ui import (
     TextRectToggleButtonArrayConfig,
 )
 from src.core.constants import PRIMARY
-from src.core.load import Load
+from src.core.load import get_variant, load_image
 from src.states.optionmenus import (
     GeneralOptions,
     GraphicsOptions,
@@ -24,29 +24,38 @@ from src.core.data import system_data
 
 
 class Options(State):
+    assets = ("title options",)
+
     def __init__(self):
         super().__init__()
         # images
-        self.title = pygame.transform.scale_by(
-            pygame.image.load(Load("image").path["title options"]), 4
-        )
+        title = get_variant(load_image("title options"), scale=4)
         # background rect
         self.bg_rect = pygame.Rect(
             0,
             0,
             system_data.abs_window_rect.width * 0.8,
-            (system_data.abs_window_rect.height - self.title.get_height())
+            (system_data.abs_window_rect.height - title.get_height())
             * 0.8,
         )
         self.bg_rect.midtop = (
             system_data.abs_window_rect.centerx,
             system_data.abs_window_rect.height * 0.1
             + 20
-            + self.title.get_height(),
+            + title.get_height(),
+        )
+        bg_surf = pygame.Surface(self.bg_rect.size)
+        bg_surf.fill(PRIMARY)
+        bg_surf.set_alpha(96)
+        self.add_layer("panel", bg_surf, self.bg_rect.topleft)
+        self.add_layer(
+            "title",
+            title,
+            (
+                system_data.abs_window_rect.width / 2 - title.get_width() / 2,
+                system_data.abs_window_rect.height * 0.1,
+            ),
         )
-        self.bg_surf = pygame.Surface(self.bg_rect.size)
-        self.bg_surf.fill(PRIMARY)
-        self.bg_surf.set_alpha(96)
         self.active_overlay = None
         self.padding = 30
         config = TextRectToggleButtonArrayConfig(
@@ -70,15 +79,6 @@ class Options(State):
     @override
     def render(self) -> None:
         super().render()
-        system_data.abs_window.blit(self.bg_surf, self.bg_rect)
-        system_data.abs_window.blit(
-            self.title,
-            (
-                system_data.abs_window_rect.width / 2
-                - self.title.get_width() / 2,
-                system_data.abs_window_rect.height * 0.1,
-            ),
-        )
         widgethandler.blit()
 
     @override
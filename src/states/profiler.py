@@ -0,0 +1,152 @@
+"""Overlay displaying the frame timings recorded by the profiler."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import override
+
+import pygame
+from pygame import freetype
+
+from src.components import events
+from src.core import dirty, keybinds, profiler
+from src.core.constants import DEFAULT_FONT_NAME, PRIMARY
+from src.core.data import system_data
+from src.core.load import Load
+from src.states.state import Overlay
+
+
+class ProfilerOverlay(Overlay):
+    refresh_rate = 30
+    font_size = 20
+    padding = 10
+    column_width = 90
+    graph_height = 120
+
+    def __init__(self):
+        """Overlay showing how long each phase of the game loop takes.
+
+        Shows the 50th, 95th and 99th percentile timings of each phase and of
+        the whole frame, and a graph of the frame times. These are only
+        redrawn every `refresh_rate` updates, so the overlay barely affects
+        the timings it shows.
+
+        Timings are only recorded while the overlay is open, and can be dumped
+        to a csv file in the working directory with the profiler dump keybind.
+        """
+        super().__init__()
+        self.font = freetype.Font(Load("font").path[DEFAULT_FONT_NAME])
+        self.line_height = self.font.get_sized_height(self.font_size)
+        rows = len(profiler.PHASES) + 2
+        self.panel = pygame.Surface(
+            (
+                self.column_width * 5 + self.padding * 2,
+                self.line_height * rows + self.graph_height + self.padding * 3,
+            ),
+            pygame.SRCALPHA,
+        )
+        self.panel_rect = self.panel.get_rect(topleft=(0, 0))
+        self.graph_rect = pygame.Rect(
+            self.padding,
+            self.line_height * rows + self.padding * 2,
+            self.panel_rect.width - self.padding * 2,
+            self.graph_height,
+        )
+        self.updates = 0
+
+    @override
+    def startup(self) -> None:
+        super().startup()
+        profiler.reset()
+        profiler.enabled = True
+        for keybind in keybinds.ui.profiler_dump:
+            events.eventbinder.register(*keybind, action=self.dump)
+        self.redraw_panel()
+
+    @override
+    def cleanup(self) -> None:
+        super().cleanup()
+        profiler.enabled = False
+        for keybind in keybinds.ui.profiler_dump:
+            events.eventbinder.deregister(*keybind, action=self.dump)
+
+    @override
+    def update(self) -> None:
+        self.updates += 1
+        if self.updates % self.refresh_rate == 0:
+            self.redraw_panel()
+
+    @override
+    def render(self) -> None:
+        system_data.abs_window.blit(self.panel, self.panel_rect)
+
+    def redraw_panel(self) -> None:
+        """Redraws the timings and graph onto the panel surface."""
+        self.panel.fill((*PRIMARY, 200))
+        y = self.padding
+        self.draw_row(y, ("ms", "p50", "p95", "p99", "max"))
+        for phase in (*profiler.PHASES, "frame"):
+            y += self.line_height
+            self.draw_row(
+                y,
+                (
+                    phase,
+                    *(
+                        f"{timing:.2f}"
+                        for timing in profiler.percentiles(
+                            phase, 50, 95, 99, 100
+                        )
+                    ),
+                ),
+            )
+        self.draw_graph()
+        dirty.mark(self.panel_rect)
+
+    def draw_row(self, y: int, columns: tuple[str, ...]) -> None:
+        for i, column in enumerate(columns):
+            self.font.render_to(
+                self.panel,
+                (self.padding + i * self.column_width, y),
+                column,
+                pygame.Color("white"),
+                size=self.font_size,
+            )
+
+    def draw_graph(self) -> None:
+        """Draws the frame time of every stored frame as a line graph.
+
+        The graph is scaled so that the slowest frame fits, with a line
+        showing the frame time needed to reach the target fps.
+        """
+        pygame.draw.rect(self.panel, pygame.Color("black"), self.graph_rect)
+        frame_times = profiler.history["frame"]
+        target = 1000 / system_data.fps
+        scale = self.graph_rect.height / max(target * 2, *frame_times, 1)
+        target_y = self.graph_rect.bottom - target * scale
+        pygame.draw.line(
+            self.panel,
+            pygame.Color("darkgreen"),
+            (self.graph_rect.left, target_y),
+            (self.graph_rect.right, target_y),
+        )
+        if len(frame_times) < 2:
+            return
+        step = self.graph_rect.width / (frame_times.capacity - 1)
+        pygame.draw.lines(
+            self.panel,
+            pygame.Color("white"),
+            False,
+            [
+                (
+                    self.graph_rect.left + i * step,
+                    self.graph_rect.bottom - frame_time * scale,
+                )
+                for i, frame_time in enumerate(frame_times)
+            ],
+        )
+
+    def dump(self) -> None:
+        profiler.dump_csv(
+            Path(f"profile-{time.strftime('%Y%m%d-%H%M%S')}.csv")
+        )
@@ -8,6 +8,7 @@ import pygame
 
 from src.components.managers import statemanager, overlaymanager
 from src.components.ui import widgethandler
+from src.core import dirty
 from src.core.data import system_data
 
 if TYPE_CHECKING:
@@ -55,6 +56,7 @@ class Overlay:
         can still be added.
         """
         widgethandler.add_widget(*self.widgets)
+        dirty.mark()
 
     def cleanup(self) -> None:
         """Method called whenever the overlay is removed from the overlay stack.
@@ -63,6 +65,7 @@ class Overlay:
         widgethandler.
         """
         widgethandler.remove_widget(*self.widgets)
+        dirty.mark()
 
     def update(self) -> None:
         """Updates all the features of the overlay before rendering."""
@@ -83,6 +86,8 @@ class Overlay:
 
 
 class State(Overlay):
+    assets: tuple[str, ...] = ()
+
     def __init__(self):
         """Base class for making states.
 
@@ -102,14 +107,82 @@ class State(Overlay):
 
         If the background property remains undefined, it is automatically
         assigned to a black surface the size of the screen. This background (or
-        any other defined background) is rendered onto the screen every frame.
+        any other defined background) is rendered onto the screen every frame,
+        along with any static layers added with add_layer().
+
+        The names of the images a state loads when created should be listed
+        in `assets`, so they can be decoded in the background before the
+        state is switched to. See `src.components.managers.statemanager`.
         """
+        self.layers = {}
+        self._composite = None
         super().__init__()
         if len(statemanager.state_stack) >= 1:
             self.background = statemanager.current_state().background
         else:
             self.background = pygame.Surface(system_data.abs_window_rect.size)
 
+    @property
+    def background(self) -> pygame.Surface | None:
+        return self._background
+
+    @background.setter
+    def background(self, value: pygame.Surface | None) -> None:
+        self._background = value
+        self.invalidate_layers()
+
+    def add_layer(
+        self,
+        name: str,
+        surface: pygame.Surface,
+        position: tuple[float, float] = (0, 0),
+    ) -> None:
+        """Adds a static layer drawn above the background every frame.
+
+        Layers are drawn in the order they were added, and are baked together
+        with the background into a single surface that is only rebuilt when a
+        layer changes, so they should only be used for images that rarely
+        change. Adding a layer with the name of an existing layer replaces it
+        while keeping its order.
+
+        :param name: The name used to refer to the layer.
+        :param surface: The image of the layer.
+        :param position: The topleft position to draw the layer at.
+        """
+        self.layers[name] = (surface, position)
+        self.invalidate_layers()
+
+    def remove_layer(self, name: str) -> None:
+        """Removes a layer added with add_layer.
+
+        :param name: The name of the layer.
+        :raises KeyError: If no layer with the name exists.
+        """
+        del self.layers[name]
+        self.invalidate_layers()
+
+    def invalidate_layers(self) -> None:
+        """Makes the background and layers be baked again on the next render.
+
+        Should be called after modifying a layer's surface in place.
+        """
+        self._composite = None
+        dirty.mark()
+
+    def bake_layers(self) -> pygame.Surface:
+        """Blits the background and every layer onto a single surface.
+
+        The surface has the same pixel format as the internal surface, so it
+        can be blitted as fast as possible.
+        """
+        composite = pygame.Surface(
+            system_data.abs_window_rect.size, 0, system_data.abs_window
+        )
+        if self._background is not None:
+            composite.blit(self._background, (0, 0))
+        composite.blits(tuple(self.layers.values()), doreturn=False)
+        return composite
+
     @override
     def startup(self) -> None:
         """Method called whenever the state becomes the top state.
@@ -144,8 +217,10 @@ class State(Overlay):
 
     @override
     def render(self) -> None:
-        """Renders the state onto the screen."""
-        system_data.abs_window.blit(self.background, (0, 0))
+        """Renders the background and static layers onto the screen."""
+        if self._composite is None:
+            self._composite = self.bake_layers()
+        system_data.abs_window.blit(self._composite, (0, 0))
 
     @override
     def back(self) -> None:
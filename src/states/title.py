@@ -3,8 +3,6 @@
 import random
 from typing import override
 
-import pygame
-
 from src.components import Audio
 from src.components.managers import statemanager
 from src.components.ui import widgethandler
@@ -13,26 +11,37 @@ from src.components.ui.buttons import (
     ImageClickButtonArrayConfig,
 )
 from src.core.data import system_data
-from src.core.load import Load
+from src.core.load import get_variant, load_image
 from src.states.state import State
 
 
 class Title(State):
+    assets = (
+        "menu",
+        "title main",
+        "gun die",
+        "tiferet",
+        "play",
+        "editor",
+        "options",
+        "quit",
+    )
+
     def __init__(self):
         super().__init__()
         # images
-        self.background = pygame.image.load(
-            Load("image").path["menu"]
-        ).convert()
-        self.title = pygame.transform.scale_by(
-            pygame.image.load(Load("image").path["title main"]), 4
-        )
-        self.splash = pygame.transform.scale_by(
-            pygame.image.load(
-                Load("image").path[random.choice(("gun die", "tiferet"))]
-            ).convert(),
-            5,
+        self.background = load_image("menu", "opaque")
+        title = get_variant(load_image("title main"), scale=4)
+        self.add_layer(
+            "title",
+            title,
+            (
+                system_data.abs_window_rect.width * 0.5
+                - title.get_width() / 2,
+                system_data.abs_window_rect.height * 0.1,
+            ),
         )
+        self.change_splash(random.choice(("gun die", "tiferet")))
 
         config = ImageClickButtonArrayConfig(
             images=(("play", "editor", "options", "quit"),),
@@ -71,22 +80,21 @@ class Title(State):
     @override
     def render(self) -> None:
         super().render()
-        system_data.abs_window.blit(
-            self.title,
-            (
-                system_data.abs_window_rect.width * 0.5
-                - self.title.get_width() / 2,
-                system_data.abs_window_rect.height * 0.1,
-            ),
-        )
-        system_data.abs_window.blit(
-            self.splash,
+        widgethandler.blit()
+
+    def change_splash(self, name: str) -> None:
+        """Replaces the splash art shown next to the title buttons.
+
+        :param name: The name of the splash art image.
+        """
+        self.add_layer(
+            "splash",
+            get_variant(load_image(name, "opaque"), scale=5),
             (
                 system_data.abs_window_rect.width * 0.03,
                 system_data.abs_window_rect.height * 0.25,
             ),
         )
-        widgethandler.blit()
 
     @override
     def back(self) -> None: